@@ -26,6 +26,7 @@ from backend.app.services.video import (
 )
 from backend.app.utils.video_utils import project_root, normalize_for_tts, safe_segments
 from backend.app.services.video_generator import generate_video
+from backend.app.api.routes_jobs import accept_job
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api", tags=["generator-basic"])
@@ -44,9 +45,15 @@ async def generate_basic(
     location: str = Form("", description="위치(선택)"),
     benefit: str = Form("", description="혜택(선택)"),
     cta: str = Form("", description="콜투액션(선택)"),
+
+    # POST /api/jobs로 먼저 받은 job_id (진행 상황 SSE 구독용, 선택)
+    job_id: str = Form("", description="job_id(선택)"),
+
+    # True면 큐에 넣고 바로 202 + job_id (결과는 GET /api/jobs/{job_id})
+    async_job: bool = Form(False, description="비동기 처리(202 Accepted)"),
 ):
     """TTS 없이 BGM만 포함된 영상 생성"""
-    return await generate_video(
+    req = dict(
         images=images,
         menu_name=menu_name,
         store_name=store_name,
@@ -58,4 +65,8 @@ async def generate_basic(
         use_tts=False,
         use_bgm=True,
         bgm_file=None, # No custom BGM for this route
+        job_id=job_id,
     )
+    if async_job:
+        return await accept_job(**req)
+    return await generate_video(**req)
@@ -0,0 +1,52 @@
+"""
+API 라우터 - 배치 생성
+
+- POST /api/generate-batch : 공용 이미지 풀 + 메뉴 목록(items) -> 메뉴별 영상
+- 응답은 application/x-ndjson, 메뉴 하나가 끝날 때마다 한 줄씩 (마지막 줄은 type=done 요약)
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, UploadFile
+from fastapi.responses import StreamingResponse
+
+from backend.app.core.logger import get_logger
+from backend.app.services.batch import parse_items, prepare_batch, run_batch
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/api", tags=["generator-batch"])
+
+
+@router.post("/generate-batch")
+async def generate_batch(
+    images: list[UploadFile] = File(..., description="메뉴들이 같이 쓸 매장/음식 사진들"),
+    items: str = Form(..., description='메뉴 목록 JSON 배열 (예: [{"menu_name": "떡볶이", "price": "4,500원"}, ...])'),
+    bgm_file: Optional[UploadFile] = File(None, description="사용자 지정 BGM 파일 (선택)"),
+
+    # 아이템에 값이 없으면 쓰는 공통 값
+    store_name: str = Form("", description="가게 이름(선택)"),
+    tone: str = Form("감성", description="광고 톤(힙/감성/고급/가성비)"),
+
+    use_tts: bool = Form(True, description="나래이션 포함 여부"),
+    use_bgm: bool = Form(True, description="배경음악 포함 여부"),
+    profile: str = Form("", description="인코딩 프로필(draft/balanced/archive)"),
+    aspects: str = Form("", description="출력 화면비 (예: 9:16,1:1,16:9)"),
+    hls: bool = Form(False, description="HLS(master.m3u8)도 같이 생성"),
+):
+    """
+    메뉴 여러 개를 요청 1번으로 생성
+
+    - 이미지 정규화/자막 위치 분석/BGM 선택은 배치당 1번, 카피/TTS/렌더는 메뉴마다 동시에
+    - 잘못된 입력은 스트림 시작 전에 400
+    """
+    parsed = parse_items(items)
+    batch_id, shared = await prepare_batch(images, bgm_file, use_bgm, profile, aspects)
+
+    async def stream():
+        async for res in run_batch(batch_id, shared, parsed, store_name, tone, use_tts, use_bgm, hls):
+            yield json.dumps(res, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson", headers={"X-Batch-Id": batch_id})
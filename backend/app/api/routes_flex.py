@@ -27,6 +27,7 @@ from backend.app.services.video import (
 )
 from backend.app.utils.video_utils import project_root, normalize_for_tts, safe_segments
 from backend.app.services.video_generator import generate_video
+from backend.app.api.routes_jobs import accept_job
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api", tags=["generator-flex"])
@@ -50,8 +51,73 @@ async def generate_flex(
     # 새로운 오디오 옵션
     use_tts: bool = Form(True, description="나래이션 포함 여부"),
     use_bgm: bool = Form(True, description="배경음악 포함 여부"),
+
+    # 인코딩 프로필 (draft/balanced/archive, 비우면 서버 기본값)
+    profile: str = Form("", description="인코딩 프로필(draft/balanced/archive)"),
+
+    # 출력 화면비 (쉼표로 여러 개, 비우면 서버 기본값)
+    aspects: str = Form("", description="출력 화면비 (예: 9:16,1:1,16:9)"),
+
+    # HLS 패키징 (모바일 재생용 화질 사다리)
+    hls: bool = Form(False, description="HLS(master.m3u8)도 같이 생성"),
+
+    # 미리보기(/api/preview)에서 받은 job_id -> 같은 카피/나레이션 재사용
+    job_id: str = Form("", description="이어서 렌더할 job_id(선택)"),
+
+    # True면 큐에 넣고 바로 202 + job_id (결과는 GET /api/jobs/{job_id})
+    async_job: bool = Form(False, description="비동기 처리(202 Accepted)"),
+
+    # True면 캐시된 카피 대신 새 버전 (같은 입력으로 다시 뽑을 때)
+    fresh_copy: bool = Form(False, description="카피 새로 생성(캐시 무시)"),
 ):
     """오디오 옵션을 선택할 수 있는 영상 생성"""
+    req = dict(
+        images=images,
+        menu_name=menu_name,
+        store_name=store_name,
+        tone=tone,
+        price=price,
+        location=location,
+        benefit=benefit,
+        cta=cta,
+        use_tts=use_tts,
+        use_bgm=use_bgm,
+        bgm_file=bgm_file,
+        profile=profile,
+        aspects=aspects,
+        hls=hls,
+        job_id=job_id,
+        fresh_copy=fresh_copy,
+    )
+    if async_job:
+        return await accept_job(**req)
+    return await generate_video(**req)
+
+
+@router.post("/preview", response_model=GenerateResponse)
+async def preview(
+    images: list[UploadFile] = File(..., description="음식 사진들 (2~6장 권장)"),
+    bgm_file: Optional[UploadFile] = File(None, description="사용자 지정 BGM 파일 (선택)"),
+    menu_name: str = Form(..., description="메뉴 이름"),
+
+    store_name: str = Form("", description="가게 이름(선택)"),
+    tone: str = Form("감성", description="광고 톤(힙/감성/고급/가성비)"),
+
+    price: str = Form("", description="가격(선택)"),
+    location: str = Form("", description="위치(선택)"),
+    benefit: str = Form("", description="혜택(선택)"),
+    cta: str = Form("", description="콜투액션(선택)"),
+
+    use_tts: bool = Form(True, description="나래이션 포함 여부"),
+    use_bgm: bool = Form(True, description="배경음악 포함 여부"),
+
+    job_id: str = Form("", description="이전 미리보기 job_id(선택) - 입력이 같으면 카피/나레이션 재사용"),
+):
+    """
+    저해상도 초안 (PREVIEW_SIZE/PREVIEW_FPS/PREVIEW_PROFILE)
+
+    - 응답의 job_id를 /api/generate-flex에 넘기면 같은 카피/나레이션으로 본 렌더
+    """
     return await generate_video(
         images=images,
         menu_name=menu_name,
@@ -64,4 +130,6 @@ async def generate_flex(
         use_tts=use_tts,
         use_bgm=use_bgm,
         bgm_file=bgm_file,
+        job_id=job_id,
+        preview=True,
     )
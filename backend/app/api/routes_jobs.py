@@ -0,0 +1,108 @@
+"""
+API 라우터 - Job 진행 상황
+
+- POST /api/jobs                  : 빈 job 생성 (job_id 먼저 받고 -> 생성 요청에 job_id로 넘김)
+- GET  /api/jobs/{job_id}         : 비동기 job 상태/결과 (queued / running / done / error)
+- GET  /api/jobs/{job_id}/events  : 진행 이벤트 SSE (stage / progress / done / error)
+
+왜 job을 먼저 만드나?
+- 동기 생성 요청은 끝날 때까지 응답이 안 오니까, 그 전에 구독할 job_id가 필요함
+- async_job=true로 제출하면 202 응답에 job_id가 바로 옴 (services/job_queue.py)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from backend.app.core import progress
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.services import job_queue
+from backend.app.services.storage import make_job_dir, open_job_dir
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+# 이벤트가 없을 때 연결 유지용 주석 전송 간격
+_KEEPALIVE_SEC = 15.0
+_POLL_SEC = 0.5
+
+
+@router.post("/jobs")
+def create_job():
+    """빈 job 디렉토리 생성 -> job_id"""
+    job_dir = make_job_dir()
+    return {"job_id": job_dir.name}
+
+
+async def accept_job(**kwargs) -> JSONResponse:
+    """
+    생성 요청을 큐에 넣고 202 Accepted (/api/generate* 의 async_job=true)
+
+    - Location 헤더 = 상태 조회 URL
+    """
+    status = await job_queue.enqueue(**kwargs)
+    return JSONResponse(status, status_code=202, headers={"Location": f"/api/jobs/{status['job_id']}"})
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """비동기 job 상태 (done이면 result에 GenerateResponse, error면 error 메시지)"""
+    job_dir = open_job_dir(job_id)
+    if job_dir is None:
+        raise HTTPException(404, f"job을 찾을 수 없습니다: {job_id}")
+    return job_queue.job_status(job_dir)
+
+
+def _sse(ev: dict) -> str:
+    return f"id: {ev['seq']}\nevent: {ev['type']}\ndata: {json.dumps(ev, ensure_ascii=False)}\n\n"
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(
+    job_id: str,
+    since: int = 0,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    진행 이벤트 스트림 (text/event-stream)
+
+    - 재접속하면 Last-Event-ID(또는 ?since=) 이후 이벤트부터
+    - done/error 이벤트를 보내면 스트림 종료
+    """
+    if open_job_dir(job_id) is None:
+        raise HTTPException(404, f"job을 찾을 수 없습니다: {job_id}")
+
+    try:
+        seq = int(last_event_id) if last_event_id else since
+    except ValueError:
+        seq = since
+
+    async def stream():
+        nonlocal seq
+        deadline = time.monotonic() + float(settings.PROGRESS_SSE_TIMEOUT_SEC)
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            events, done = progress.hub.events_since(job_id, seq)
+            for ev in events:
+                seq = ev["seq"]
+                yield _sse(ev)
+                last_sent = time.monotonic()
+            if done:
+                return
+            if time.monotonic() - last_sent > _KEEPALIVE_SEC:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+            await asyncio.sleep(_POLL_SEC)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,168 @@
+"""
+외부 provider용 circuit breaker (프로세스 공용)
+
+왜 필요한가?
+- OpenAI가 죽어 있으면 job마다 첫 호출이 timeout(TTS 120초, chat 60초)까지 기다린 뒤에야 fallback
+- tts의 _OpenAIGate는 job 1개 안에서만 유지됨 -> 다음 job은 또 timeout
+
+상태
+- closed    : 정상 호출, 연속 실패가 BREAKER_FAILURE_THRESHOLD번이면 open
+- open      : 호출하지 않고 바로 CircuitOpenError (호출한 쪽이 fallback), BREAKER_COOLDOWN_SEC 뒤 half_open
+- half_open : 시험 호출 1개만 통과 -> 성공하면 closed, 실패하면 다시 open
+
+provider 이름: "openai.chat", "openai.tts", "gtts"
+상태는 /health의 providers에서 확인
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """breaker가 열려 있어서 호출하지 않음"""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        cooldown_sec: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_sec = float(cooldown_sec)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _cooled_down(self) -> bool:
+        return self._clock() - self._opened_at >= self.cooldown_sec
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooled_down():
+                return HALF_OPEN
+            return self._state
+
+    def available(self) -> bool:
+        # 지금 호출해 볼 만한지 (시험 호출 자리를 잡지는 않음)
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                return self._cooled_down()
+            return not self._probing
+
+    def allow(self) -> bool:
+        # 호출해도 되면 True (half_open이면 시험 호출 1개만)
+        with self._lock:
+            if self._state == OPEN and self._cooled_down():
+                self._set_state(HALF_OPEN)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            metrics.inc(f"breaker.{self.name}.rejected")
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != CLOSED:
+                logger.info("circuit %s: closed (복구)", self.name)
+                self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                logger.warning("circuit %s: open (연속 실패 %d번, %.0fs 동안 호출 안 함)",
+                               self.name, self._failures, self.cooldown_sec)
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+                metrics.inc(f"breaker.{self.name}.opened")
+
+    def _set_state(self, state: str) -> None:
+        # lock 안에서 호출
+        self._state = state
+        metrics.set(f"breaker.{self.name}.open", 1 if state == OPEN else 0)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        with breaker.guard(): 호출
+
+        - 열려 있으면 CircuitOpenError (블록 실행 안 함)
+        - 블록에서 예외가 나면 실패로 기록하고 그대로 올림
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit open")
+        try:
+            yield
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._state
+            retry_in = None
+            if state == OPEN:
+                retry_in = max(0.0, self.cooldown_sec - (self._clock() - self._opened_at))
+                if retry_in == 0.0:
+                    state = HALF_OPEN
+            return {
+                "state": state,
+                "failures": self._failures,
+                "retry_in_sec": round(retry_in, 1) if retry_in is not None else None,
+            }
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_LOCK = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=int(settings.BREAKER_FAILURE_THRESHOLD),
+                cooldown_sec=float(settings.BREAKER_COOLDOWN_SEC),
+            )
+            _BREAKERS[name] = breaker
+        return breaker
+
+
+def snapshot(names: Optional[list] = None) -> Dict[str, dict]:
+    # /health 용: provider별 상태 (아직 한 번도 안 쓴 provider도 closed로 보이게 이름을 받음)
+    for name in names or []:
+        get_breaker(name)
+    with _LOCK:
+        breakers = dict(_BREAKERS)
+    return {name: b.snapshot() for name, b in sorted(breakers.items())}
@@ -8,7 +8,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,10 +21,33 @@ class Settings(BaseSettings):
     # --- API Keys ---
     OPENAI_API_KEY: Optional[str] = Field(default=None)
 
+    # --- OpenAI 클라이언트 (LLM/TTS 공용, services/openai_client.py) ---
+    # 429/5xx/연결 에러 재시도 횟수, 지수 백오프(jitter) 기준/상한, 엔드포인트별 읽기 timeout
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    OPENAI_MAX_RETRIES: int = 3
+    OPENAI_BACKOFF_BASE_SEC: float = 0.5
+    OPENAI_BACKOFF_MAX_SEC: float = 8.0
+    OPENAI_CHAT_TIMEOUT_SEC: float = 60.0
+    OPENAI_TTS_TIMEOUT_SEC: float = 120.0
+    # 클라이언트 쪽 한도 (계정 quota에 맞춰 설정, 0이면 제한 없음)
+    # - 한도 안에서 줄 세워 보냄 (429 -> fallback 대신), 대화형 요청이 배치보다 먼저
+    OPENAI_CHAT_RPM: int = 0
+    OPENAI_CHAT_TPM: int = 0
+    OPENAI_TTS_RPM: int = 0
+    OPENAI_TTS_TPM: int = 0
+
+    # --- Circuit breaker (provider별: openai.chat / openai.tts / gtts, core/circuit_breaker.py) ---
+    # 연속 실패 N번이면 open -> COOLDOWN초 동안 호출 없이 바로 fallback -> 시험 호출 1개로 복구 확인
+    BREAKER_FAILURE_THRESHOLD: int = 3
+    BREAKER_COOLDOWN_SEC: float = 30.0
+
     # --- Paths / Video ---
     OUTPUT_DIR: str = "outputs"
     VIDEO_SECONDS: int = 18
     VIDEO_SIZE: str = "1080x1920"  # 9:16
+    # 같이 뽑을 화면비 목록 (예: "9:16,1:1,16:9"), 비우면 VIDEO_SIZE 1개
+    # 짧은 변은 VIDEO_SIZE의 짧은 변에 맞춤, 첫 번째가 video_url(final.mp4)
+    VIDEO_ASPECTS: str = ""
     # 기본 템포: VIDEO_SECONDS를 몇 구간으로 쪼갤지(= 자막/컷 템포)
     # 6이면 1컷당 2.5초라서 쇼츠 느낌이 꽤 살아납니다.
     VIDEO_SEGMENTS: int = 10
@@ -34,6 +57,101 @@ class Settings(BaseSettings):
     CAPTION_BORDER_W: int = 12        # 글자 테두리 두께
     CAPTION_BOX_ALPHA: float = 0.35   # 자막 배경 박스 투명도(0~1)
     CAPTION_BOX_BORDER: int = 18      # 박스 여백(패딩 느낌)
+    # raster: 줄마다 투명 PNG를 1번만 그리고 overlay로 구간 합성 / drawtext: 프레임마다 drawtext
+    CAPTION_RENDERER: str = "raster"
+    CAPTION_CACHE_ENABLED: bool = True
+    CAPTION_CACHE_DIR: str = "cache/captions"
+    CAPTION_CACHE_MAX_MB: int = 256
+
+    # --- Render ---
+    # single_pass: 슬라이드쇼/자막/오디오를 FFmpeg 1회로 렌더 (실패 시 three_step으로 fallback)
+    # three_step: build_slideshow -> burn_text_overlays -> mix_audio (기존 방식)
+    RENDER_MODE: str = "single_pass"
+    # True면 두 경로를 모두 돌려서 wall time 비교 (벤치마크용, 운영에서는 끄기)
+    RENDER_COMPARE: bool = False
+    # graph: 슬라이드쇼를 FFmpeg 1개 프로세스(concat 필터)로 렌더
+    # parallel: 컷별 closed-GOP 클립을 병렬 렌더 후 concat demuxer(-c copy)로 이어붙임
+    SLIDESHOW_RENDERER: str = "graph"
+    # 컷 병렬 렌더 워커 수 (0이면 CPU 코어 수)
+    RENDER_WORKERS: int = 0
+    # FFmpeg 프로세스 전체가 나눠 쓰는 코어 수 (0이면 이 프로세스가 쓸 수 있는 코어 수, video.RenderScheduler)
+    RENDER_CORE_BUDGET: int = 0
+    # 인코딩 1건이 가져가는 코어 수 (0이면 RENDER_CORE_BUDGET / MEDIA_WORKERS)
+    RENDER_THREADS_PER_JOB: int = 0
+    # True면 받은 코어에 taskset으로 고정 (렌더끼리 캐시/코어 안 뺏게, Linux 전용)
+    RENDER_PIN_CPUS: bool = False
+    # 업로드 이미지를 1번만 디코딩해서 회전/리사이즈/색보정 후 still로 저장 (services/ingest.py)
+    IMAGE_INGEST: bool = True
+    # 컷 모션 엔진: zoompan(기본) | cropscale(t 기반 scale+crop) | kenburns(NumPy/OpenCV -> stdin 파이프)
+    # kenburns는 필터로 표현할 수 없어서 항상 컷별(parallel) 렌더로 동작
+    MOTION_ENGINE: str = "zoompan"
+
+    # --- Encoding (libx264 프로필) ---
+    # draft: 미리보기/초안, balanced: 기본, archive: 보관용 고화질
+    # preset/crf/tune/maxrate(bufsize)/gop/threads(0=자동)
+    ENCODE_PROFILE: str = "balanced"
+    ENCODE_PROFILES: Dict[str, Dict[str, Any]] = {
+        "draft": {"preset": "ultrafast", "crf": 30, "tune": "stillimage", "gop": 60, "threads": 0},
+        "balanced": {
+            "preset": "veryfast", "crf": 23, "tune": "stillimage",
+            "maxrate": "6M", "bufsize": "12M", "gop": 60, "threads": 0,
+        },
+        "archive": {"preset": "slow", "crf": 18, "tune": "stillimage", "gop": 120, "threads": 0},
+    }
+
+    # --- LLM 카피 캐시 (services/llm.py) ---
+    # 같은 입력 + 같은 프롬프트면 TTL 동안 재사용 (0이면 끔), 동시에 들어온 같은 요청은 호출 1번으로 합침
+    LLM_CACHE_TTL_SEC: int = 3600
+    LLM_CACHE_MAX_ENTRIES: int = 512
+
+    # --- Executors (블로킹 작업을 이벤트 루프 밖에서, core/executors.py) ---
+    # media: 동시에 도는 렌더/패키징 수, cpu: OpenCV 작업(0이면 코어 수), io: LLM/TTS 호출
+    MEDIA_WORKERS: int = 2
+    CPU_WORKERS: int = 0
+    IO_WORKERS: int = 16
+
+    # --- 비동기 job 큐 (async_job=true -> 202 + GET /api/jobs/{job_id}, services/job_queue.py) ---
+    # 동시에 처리하는 job 수 / 대기 가능한 job 수 (넘으면 429)
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_MAX: int = 20
+
+    # --- 배치 생성 (/api/generate-batch, services/batch.py) ---
+    # 요청 1번에 받을 수 있는 메뉴 수 / 동시에 생성하는 메뉴 수
+    BATCH_MAX_ITEMS: int = 50
+    BATCH_CONCURRENCY: int = 4
+
+    # --- Progress (SSE /api/jobs/{job_id}/events) ---
+    # 구독 1개가 최대 몇 초까지 열려 있을지 (프론트 요청 timeout과 비슷하게)
+    PROGRESS_SSE_TIMEOUT_SEC: int = 900
+
+    # --- Preview (/api/preview 저해상도 초안) ---
+    # 같은 파이프라인을 작은 크기/낮은 fps/draft 프로필로. 카피/나레이션은 job.json으로 본 렌더와 공유
+    PREVIEW_SIZE: str = "360x640"
+    PREVIEW_FPS: int = 15
+    PREVIEW_PROFILE: str = "draft"
+
+    # --- BGM bed 캐시 (loudness 정규화 + VIDEO_SECONDS 길이로 loop/trim한 WAV, services/bgm_library.py) ---
+    BGM_CACHE_ENABLED: bool = True
+    BGM_CACHE_DIR: str = "cache/bgm"
+    BGM_CACHE_MAX_MB: int = 256
+    # bed 목표 loudness (믹스에서 volume=0.22가 곱해지므로 나레이션(-16)과 같은 기준으로 맞춤)
+    BGM_TARGET_LUFS: float = -16.0
+
+    # --- Segment cache (컷 클립 캐시, SLIDESHOW_RENDERER=parallel에서 사용) ---
+    SEGMENT_CACHE_ENABLED: bool = True
+    SEGMENT_CACHE_DIR: str = "cache/segments"
+    SEGMENT_CACHE_MAX_MB: int = 2048
+
+    # --- HLS (모바일 첫 프레임 빨리 보이게: 화질 사다리 + fMP4 세그먼트) ---
+    # HLS_ENABLED=True거나 요청에 hls=true면 final.mp4 다음에 패키징 (실패해도 mp4는 그대로)
+    HLS_ENABLED: bool = False
+    HLS_SEGMENT_SEC: int = 2
+    # 짧은 변 기준 rung (세로 영상이면 가로폭 1080/720/480), 원본보다 큰 rung은 건너뜀
+    HLS_LADDER: List[Dict[str, Any]] = [
+        {"short": 1080, "bitrate": "5000k", "audio": "128k"},
+        {"short": 720, "bitrate": "2800k", "audio": "128k"},
+        {"short": 480, "bitrate": "1200k", "audio": "96k"},
+    ]
 
 
 
@@ -48,5 +166,22 @@ class Settings(BaseSettings):
     # 말하기 속도(1.0=기본). 예전 .env에서 tts_speed 로 쓰던 값도 받아줌
     TTS_SPEED: float = Field(default=1.0, validation_alias="tts_speed")
 
+    # 동시에 합성하는 줄 수 (OpenAI/gTTS 호출은 대부분 네트워크 대기)
+    TTS_CONCURRENCY: int = 4
+
+    # 줄 캐시 (provider/voice/속도/문구가 같으면 후처리된 줄 WAV 재사용, services/tts.py)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = "cache/tts"
+    TTS_CACHE_MAX_MB: int = 256
+
+    # 폴백 카피 문장 나레이션 저장소 (services/narration_bank.py, 삭제 없음)
+    # - python -m backend.app.services.narration_bank 로 미리 채움
+    # - NARRATION_WARMUP=True면 서버 시작 때 백그라운드로 채움
+    # - NARRATION_SPEEDS: 미리 만들 speed_up 값들 (synthesize_voice_lines 기본 1.10)
+    NARRATION_STORE_ENABLED: bool = True
+    NARRATION_STORE_DIR: str = "cache/narration"
+    NARRATION_WARMUP: bool = False
+    NARRATION_SPEEDS: str = "1.10"
+
 
 settings = Settings()
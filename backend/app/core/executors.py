@@ -0,0 +1,59 @@
+"""
+블로킹 작업용 스레드 풀 (이벤트 루프 밖에서 실행)
+
+왜 필요한가?
+- generate_video는 async인데 FFmpeg(subprocess), OpenAI(requests), OpenCV가 전부 블로킹
+- 그대로 부르면 렌더 1개가 도는 동안 /health까지 포함한 모든 요청이 멈춤
+
+풀 종류 (크기는 settings)
+- media : FFmpeg 렌더/패키징 (무거움 -> 동시에 몇 개만)
+- cpu   : OpenCV 이미지 분석/정규화 (코어 수)
+- io    : LLM/TTS HTTP 호출 (대부분 네트워크 대기)
+
+contextvars(progress job 등)는 복사해서 넘김
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from backend.app.core.config import settings
+
+T = TypeVar("T")
+
+_POOLS: Dict[str, ThreadPoolExecutor] = {}
+_LOCK = threading.Lock()
+
+
+def _pool_size(name: str) -> int:
+    if name == "media":
+        return max(1, int(getattr(settings, "MEDIA_WORKERS", 2) or 2))
+    if name == "cpu":
+        return max(1, int(getattr(settings, "CPU_WORKERS", 0) or 0) or (os.cpu_count() or 1))
+    if name == "io":
+        return max(1, int(getattr(settings, "IO_WORKERS", 16) or 16))
+    raise ValueError(f"unknown executor: {name}")
+
+
+def get_pool(name: str) -> ThreadPoolExecutor:
+    with _LOCK:
+        pool = _POOLS.get(name)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=_pool_size(name), thread_name_prefix=f"{name}-pool")
+            _POOLS[name] = pool
+        return pool
+
+
+async def run_in(name: str, fn: Callable[..., T], *args, **kwargs) -> T:
+    # 블로킹 함수를 name 풀에서 실행하고 결과를 await
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(fn, *args, **kwargs)
+    return await loop.run_in_executor(get_pool(name), ctx.run, call)
+
@@ -0,0 +1,102 @@
+"""
+프로세스 내부 메트릭 (카운터 / 지연시간 요약)
+
+왜 직접 만드나?
+- MVP라 Prometheus 같은 외부 의존성 없이도 /metrics 로 바로 확인하고 싶음
+- 캐시 hit/miss, 단계별 소요시간 같은 "숫자 몇 개"면 충분
+
+사용 예
+    metrics.inc("segment_cache.hits")
+    metrics.observe("llm.copy.latency_sec", 0.42)
+    metrics.observe("openai.audio.speech.latency_sec", 1.3, buckets=LATENCY_BUCKETS)  # + 히스토그램
+    metrics.snapshot()  # dict
+
+히스토그램 (buckets를 넘긴 이름만)
+- 고정 상한(le) 버킷별 누적 개수 -> p50/p95/p99는 해당 분위가 들어간 버킷의 상한으로 추정
+- 메모리는 버킷 수만큼 고정 (값을 다 들고 있지 않음)
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Optional, Sequence
+
+# 외부 API 호출 지연시간용 버킷 상한(초) - 마지막(+Inf)은 자동
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 60.0, 120.0)
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timings: Dict[str, dict] = {}
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0.0) + value
+
+    def set(self, name: str, value: float) -> None:
+        # 게이지(현재값) 용도
+        with self._lock:
+            self._counters[name] = float(value)
+
+    def observe(self, name: str, value: float, buckets: Optional[Sequence[float]] = None) -> None:
+        # 지연시간 등: count/sum/min/max (+ buckets를 넘기면 버킷별 개수, 처음 넘긴 상한으로 고정)
+        with self._lock:
+            t = self._timings.get(name)
+            if t is None:
+                t = {"count": 0, "sum": 0.0, "min": value, "max": value}
+                self._timings[name] = t
+            t["count"] += 1
+            t["sum"] += value
+            t["min"] = min(t["min"], value)
+            t["max"] = max(t["max"], value)
+            if buckets is not None and "_le" not in t:
+                t["_le"] = tuple(sorted(buckets))
+                t["_counts"] = [0] * (len(t["_le"]) + 1)
+            if "_le" in t:
+                t["_counts"][bisect.bisect_left(t["_le"], value)] += 1
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            timings = {}
+            for name, t in self._timings.items():
+                avg = t["sum"] / t["count"] if t["count"] else 0.0
+                out = {k: v for k, v in t.items() if not k.startswith("_")}
+                out["avg"] = round(avg, 4)
+                if "_le" in t:
+                    out.update(_histogram(t["_le"], t["_counts"], t["max"]))
+                timings[name] = out
+            return {"counters": dict(self._counters), "timings": timings}
+
+
+def _histogram(le: Sequence[float], counts: Sequence[int], max_value: float) -> dict:
+    """
+    버킷 개수 -> {"buckets": {"le_0.5": 누적 개수, ..., "le_inf": 전체}, "p50", "p95", "p99"}
+
+    - 분위값은 그 분위가 들어간 버킷의 상한 (마지막 +Inf 버킷이면 관측 최대값)
+    """
+    total = sum(counts)
+    cumulative = []
+    acc = 0
+    for c in counts:
+        acc += c
+        cumulative.append(acc)
+    out: dict = {"buckets": {f"le_{b:g}": n for b, n in zip(le, cumulative)}}
+    out["buckets"]["le_inf"] = total
+    for q in _QUANTILES:
+        rank = q * total
+        k = next((k for k, n in enumerate(cumulative) if n >= rank), len(cumulative) - 1)
+        out[f"p{int(q * 100)}"] = le[k] if k < len(le) else max_value
+    return out
+
+
+# 프로세스 전역 인스턴스
+metrics = Metrics()
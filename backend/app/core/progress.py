@@ -0,0 +1,189 @@
+"""
+job 진행 상황 이벤트 (SSE /api/jobs/{job_id}/events 용)
+
+왜 필요한가?
+- 렌더는 수십 초 걸리는데 프론트는 spinner만 돌고 있었음
+- FFmpeg -progress 출력(out_time/fps/speed) + LLM/TTS 단계 이벤트를 job별로 모아서 흘려보냄
+
+구조
+- 지금 처리 중인 job/단계는 contextvars로 전달 (함수 시그니처를 안 건드려도 _run 안에서 알 수 있음)
+- 이벤트는 프로세스 메모리에 job별 리스트로 보관 (seq 증가), SSE 핸들러는 seq 이후만 가져감
+- overall(0~1)은 단계 가중치(STAGE_WEIGHTS) 기준 누적, 뒤로 가지 않게 max 유지
+
+사용 예
+    progress.bind(job_id)
+    progress.stage("llm")
+    progress.report(pct=0.5, fps=120.0)
+
+    @progress.tracked   # 끝나면 done/error 이벤트 + job 바인딩 해제
+    async def generate_video(...): ...
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# 단계 순서 + 전체 진행률에서 차지하는 비율
+STAGE_WEIGHTS = OrderedDict([
+    ("ingest", 0.05),
+    ("llm", 0.15),
+    ("tts", 0.20),
+    ("render", 0.55),
+    ("package", 0.05),
+])
+
+_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("progress_job", default=None)
+_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("progress_stage", default=None)
+
+
+def _stage_span(stage: Optional[str]) -> Tuple[float, float]:
+    # 단계 시작 지점(누적 비율), 단계 비율
+    start = 0.0
+    for name, w in STAGE_WEIGHTS.items():
+        if name == stage:
+            return start, w
+        start += w
+    return start, 0.0
+
+
+class ProgressHub:
+    """
+    job별 이벤트 보관소 (스레드 안전)
+
+    - 오래된 job부터 max_jobs개까지만 유지
+    - job 하나의 이벤트는 max_events개까지만 (seq는 계속 증가)
+    """
+
+    def __init__(self, max_jobs: int = 500, max_events: int = 2000):
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self.max_jobs = max_jobs
+        self.max_events = max_events
+
+    def _get(self, job_id: str) -> dict:
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = {"events": [], "seq": 0, "overall": 0.0, "done": False}
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return job
+
+    def publish(self, job_id: str, event: dict) -> dict:
+        with self._lock:
+            job = self._get(job_id)
+            job["seq"] += 1
+
+            start, weight = _stage_span(event.get("stage"))
+            if event["type"] == "done":
+                overall = 1.0
+            else:
+                pct = min(1.0, max(0.0, float(event.get("pct") or 0.0)))
+                overall = start + weight * pct
+            job["overall"] = max(job["overall"], overall)
+
+            ev = {**event, "seq": job["seq"], "ts": round(time.time(), 3), "overall": round(job["overall"], 4)}
+            job["events"].append(ev)
+            if len(job["events"]) > self.max_events:
+                del job["events"][: len(job["events"]) - self.max_events]
+            if event["type"] in ("done", "error"):
+                job["done"] = True
+            return ev
+
+    def events_since(self, job_id: str, seq: int = 0) -> Tuple[list, bool]:
+        # seq 이후 이벤트 + 끝났는지
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return [], False
+            return [e for e in job["events"] if e["seq"] > seq], job["done"]
+
+
+# 프로세스 전역 인스턴스
+hub = ProgressHub()
+
+
+def bind(job_id: Optional[str]) -> None:
+    # 지금 컨텍스트(요청)의 job 지정 -> 이후 stage/report/_run 이벤트가 이 job으로 감
+    _job.set(job_id)
+    _stage.set(None)
+
+
+def current_job() -> Optional[str]:
+    return _job.get()
+
+
+def stage(name: str, **data) -> None:
+    # 단계 시작 이벤트 (pct=0)
+    _stage.set(name)
+    job_id = _job.get()
+    if job_id:
+        hub.publish(job_id, {"type": "stage", "stage": name, **data})
+
+
+def report(**data) -> None:
+    # 현재 단계 안에서의 진행 (pct 0~1, fps/speed 등)
+    job_id = _job.get()
+    if job_id:
+        hub.publish(job_id, {"type": "progress", "stage": _stage.get(), **data})
+
+
+def finish(ok: bool = True, **data) -> None:
+    job_id = _job.get()
+    if job_id:
+        hub.publish(job_id, {"type": "done" if ok else "error", "stage": _stage.get(), **data})
+
+
+def parse_ffmpeg_progress(block: dict) -> dict:
+    """
+    FFmpeg -progress 블록(key=value 묶음) -> {out_time_sec, fps, speed}
+
+    - out_time_us가 없으면 out_time_ms(이름과 달리 마이크로초)를 씀
+    - 아직 값이 없으면 "N/A"가 와서 그 항목은 빠짐
+    """
+    out: dict = {}
+    raw = block.get("out_time_us") or block.get("out_time_ms")
+    try:
+        out["out_time_sec"] = round(int(raw) / 1_000_000, 3)
+    except (TypeError, ValueError):
+        pass
+    try:
+        out["fps"] = float(block.get("fps", ""))
+    except ValueError:
+        pass
+    try:
+        out["speed"] = float(block.get("speed", "").rstrip("x"))
+    except ValueError:
+        pass
+    return out
+
+
+def tracked(fn):
+    """
+    async job 함수 데코레이터
+
+    - 함수 안에서 bind(job_id)한 job에 끝나면 done(결과 포함) / 예외면 error 이벤트
+    - 끝나면 바인딩 원복 (같은 컨텍스트의 다음 작업에 새지 않게)
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        job_token, stage_token = _job.set(None), _stage.set(None)
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            finish(ok=False, error=str(getattr(e, "detail", None) or e))
+            raise
+        else:
+            dump = getattr(result, "model_dump", None)
+            finish(ok=True, result=dump() if dump else None)
+            return result
+        finally:
+            _job.reset(job_token)
+            _stage.reset(stage_token)
+
+    return wrapper
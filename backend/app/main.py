@@ -2,6 +2,9 @@
 FastAPI 엔트리포인트
 
 - /api/generate : 영상 생성
+- /api/generate-batch : 메뉴 여러 개를 공용 이미지로 한 번에 (결과는 NDJSON 스트림)
+- /api/jobs/{job_id} : 비동기 job 상태/결과 (async_job=true로 제출한 경우)
+- /api/jobs/{job_id}/events : 진행 상황 SSE
 - /outputs/...  : 결과 mp4 정적 서빙
 
 왜 정적 서빙?
@@ -9,6 +12,8 @@ FastAPI 엔트리포인트
   생성된 파일을 바로 URL로 보여주면 데모가 쉬워지기 때문
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -18,8 +23,13 @@ from backend.app.core.config import settings
 from backend.app.api.routes import router as api_router
 from backend.app.api.routes_basic import router as api_basic_router
 from backend.app.api.routes_flex import router as api_flex_router
+from backend.app.api.routes_jobs import router as api_jobs_router
+from backend.app.api.routes_batch import router as api_batch_router
 
+from backend.app.core import circuit_breaker, executors
 from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+from backend.app.services import bgm_library, narration_bank
 
 logger = get_logger(__name__)
 
@@ -37,12 +47,51 @@ app.add_middleware(
 app.include_router(api_router)
 app.include_router(api_basic_router)
 app.include_router(api_flex_router)
+app.include_router(api_jobs_router)
+app.include_router(api_batch_router)
 
 
 # 폴더가 없으면 FastAPI가 시작부터 죽기 때문에 미리 생성해둔다.
 Path(settings.OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 app.mount("/outputs", StaticFiles(directory=settings.OUTPUT_DIR), name="outputs")
 
+async def _warm_bgm_library():
+    try:
+        await executors.run_in("media", bgm_library.get_library().scan)
+    except Exception as e:
+        logger.warning("BGM 라이브러리 준비 실패(요청 때 다시 시도): %s", e)
+
+
+async def _warm_narration_bank():
+    try:
+        stats = await executors.run_in("io", narration_bank.precompute)
+        logger.info("폴백 나레이션 준비 완료: %s", stats)
+    except Exception as e:
+        logger.warning("폴백 나레이션 준비 실패(요청 때 합성): %s", e)
+
+
+@app.on_event("startup")
+async def on_startup():
+    # assets/bgm 인덱스 + bed 캐시를 백그라운드로 준비 (첫 요청에서 FFmpeg를 기다리지 않게)
+    app.state.bgm_warmup = asyncio.create_task(_warm_bgm_library())
+    # 폴백 카피 문장 나레이션 (켜져 있을 때만, 이미 있는 문장은 건너뜀)
+    if settings.NARRATION_WARMUP:
+        app.state.narration_warmup = asyncio.create_task(_warm_narration_bank())
+
+
+# /health에 항상 보이는 provider (한 번도 호출 안 했어도 closed로)
+PROVIDERS = ["openai.chat", "openai.tts", "gtts"]
+
+
 @app.get("/health")
 def health():
-    return {"ok": True}
+    # ok: 서버 자체 상태 (provider가 죽어도 fallback으로 생성은 됨), degraded: 열린 breaker가 있음
+    providers = circuit_breaker.snapshot(PROVIDERS)
+    degraded = any(p["state"] != "closed" for p in providers.values())
+    return {"ok": True, "degraded": degraded, "providers": providers}
+
+
+@app.get("/metrics")
+def get_metrics():
+    # 캐시 hit/miss, 단계별 소요시간 등 프로세스 내부 메트릭
+    return metrics.snapshot()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 class GenerateResponse(BaseModel):
@@ -5,3 +7,5 @@ class GenerateResponse(BaseModel):
     video_url: str = Field(..., description="결과 mp4 다운로드/스트리밍 URL")
     caption_text: str = Field(..., description="생성된 상세/홍보 문구")
     hashtags: list[str] = Field(default_factory=list, description="추천 해시태그 리스트")
+    renditions: dict[str, str] = Field(default_factory=dict, description="화면비별 mp4 URL (예: 9:16 -> final.mp4, 1:1 -> final_1x1.mp4)")
+    playlist_url: Optional[str] = Field(None, description="HLS master playlist URL (hls 요청 시, 실패하면 없음)")
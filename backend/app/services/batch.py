@@ -0,0 +1,163 @@
+"""
+배치 생성 (/api/generate-batch) - 메뉴 여러 개를 요청 1번으로
+
+왜 필요한가?
+- 프랜차이즈 고객은 메뉴 40개를 한 번에 보냄
+- 메뉴마다 POST를 따로 하면 같은 매장 사진을 40번 업로드하고,
+  정규화/자막 위치 분석(pick_anchors_for_images)/BGM 선택도 40번 반복
+
+구조
+- prepare_batch: 공용 이미지 풀 저장 -> 정규화 -> 자막 위치 분석 -> BGM 선택 (배치당 1번, SharedAssets)
+- run_batch: 아이템마다 generate_video(shared=...)를 동시에 실행 (BATCH_CONCURRENCY개까지)
+  - 카피(LLM)/TTS는 io 풀, 렌더는 media 풀 + RenderScheduler가 알아서 줄 세움
+  - OpenAI 호출은 BATCH 우선순위 (RPM/TPM 한도가 있으면 단건 요청이 먼저)
+  - 아이템마다 job_id가 따로 있어서 진행 상황 SSE/결과 URL은 단건 생성과 같음
+- 결과는 끝나는 순서대로 한 줄씩 (NDJSON)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from backend.app.core import executors
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+from backend.app.services import openai_client
+from backend.app.services.caption_placement import pick_anchors_for_images
+from backend.app.services.storage import make_job_dir
+from backend.app.services.video_generator import (
+    SharedAssets,
+    generate_video,
+    ingest_images,
+    save_uploads,
+    select_bgm,
+    validate_request,
+)
+
+logger = get_logger(__name__)
+
+# 아이템마다 바꿀 수 있는 값 (나머지는 배치 공통)
+ITEM_FIELDS = ("menu_name", "store_name", "tone", "price", "location", "benefit", "cta")
+
+
+def parse_items(raw: str) -> List[Dict[str, str]]:
+    """
+    items 폼 값(JSON 배열) -> 아이템 목록, 잘못되면 HTTPException(400)
+
+    - 각 아이템은 menu_name 필수, ITEM_FIELDS 외의 키는 무시
+    """
+    try:
+        items = json.loads(raw or "")
+    except ValueError:
+        raise HTTPException(400, "items는 JSON 배열이어야 합니다.")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(400, "items에 메뉴를 1개 이상 넣어주세요.")
+    max_items = int(settings.BATCH_MAX_ITEMS)
+    if len(items) > max_items:
+        raise HTTPException(400, f"한 번에 최대 {max_items}개까지 생성할 수 있습니다.")
+
+    out = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not str(item.get("menu_name") or "").strip():
+            raise HTTPException(400, f"items[{i}]: menu_name은 필수입니다.")
+        out.append({k: str(item[k]) for k in ITEM_FIELDS if item.get(k) is not None})
+    return out
+
+
+async def prepare_batch(
+    images: List[UploadFile],
+    bgm_file: Optional[UploadFile] = None,
+    use_bgm: bool = True,
+    profile: Optional[str] = None,
+    aspects: Optional[str] = None,
+) -> tuple[str, SharedAssets]:
+    """
+    공용 이미지 풀/BGM 준비 -> (batch_id, SharedAssets)
+
+    - 업로드는 응답 스트리밍 전에 저장 (요청이 끝나면 UploadFile이 닫힘)
+    - 정규화 결과는 batch 디렉토리(outputs/<batch_id>/artifacts/shared)에 두고 아이템 job들이 같이 읽음
+    - 자막 위치 분석도 여기서 1번 -> 아이템 렌더에서는 memo hit
+    """
+    profile, renditions = validate_request(images, "batch", profile, aspects)
+
+    batch_dir = make_job_dir()
+    shared_dir = batch_dir / "artifacts" / "shared"
+    shared_dir.mkdir(parents=True, exist_ok=True)
+
+    img_paths = await save_uploads(images, batch_dir / "inputs")
+    image_paths, render_opts = await ingest_images(img_paths, renditions, profile, shared_dir)
+    try:
+        await executors.run_in("cpu", pick_anchors_for_images, image_paths)
+    except Exception as e:
+        logger.warning("자막 위치 미리 분석 실패(렌더에서 다시 계산): %s", e)
+    bgm_path = await select_bgm(use_bgm, bgm_file, shared_dir)
+
+    shared = SharedAssets(
+        image_paths=image_paths,
+        render_opts=render_opts,
+        profile=profile,
+        renditions=renditions,
+        bgm_path=bgm_path,
+    )
+    logger.info("배치 준비 완료: batch=%s images=%d cuts=%d", batch_dir.name, len(img_paths), len(image_paths))
+    return batch_dir.name, shared
+
+
+async def run_batch(
+    batch_id: str,
+    shared: SharedAssets,
+    items: List[Dict[str, str]],
+    store_name: str = "",
+    tone: str = "감성",
+    use_tts: bool = True,
+    use_bgm: bool = True,
+    hls: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    아이템들을 동시에 생성하고 끝나는 순서대로 결과(dict)를 돌려줌
+
+    - {"type": "item", "index": i, "ok": True, ...GenerateResponse} / 실패면 ok=False + error
+    - 마지막에 {"type": "done", "batch_id", "ok": 성공 수, "failed": 실패 수}
+    - 한 아이템이 실패해도 나머지는 계속
+    """
+    sem = asyncio.Semaphore(max(1, int(settings.BATCH_CONCURRENCY)))
+
+    async def one(i: int, item: Dict[str, str]) -> Dict[str, Any]:
+        # 이 task의 OpenAI 호출은 대화형 요청 뒤에 줄 섬 (executors.run_in이 contextvar를 넘겨줌)
+        openai_client.set_priority(openai_client.BATCH)
+        async with sem:
+            fields = {"store_name": store_name, "tone": tone, **item}
+            try:
+                result = await generate_video(
+                    images=[],
+                    use_tts=use_tts,
+                    use_bgm=use_bgm,
+                    hls=hls,
+                    shared=shared,
+                    **fields,
+                )
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                logger.warning("배치 아이템 실패: batch=%s index=%d (%s)", batch_id, i, detail)
+                metrics.inc("batch.items_failed")
+                return {"type": "item", "index": i, "ok": False, "menu_name": item["menu_name"], "error": str(detail)}
+            metrics.inc("batch.items_done")
+            return {"type": "item", "index": i, "ok": True, "menu_name": item["menu_name"], **result.model_dump()}
+
+    tasks = [asyncio.create_task(one(i, item)) for i, item in enumerate(items)]
+    ok = 0
+    try:
+        for fut in asyncio.as_completed(tasks):
+            res = await fut
+            ok += int(res["ok"])
+            yield res
+    finally:
+        # 클라이언트가 중간에 끊으면 남은 아이템은 취소
+        for t in tasks:
+            t.cancel()
+    yield {"type": "done", "batch_id": batch_id, "ok": ok, "failed": len(items) - ok}
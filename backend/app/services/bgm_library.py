@@ -0,0 +1,230 @@
+"""
+BGM 라이브러리 (loudness 정규화 + 영상 길이로 미리 loop/trim한 bed 캐시)
+
+왜 필요한가?
+- mix_audio/render_single_pass마다 assets/bgm의 mp3를 -stream_loop -1로 열고 디코딩 -> volume -> trim
+- generate_video도 요청마다 bgm 폴더를 glob
+- 곡마다 음량이 제각각이라 같은 volume=0.22여도 어떤 곡은 나레이션을 덮음
+
+구조
+- 트랙마다 1번: 길이(media_info) + integrated loudness(loudnorm 측정) -> 목표 LUFS까지 gain
+  -> VIDEO_SECONDS 길이로 loop/trim한 PCM WAV "bed" (*.bed.wav)
+- bed는 (내용 해시, 길이, 목표 LUFS) 키로 DiskLRUCache에 저장 -> 사용자 업로드 BGM도 같은 파일이면 재사용
+- 믹스는 bed를 그대로 읽음 (루프/디코딩 없음, video._bgm_input_args)
+  - 캐시 파일을 직접 넘기지 않고 job 폴더에 link_or_copy한 경로를 넘김
+    (다른 job의 put이 eviction으로 지워도 렌더 중인 파일은 그대로)
+- assets/bgm 인덱스는 서버 시작 때 백그라운드로 만듦 (main.py)
+- 캐시를 끄거나 bed 생성이 실패하면 원본 파일을 그대로 씀 (기존처럼 루프)
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.services import media_info
+from backend.app.services.disk_cache import DiskLRUCache, file_sha256, link_or_copy, make_key
+from backend.app.services.video import BGM_BED_SUFFIX, FFMPEG_BIN, _run
+from backend.app.utils.video_utils import project_root
+
+logger = get_logger(__name__)
+
+# 게인 보정 범위 (측정이 이상하거나 거의 무음인 곡을 과하게 키우지 않게)
+_MIN_GAIN_DB = -20.0
+_MAX_GAIN_DB = 12.0
+
+
+@dataclass
+class BgmTrack:
+    source: Path
+    sha256: str
+    duration_sec: float
+    loudness_lufs: Optional[float]
+    bed: Path  # 믹스에 쓸 파일 (bed가 없으면 원본)
+
+
+_CACHE: Optional[DiskLRUCache] = None
+
+
+def _cache() -> Optional[DiskLRUCache]:
+    # bed 캐시 (BGM_CACHE_ENABLED=False면 None)
+    global _CACHE
+    if not getattr(settings, "BGM_CACHE_ENABLED", True):
+        return None
+    if _CACHE is None:
+        _CACHE = DiskLRUCache(
+            Path(settings.BGM_CACHE_DIR),
+            max_bytes=int(settings.BGM_CACHE_MAX_MB) * 1024 * 1024,
+            name="bgm_cache",
+        )
+    return _CACHE
+
+
+def measure_loudness(src: Path) -> Optional[float]:
+    """
+    integrated loudness(LUFS) 측정 - loudnorm 1st pass의 JSON 출력(input_i)
+
+    - 측정 실패/무음(-inf)이면 None
+    """
+    cmd = [
+        FFMPEG_BIN, "-hide_banner", "-nostats",
+        "-i", str(src),
+        "-vn", "-af", "loudnorm=print_format=json",
+        "-f", "null", "-",
+    ]
+    p = _run(cmd)
+    m = re.search(r"\{[^{}]*\"input_i\"[^{}]*\}", p.stderr or "")
+    if not m:
+        return None
+    try:
+        return float(json.loads(m.group(0))["input_i"])
+    except (ValueError, KeyError):
+        return None
+
+
+def _gain_db(loudness: Optional[float]) -> float:
+    if loudness is None:
+        return 0.0
+    gain = float(settings.BGM_TARGET_LUFS) - loudness
+    return round(max(_MIN_GAIN_DB, min(_MAX_GAIN_DB, gain)), 2)
+
+
+def _build_bed(src: Path, dst: Path, total: float, gain_db: float) -> Path:
+    # 원본 -> (loop) -> gain -> 48kHz 스테레오 PCM, total초로 자름
+    cmd = [
+        FFMPEG_BIN, "-y",
+        "-stream_loop", "-1", "-i", str(src),
+        "-t", f"{total:.3f}",
+        "-vn", "-af", f"volume={gain_db}dB,aresample=48000",
+        "-ac", "2", "-c:a", "pcm_s16le",
+        str(dst),
+    ]
+    _run(cmd)
+    return dst
+
+
+def prepare_track(src: Path) -> BgmTrack:
+    """
+    BGM 파일 -> BgmTrack (bed 캐시 hit이면 FFmpeg 실행 없음)
+
+    - 키: 내용 해시 + VIDEO_SECONDS + BGM_TARGET_LUFS (설정이 바뀌면 새 bed)
+    """
+    src = Path(src)
+    total = float(settings.VIDEO_SECONDS)
+    sha = file_sha256(src)
+    cache = _cache()
+    key = make_key("bgm-bed-v1", sha, f"{total:.3f}", settings.BGM_TARGET_LUFS)
+
+    if cache is not None:
+        hit = cache.get(key, BGM_BED_SUFFIX)
+        meta = cache.get(key, ".json", record=False) if hit else None
+        if hit and meta:
+            info = json.loads(meta.read_text(encoding="utf-8"))
+            return BgmTrack(src, sha, info["duration_sec"], info["loudness_lufs"], hit)
+
+    duration = media_info.duration_sec(src)
+    loudness = None
+    try:
+        loudness = measure_loudness(src)
+    except Exception as e:
+        logger.warning("BGM loudness 측정 실패(게인 0dB): %s (%s)", src.name, e)
+
+    if cache is None:
+        return BgmTrack(src, sha, duration, loudness, src)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            bed = _build_bed(src, Path(tmp) / f"bed{BGM_BED_SUFFIX}", total, _gain_db(loudness))
+            meta = Path(tmp) / "meta.json"
+            meta.write_text(json.dumps({"duration_sec": duration, "loudness_lufs": loudness}), encoding="utf-8")
+            cached = cache.put(key, bed, BGM_BED_SUFFIX)
+            cache.put(key, meta, ".json")
+    except Exception as e:
+        logger.warning("BGM bed 생성 실패(원본 사용): %s (%s)", src.name, e)
+        return BgmTrack(src, sha, duration, loudness, src)
+
+    logger.info(
+        "BGM bed 생성: %s (%.1fs, %s LUFS, gain=%sdB)",
+        src.name, duration, loudness, _gain_db(loudness),
+    )
+    return BgmTrack(src, sha, duration, loudness, cached)
+
+
+def _job_bed(track: BgmTrack, out_dir: Path) -> Path:
+    # 믹스에 넘길 job 폴더의 bed (하드링크면 복사 비용 없음), bed가 없으면 원본 그대로
+    if track.bed == track.source:
+        return track.source
+    return link_or_copy(track.bed, Path(out_dir) / f"bgm{BGM_BED_SUFFIX}")
+
+
+class BgmLibrary:
+    """
+    assets/bgm 트랙 인덱스
+
+    - scan(): 폴더의 mp3/wav를 전부 prepare_track (서버 시작 때 1번)
+    - default_bed(out_dir): 첫 번째 트랙(이름순)의 bed를 out_dir로 link_or_copy, 아직 scan 전이면 그 트랙만 준비
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._tracks: Dict[str, BgmTrack] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self) -> List[Path]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p for p in self.root.iterdir() if p.suffix.lower() in (".mp3", ".wav"))
+
+    def _get(self, src: Path) -> BgmTrack:
+        with self._lock:
+            track = self._tracks.get(str(src))
+            if track is None or not track.bed.exists():
+                track = prepare_track(src)
+                self._tracks[str(src)] = track
+            return track
+
+    def scan(self) -> List[BgmTrack]:
+        tracks = []
+        for src in self.candidates():
+            try:
+                tracks.append(self._get(src))
+            except Exception as e:
+                logger.warning("BGM 인덱싱 실패(건너뜀): %s (%s)", src.name, e)
+        logger.info("BGM 라이브러리: %d곡 %s", len(tracks), [t.source.name for t in tracks])
+        return tracks
+
+    def default_bed(self, out_dir: Path) -> Optional[Path]:
+        candidates = self.candidates()
+        if not candidates:
+            return None
+        try:
+            return _job_bed(self._get(candidates[0]), out_dir)
+        except Exception as e:
+            logger.warning("기본 BGM 준비 실패(원본 사용): %s (%s)", candidates[0].name, e)
+            return candidates[0]
+
+
+_LIBRARY: Optional[BgmLibrary] = None
+
+
+def get_library() -> BgmLibrary:
+    global _LIBRARY
+    if _LIBRARY is None:
+        _LIBRARY = BgmLibrary(project_root() / "assets" / "bgm")
+    return _LIBRARY
+
+
+def bed_for(src: Path, out_dir: Path) -> Path:
+    # 사용자 업로드 BGM -> out_dir의 bed (같은 내용이면 캐시 hit), 실패하면 원본
+    try:
+        return _job_bed(prepare_track(src), out_dir)
+    except Exception as e:
+        logger.warning("업로드 BGM 준비 실패(원본 사용): %s", e)
+        return src
@@ -15,6 +15,8 @@
 """
 
 from __future__ import annotations
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -47,7 +49,35 @@ def _band_complexity(gray: np.ndarray) -> float:
     return float(edges.mean())  # 0~255 평균
 
 
+# (경로, mtime, 크기) -> Anchor
+# 컷 수만큼 같은 사진이 반복되고, 화면비별 자막/미리보기에서도 같은 사진을 다시 분석하므로 memo
+_MEMO: "OrderedDict[tuple, Anchor]" = OrderedDict()
+_MEMO_MAX = 512
+_MEMO_LOCK = threading.Lock()
+
+
 def pick_anchor_for_image(image_path: Path) -> Anchor:
+    try:
+        st = Path(image_path).stat()
+        key = (str(Path(image_path).resolve()), st.st_mtime_ns, st.st_size)
+    except OSError:
+        return _pick_anchor(image_path)
+
+    with _MEMO_LOCK:
+        hit = _MEMO.get(key)
+        if hit is not None:
+            _MEMO.move_to_end(key)
+            return hit
+
+    anchor = _pick_anchor(image_path)
+    with _MEMO_LOCK:
+        _MEMO[key] = anchor
+        while len(_MEMO) > _MEMO_MAX:
+            _MEMO.popitem(last=False)
+    return anchor
+
+
+def _pick_anchor(image_path: Path) -> Anchor:
     img = cv2.imread(str(image_path))
     if img is None:
         # 파일 읽기 실패 시 기본값: 상단
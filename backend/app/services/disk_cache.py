@@ -0,0 +1,134 @@
+"""
+로컬 디스크 LRU 캐시 (content-addressed)
+
+- key(문자열 해시) -> 파일 1개
+- 용량 상한(max_bytes)을 넘으면 가장 오래 안 쓴 파일부터 삭제
+- "최근 사용"은 파일 mtime으로 관리 (hit 때마다 touch)
+- hit/miss 카운터는 core.metrics에 "<name>.hits" / "<name>.misses"로 기록
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    # 큰 사진도 메모리에 다 올리지 않고 해시
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def make_key(*parts) -> str:
+    # 여러 값을 묶어서 하나의 캐시 키로
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(src: Path, dst: Path) -> Path:
+    # 같은 파일시스템이면 하드링크(복사 비용 0), 안되면 복사
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        dst.unlink(missing_ok=True)
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+    return dst
+
+
+class DiskLRUCache:
+    def __init__(self, root: Path, max_bytes: int, name: str = "cache"):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.name = name
+        self._lock = threading.Lock()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        # 디렉토리 하나에 파일이 너무 많아지지 않게 앞 2글자로 샤딩
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = "", record: bool = True) -> Optional[Path]:
+        # record=False: 같은 키의 부속 파일(메타 json 등) 조회라 hit/miss 집계에서 제외
+        p = self._path(key, suffix)
+        if p.exists():
+            try:
+                os.utime(p, None)  # LRU 갱신
+            except OSError:
+                pass
+            if record:
+                metrics.inc(f"{self.name}.hits")
+            return p
+        if record:
+            metrics.inc(f"{self.name}.misses")
+        return None
+
+    def put(self, key: str, src: Path, suffix: str = "") -> Path:
+        """
+        src 파일을 캐시에 넣음 (tmp에 쓰고 os.replace로 원자적 교체)
+        """
+        dst = self._path(key, suffix)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+        self.evict()
+        return dst
+
+    def evict(self) -> None:
+        # 용량 상한 넘으면 mtime 오래된 순으로 삭제
+        with self._lock:
+            entries = []
+            total = 0
+            for p in self.root.rglob("*"):
+                if not p.is_file() or p.name.endswith(".tmp"):
+                    continue
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+
+            metrics.set(f"{self.name}.bytes", total)
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _mtime, size, p in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    p.unlink()
+                    total -= size
+                    metrics.inc(f"{self.name}.evictions")
+                except OSError:
+                    continue
+            metrics.set(f"{self.name}.bytes", total)
+            logger.info("%s eviction 완료: %.1fMB", self.name, total / (1 << 20))
+
+    def stats(self) -> dict:
+        hits = metrics.get(f"{self.name}.hits")
+        misses = metrics.get(f"{self.name}.misses")
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "bytes": metrics.get(f"{self.name}.bytes"),
+        }
@@ -0,0 +1,141 @@
+"""
+HLS 패키징 (final.mp4 -> 화질 사다리 + fMP4 세그먼트)
+
+왜 필요한가?
+- 프론트는 /outputs 정적 서빙으로 final.mp4를 통째로 받음
+- 모바일 네트워크에서는 1080x1920 mp4의 앞부분(moov + 첫 GOP)을 받을 때까지 첫 프레임이 안 보임
+- HLS면 플레이어가 가장 낮은 rung(480p)부터 시작해서 대역폭 보고 올라감
+
+구성
+- FFmpeg 1회: 디코딩 1번 -> split -> rung별 scale + 인코딩 -> hls muxer가 master.m3u8까지 작성
+- 세그먼트는 fMP4(.m4s), 키프레임은 HLS_SEGMENT_SEC 간격으로 rung끼리 맞춤 (화질 전환 시 끊김 방지)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.services.video import DEFAULT_FPS, FFMPEG_BIN, _run, encode_args
+
+logger = get_logger(__name__)
+
+MASTER_PLAYLIST = "master.m3u8"
+
+
+def _kbps(rate: str) -> int:
+    # "5000k" / "5M" / "5000000" -> kbps
+    r = str(rate).strip().lower()
+    if r.endswith("k"):
+        return int(float(r[:-1]))
+    if r.endswith("m"):
+        return int(float(r[:-1]) * 1000)
+    return int(float(r) / 1000)
+
+
+def _ladder(w: int, h: int) -> List[Dict[str, Any]]:
+    """
+    settings.HLS_LADDER에서 원본(w x h)보다 크지 않은 rung만 (큰 것부터)
+
+    - 업스케일 rung은 용량만 늘고 화질 이득이 없어서 뺌
+    - 전부 원본보다 크면 원본 크기 1개
+    """
+    src_short = min(w, h)
+    rungs = sorted(settings.HLS_LADDER, key=lambda r: -int(r["short"]))
+    ladder = [r for r in rungs if int(r["short"]) <= src_short]
+    if not ladder:
+        ladder = [{**rungs[-1], "short": src_short}]
+    return ladder
+
+
+# rung마다 -b:v:k/-maxrate:v:k로 비트레이트를 정하니까 프로필의 품질/상한 옵션은 뺌
+_RATE_OPTS = ("-crf", "-maxrate", "-bufsize")
+
+
+def _video_encode_args(profile: Optional[str], gop: int) -> List[str]:
+    # 인코딩 프로필(encode_args) 기준 x264 옵션 - preset/tune/threads/pix_fmt는 프로필 값 그대로
+    args = encode_args(profile, gop=gop)
+    out: List[str] = []
+    k = 0
+    while k < len(args):
+        if args[k] in _RATE_OPTS:
+            k += 2
+            continue
+        out.append(args[k])
+        k += 1
+    return out
+
+
+def _rung_scale(short: int, w: int, h: int) -> str:
+    # 짧은 변을 short로, 긴 변은 비율 유지(짝수)
+    return f"scale={short}:-2" if w <= h else f"scale=-2:{short}"
+
+
+def package_hls(
+    in_video: Path,
+    out_dir: Path,
+    size: Tuple[int, int],
+    has_audio: bool = True,
+    profile: Optional[str] = None,
+    fps: Optional[int] = None,
+) -> Path:
+    """
+    final.mp4 -> out_dir/master.m3u8 (+ stream_0.m3u8, stream_0_000.m4s, ...)
+
+    - size: in_video의 (w, h) - rung 선택/scale 방향 판단용
+    - has_audio: 오디오 트랙이 있을 때만 rung마다 aac 매핑
+    - profile: x264 옵션(preset/tune 등)은 인코딩 프로필 값을 따름 (비트레이트만 rung별)
+    - fps: in_video의 fps (None이면 DEFAULT_FPS) - 키프레임 간격 = HLS_SEGMENT_SEC x fps
+    - 리턴값: master playlist 경로
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    w, h = size
+    ladder = _ladder(w, h)
+    n = len(ladder)
+    seg = max(1, int(getattr(settings, "HLS_SEGMENT_SEC", 2)))
+    gop = seg * int(fps or DEFAULT_FPS)
+
+    filters = [f"[0:v]split={n}" + "".join(f"[s{k}]" for k in range(n))]
+    for k, rung in enumerate(ladder):
+        filters.append(f"[s{k}]{_rung_scale(int(rung['short']), w, h)},setsar=1[v{k}]")
+
+    cmd = [FFMPEG_BIN, "-y", "-i", str(in_video), "-filter_complex", ";".join(filters)]
+    for k in range(n):
+        cmd += ["-map", f"[v{k}]"]
+        if has_audio:
+            cmd += ["-map", "0:a:0"]
+
+    cmd += _video_encode_args(profile, gop)
+    # rung끼리 키프레임 위치가 같아야 세그먼트 경계에서 화질 전환 가능
+    cmd += ["-keyint_min", str(gop), "-sc_threshold", "0"]
+    for k, rung in enumerate(ladder):
+        kbps = _kbps(rung["bitrate"])
+        cmd += [
+            f"-b:v:{k}", f"{kbps}k",
+            f"-maxrate:v:{k}", f"{int(kbps * 1.07)}k",
+            f"-bufsize:v:{k}", f"{int(kbps * 1.5)}k",
+        ]
+    if has_audio:
+        cmd += ["-c:a", "aac", "-ac", "2"]
+        for k, rung in enumerate(ladder):
+            cmd += [f"-b:a:{k}", str(rung.get("audio", "128k"))]
+
+    var_map = " ".join(f"v:{k},a:{k}" if has_audio else f"v:{k}" for k in range(n))
+    cmd += [
+        "-f", "hls",
+        "-hls_time", str(seg),
+        "-hls_playlist_type", "vod",
+        "-hls_segment_type", "fmp4",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", str(out_dir / "stream_%v_%03d.m4s"),
+        "-master_pl_name", MASTER_PLAYLIST,
+        "-var_stream_map", var_map,
+        str(out_dir / "stream_%v.m3u8"),
+    ]
+    _run(cmd)
+
+    master = out_dir / MASTER_PLAYLIST
+    logger.info("HLS 패키징 완료: %s (rungs=%s)", master, [r["short"] for r in ladder])
+    return master
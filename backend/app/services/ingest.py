@@ -0,0 +1,155 @@
+"""
+업로드 이미지 정규화 (ingestion)
+
+왜 필요한가?
+- 폰 사진은 12~48MP + WebP/HEIC + EXIF 회전이 섞여서 들어옴
+- 기존에는 컷마다 scale/pad/setsar/eq를 "출력 프레임마다" 돌렸음
+- 정지 이미지라 이 작업은 한 번만 하면 됨
+
+그래서
+- 업로드 1장당 1번만 디코딩
+- EXIF 회전 보정 -> VIDEO_SIZE에 맞춰 축소 + 패딩 -> 색보정(eq) 1회
+- 가벼운 JPEG로 저장하고, 슬라이드쇼 필터는 zoompan만 돌게 한다
+- 여러 화면비를 같이 뽑을 때는 패딩 없이 축소 + 색보정만 (패딩은 렌디션마다 필터에서)
+"""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.services.video import FFMPEG_BIN, _video_dims
+
+logger = get_logger(__name__)
+
+# build_slideshow에서 쓰던 eq=contrast=1.06:saturation=1.05 와 같은 값
+GRADE_CONTRAST = 1.06
+GRADE_SATURATION = 1.05
+
+
+def _decode(src: Path, tmp_dir: Path) -> Optional[np.ndarray]:
+    """
+    이미지 디코딩 (BGR)
+
+    - cv2.IMREAD_COLOR는 EXIF orientation을 자동 적용
+    - cv2가 못 읽는 포맷(HEIC 등)은 FFmpeg로 1프레임 PNG 변환 후 다시 읽음
+    """
+    img = cv2.imread(str(src), cv2.IMREAD_COLOR)
+    if img is not None:
+        return img
+
+    tmp_png = tmp_dir / f"{src.stem}_decoded.png"
+    cmd = [FFMPEG_BIN, "-y", "-i", str(src), "-frames:v", "1", str(tmp_png)]
+    p = subprocess.run(cmd, capture_output=True, text=True)
+    if p.returncode != 0:
+        logger.warning("이미지 디코딩 실패: %s\n%s", src, p.stderr)
+        return None
+
+    img = cv2.imread(str(tmp_png), cv2.IMREAD_COLOR)
+    try:
+        tmp_png.unlink(missing_ok=True)
+    except Exception:
+        pass
+    return img
+
+
+def _fit_and_pad(img: np.ndarray, w: int, h: int) -> np.ndarray:
+    # scale=w:h:force_original_aspect_ratio=decrease + pad=w:h:(ow-iw)/2:(oh-ih)/2 와 동일
+    ih, iw = img.shape[:2]
+    ratio = min(w / iw, h / ih)
+    nw, nh = max(1, int(round(iw * ratio))), max(1, int(round(ih * ratio)))
+
+    interp = cv2.INTER_AREA if ratio < 1.0 else cv2.INTER_CUBIC
+    resized = cv2.resize(img, (nw, nh), interpolation=interp)
+
+    canvas = np.zeros((h, w, 3), dtype=np.uint8)
+    x0, y0 = (w - nw) // 2, (h - nh) // 2
+    canvas[y0:y0 + nh, x0:x0 + nw] = resized
+    return canvas
+
+
+def _fit_within(img: np.ndarray, w: int, h: int) -> np.ndarray:
+    # w x h 안에 들어가게 축소만 (확대/패딩 없음) - 렌디션별 scale/pad 전 공통 still
+    ih, iw = img.shape[:2]
+    ratio = min(w / iw, h / ih)
+    if ratio >= 1.0:
+        return img
+    nw, nh = max(1, int(round(iw * ratio))), max(1, int(round(ih * ratio)))
+    return cv2.resize(img, (nw, nh), interpolation=cv2.INTER_AREA)
+
+
+def _color_grade(img: np.ndarray) -> np.ndarray:
+    # eq 필터처럼 luma는 contrast, chroma는 saturation을 중심값(128) 기준으로 늘림
+    ycc = cv2.cvtColor(img, cv2.COLOR_BGR2YCrCb).astype(np.float32)
+    ycc[..., 0] = (ycc[..., 0] - 128.0) * GRADE_CONTRAST + 128.0
+    ycc[..., 1:] = (ycc[..., 1:] - 128.0) * GRADE_SATURATION + 128.0
+    ycc = np.clip(ycc, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(ycc, cv2.COLOR_YCrCb2BGR)
+
+
+def normalize_image(
+    src: Path,
+    dst: Path,
+    size: Optional[Tuple[int, int]] = None,
+    pad: bool = True,
+) -> Optional[Path]:
+    """
+    업로드 1장 -> 정규화된 still(JPEG)
+
+    - pad=False: size 안으로 축소 + 색보정만 (여러 화면비 렌더용)
+
+    리턴값: 성공하면 dst, 실패하면 None (호출측에서 원본 + 전체 필터 체인으로 fallback)
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    w, h = size or _video_dims()
+
+    img = _decode(src, dst.parent)
+    if img is None:
+        return None
+
+    img = _fit_and_pad(img, w, h) if pad else _fit_within(img, w, h)
+    img = _color_grade(img)
+
+    if not cv2.imwrite(str(dst), img, [cv2.IMWRITE_JPEG_QUALITY, 95]):
+        logger.warning("정규화 이미지 저장 실패: %s", dst)
+        return None
+    return dst
+
+
+def normalize_images(
+    image_paths: list[Path],
+    out_dir: Path,
+    size: Optional[Tuple[int, int]] = None,
+    pad: bool = True,
+) -> Optional[list[Path]]:
+    """
+    이미지 목록 정규화 (같은 파일은 1번만 처리, 순서 유지)
+
+    - 하나라도 실패하면 None -> 슬라이드쇼는 원본 + scale/pad/eq 체인으로 동작
+    - size/pad는 normalize_image와 동일
+    """
+    if not getattr(settings, "IMAGE_INGEST", True):
+        return None
+
+    done: dict[Path, Path] = {}
+    for src in image_paths:
+        if src in done:
+            continue
+        dst = out_dir / f"{src.stem}_norm.jpg"
+        try:
+            res = normalize_image(src, dst, size, pad)
+        except Exception as e:
+            logger.warning("이미지 정규화 예외: %s (%s)", src, e)
+            res = None
+        if res is None:
+            logger.warning("이미지 정규화 실패 -> 원본 경로로 fallback: %s", src)
+            return None
+        done[src] = res
+
+    return [done[p] for p in image_paths]
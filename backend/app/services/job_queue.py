@@ -0,0 +1,247 @@
+"""
+비동기 job 큐 (202 Accepted + 상태 조회)
+
+왜 필요한가?
+- /api/generate* 는 LLM -> TTS -> 렌더가 끝날 때까지 HTTP 연결을 잡고 있음 (Streamlit은 timeout=600으로 대기)
+- 요청이 몰리면 워커/프록시 연결이 묶이고, 중간에 연결이 끊기면 다 만든 결과도 못 받음
+
+구조
+- 제출: 업로드 파일 + 폼 값을 job 디렉토리(inputs/)에 저장 -> 큐에 넣고 바로 job_id 반환
+- 처리: 백그라운드 워커(JOB_WORKERS개)가 큐에서 꺼내 generate_video 실행
+- 상태: job_dir/status.json (queued -> running -> done/error, 결과 포함) -> GET /api/jobs/{job_id}
+- 대기열이 JOB_QUEUE_MAX만큼 차 있으면 429 (클라이언트가 나중에 다시 시도)
+- 큐/워커는 이벤트 루프에 묶여 있어서, 루프가 바뀌면(테스트 등) 새로 만듦
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+from backend.app.services.storage import load_job_status, make_job_dir, open_job_dir, save_job_status
+from backend.app.services.video_generator import StoredUpload, generate_video, validate_request
+
+logger = get_logger(__name__)
+
+# inputs/ 아래에 저장하는 제출 내용 (폼 값 + 업로드 파일 목록)
+REQUEST_FILE = "request.json"
+
+# 아직 끝나지 않은 상태 (같은 job_id로 다시 제출 불가)
+ACTIVE_STATES = ("queued", "running")
+
+
+class JobQueue:
+    """
+    generate_video를 백그라운드에서 돌리는 큐
+
+    - workers: 동시에 처리하는 job 수
+    - max_size: 대기열 최대 길이 (처리 중인 job은 제외)
+    """
+
+    def __init__(self, workers: int, max_size: int):
+        self.workers = workers
+        self.max_size = max_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending: List[str] = []
+        self._running: set = set()
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending = []
+        self._running = set()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("job 큐 시작: workers=%d max=%d", self.workers, self.max_size)
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def full(self) -> bool:
+        return self.depth() >= self.max_size
+
+    def position(self, job_id: str) -> Optional[int]:
+        # 대기열에서 몇 번째인지 (1부터, 없으면 None)
+        try:
+            return self._pending.index(job_id) + 1
+        except ValueError:
+            return None
+
+    def knows(self, job_id: str) -> bool:
+        # 이 프로세스의 큐가 들고 있는 job인지 (대기 중 또는 처리 중)
+        return job_id in self._running or job_id in self._pending
+
+    def _update_metrics(self) -> None:
+        metrics.set("jobs.queue_depth", len(self._pending))
+        metrics.set("jobs.running", len(self._running))
+
+    def put(self, job_id: str) -> None:
+        self._ensure_started()
+        if self.full():
+            metrics.inc("jobs.rejected")
+            raise HTTPException(429, "대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+        self._pending.append(job_id)
+        self._queue.put_nowait(job_id)
+        metrics.inc("jobs.submitted")
+        self._update_metrics()
+
+    async def join(self) -> None:
+        # 대기열 + 처리 중인 job이 모두 끝날 때까지 (테스트/종료용)
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except Exception:
+                logger.exception("job 처리 중 예외: %s", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str) -> None:
+        self._pending.remove(job_id)
+        self._running.add(job_id)
+        self._update_metrics()
+        try:
+            job_dir = open_job_dir(job_id)
+            if job_dir is None:
+                logger.warning("job 디렉토리가 사라짐: %s", job_id)
+                return
+            await _run_job(job_dir)
+        finally:
+            self._running.discard(job_id)
+            self._update_metrics()
+
+
+async def _run_job(job_dir: Path) -> None:
+    # 저장해 둔 입력으로 generate_video 실행 -> status.json에 결과/에러 기록
+    status = load_job_status(job_dir)
+    started = time.time()
+    metrics.observe("jobs.wait_sec", started - float(status.get("submitted_at") or started))
+    status.update(status="running", started_at=round(started, 3))
+    save_job_status(job_dir, status)
+
+    try:
+        req = json.loads((job_dir / "inputs" / REQUEST_FILE).read_text(encoding="utf-8"))
+        inputs_dir = job_dir / "inputs"
+        images = [StoredUpload(inputs_dir / f["path"], f["filename"]) for f in req["images"]]
+        bgm = req.get("bgm")
+        bgm_file = StoredUpload(inputs_dir / bgm["path"], bgm["filename"]) if bgm else None
+        result = await generate_video(images=images, bgm_file=bgm_file, job_id=job_dir.name, **req["fields"])
+    except Exception as e:
+        detail = getattr(e, "detail", None) or str(e)
+        logger.warning("job 실패: %s (%s)", job_dir.name, detail)
+        status.update(status="error", error=str(detail))
+        metrics.inc("jobs.failed")
+    else:
+        status.update(status="done", result=result.model_dump())
+        metrics.inc("jobs.done")
+    finished = time.time()
+    status["finished_at"] = round(finished, 3)
+    metrics.observe("jobs.run_sec", finished - started)
+    save_job_status(job_dir, status)
+
+
+_QUEUE: Optional[JobQueue] = None
+
+
+def get_queue() -> JobQueue:
+    global _QUEUE
+    if _QUEUE is None:
+        _QUEUE = JobQueue(
+            workers=max(1, int(settings.JOB_WORKERS)),
+            max_size=max(1, int(settings.JOB_QUEUE_MAX)),
+        )
+    return _QUEUE
+
+
+async def _save_upload(uf: Any, dst: Path) -> Dict[str, str]:
+    dst.write_bytes(await uf.read())
+    return {"path": dst.name, "filename": uf.filename}
+
+
+async def enqueue(
+    images: List[UploadFile],
+    bgm_file: Optional[UploadFile] = None,
+    job_id: Optional[str] = None,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """
+    입력을 job 디렉토리에 저장하고 큐에 넣음 -> 상태(dict)
+
+    - fields: generate_video에 그대로 넘길 폼 값 (menu_name, tone, use_tts, ...)
+    - 검증 실패 400 / 없는 job_id 404 / 이미 처리 중인 job 409 / 대기열 가득 429
+    """
+    validate_request(images, fields.get("menu_name"), fields.get("profile"), fields.get("aspects"), fields.get("preview", False))
+
+    queue = get_queue()
+    if queue.full():
+        # 파일 저장 전에 먼저 거절 (바쁠 때 디스크까지 쓰지 않게)
+        metrics.inc("jobs.rejected")
+        raise HTTPException(429, "대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+    job_dir = None
+    if (job_id or "").strip():
+        job_dir = open_job_dir(job_id)
+        if job_dir is None:
+            raise HTTPException(404, f"job을 찾을 수 없습니다: {job_id}")
+        if job_status(job_dir)["status"] in ACTIVE_STATES:
+            raise HTTPException(409, f"이미 처리 중인 job입니다: {job_id}")
+    job_dir = job_dir or make_job_dir()
+    inputs_dir = job_dir / "inputs"
+
+    # 업로드 파일은 요청이 끝나면 닫히니까 지금 디스크에 저장
+    saved = []
+    for i, uf in enumerate(images, start=1):
+        suffix = Path(uf.filename or "").suffix.lower() or ".jpg"
+        saved.append(await _save_upload(uf, inputs_dir / f"upload_{i}{suffix}"))
+    bgm = None
+    if bgm_file is not None and bgm_file.filename:
+        suffix = Path(bgm_file.filename).suffix.lower() or ".mp3"
+        bgm = await _save_upload(bgm_file, inputs_dir / f"upload_bgm{suffix}")
+
+    req = {"fields": fields, "images": saved, "bgm": bgm}
+    (inputs_dir / REQUEST_FILE).write_text(json.dumps(req, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    status = {"job_id": job_dir.name, "status": "queued", "submitted_at": round(time.time(), 3)}
+    save_job_status(job_dir, status)
+    try:
+        queue.put(job_dir.name)
+    except HTTPException:
+        # 저장하는 사이 다른 요청이 자리를 채운 경우
+        save_job_status(job_dir, {**status, "status": "error", "error": "queue full"})
+        raise
+    logger.info("job 제출: %s (대기 %d)", job_dir.name, queue.depth())
+    return job_status(job_dir)
+
+
+def job_status(job_dir: Path) -> Dict[str, Any]:
+    """
+    GET /api/jobs/{job_id} 응답
+
+    - status.json이 없으면(동기 요청으로 만든 job) status="unknown"
+    - 대기 중이면 position(대기열 순번) 포함
+    - queued/running인데 큐가 모르는 job = 서버 재시작으로 중단된 job -> error
+    """
+    job_id = job_dir.name
+    status = {"job_id": job_id, "status": "unknown", **load_job_status(job_dir)}
+    if status["status"] in ACTIVE_STATES and not get_queue().knows(job_id):
+        status.update(status="error", error="서버가 재시작되어 작업이 중단되었습니다. 다시 제출해주세요.")
+    if status["status"] == "queued":
+        status["position"] = get_queue().position(job_id)
+    status["events_url"] = f"/api/jobs/{job_id}/events"
+    return status
@@ -16,14 +16,22 @@ LLM
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
+from backend.app.core.circuit_breaker import CircuitOpenError, get_breaker
 from backend.app.core.config import settings
 from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+from backend.app.services import openai_client
 
 logger = get_logger(__name__)
 
@@ -238,6 +246,10 @@ def _add_emojis_fallback(lines: List[str], tone: str, max_emojis: int = 2) -> Li
 
 
 
+# 줄 수가 모자랄 때 CTA 앞에 끼워 넣는 문장 (톤 무관)
+_FILLERS = ["한입에 끝", "육즙 터진다", "오늘 메뉴 확정", "저장해두자"]
+
+
 # fallback (키 없을 때도 "괜찮게")
 def _fallback(
     menu_name: str,
@@ -284,10 +296,9 @@ def _fallback(
 
     lines = base_lines[:n]
     if len(lines) < n:
-        fillers = ["한입에 끝", "육즙 터진다", "오늘 메뉴 확정", "저장해두자"]
         k = 0
         while len(lines) < n and k < 10:
-            lines.insert(-1, fillers[k % len(fillers)])
+            lines.insert(-1, _FILLERS[k % len(_FILLERS)])
             k += 1
 
     # 길이 캡
@@ -336,55 +347,8 @@ def _parse_json_safely(text: str) -> Optional[dict]:
         return None
 
 
-def generate_copy(
-    menu_name: str,
-    store_name: Optional[str],
-    tone: str,
-    n_lines: int = 6,
-    price: Optional[str] = None,
-    location: Optional[str] = None,
-    benefit: Optional[str] = None,
-    cta: Optional[str] = None,
-) -> LLMOutput:
-    """
-    LLM이 있으면 LLM, 없으면 fallback.
-
-    n_lines:
-    - routes.py에서 컷 수(target_cuts)에 맞춰 넘겨줌 (보통 6)
-    """
-    menu_name = _clean(menu_name) or "오늘의 메뉴"
-    store_name = _clean(store_name)
-    tone = _clean(tone) or "감성"
-
-    price = _clean(price)
-    location = _clean(location)
-    benefit = _clean(benefit)
-    cta = _clean(cta)
-
-    n_lines = max(4, min(12, int(n_lines or 6)))
-
-    if not settings.OPENAI_API_KEY:
-        logger.info("OPENAI_API_KEY가 없어 fallback 문구를 사용합니다.")
-        return _fallback(
-            menu_name=menu_name,
-            store_name=store_name,
-            tone=tone,
-            n_lines=n_lines,
-            price=price,
-            location=location,
-            benefit=benefit,
-            cta=cta,
-        )
-
-    import requests
-
-    store_str = store_name or "미기재"
-    price_str = price or "미기재"
-    location_str = location or "미기재"
-    benefit_str = benefit or "미기재"
-    cta_str = cta or "미기재"
-
-    prompt = f"""
+# 카피 프롬프트 (입력값은 .format으로 채움, JSON 중괄호는 {{ }})
+_COPY_PROMPT = """
 너는 한국 음식점 유튜브 쇼츠(9:16, 18초) 광고 자막 카피라이터다.
 10~30대 남녀노소 상대로 재미있게 음식점/메뉴를 홍보하는 문구를 만든다.
 너무 짧게는 하지말고 적어도 6자 이상은 되게 한다.
@@ -443,66 +407,230 @@ def generate_copy(
 - "오늘 저녁은.. 여기다! ㅋㅋ"
 """
 
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+_SYSTEM_PROMPT = "You write short-form Korean ad copy with clear structure and strong rhythm."
+
+_LLM_PARAMS = {
+    "model": "gpt-4o-mini",
+    "temperature": 0.9,
+    "top_p": 0.9,
+    "frequency_penalty": 0.4,
+    "presence_penalty": 0.2,
+}
+
+# 프롬프트/모델/샘플링 값이 바뀌면 캐시 키가 바뀜 (예전 카피를 재사용하지 않게)
+_PROMPT_VERSION = hashlib.sha256(
+    json.dumps([_COPY_PROMPT, _SYSTEM_PROMPT, _LLM_PARAMS], ensure_ascii=False, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+
+# 카피 캐시
+# - 같은 입력(메뉴/가게/톤/가격/위치/혜택/CTA/줄 수) + 같은 프롬프트면 LLM_CACHE_TTL_SEC 동안 재사용
+# - 같은 입력이 동시에 들어오면 OpenAI 호출 1번을 같이 기다림 (배치 재렌더/재시도)
+# - 실패(fallback)는 저장하지 않음
+_COPY_CACHE: "OrderedDict[str, Tuple[float, LLMOutput]]" = OrderedDict()
+_COPY_INFLIGHT: Dict[str, Future] = {}
+_COPY_LOCK = threading.Lock()
+
+
+def _copy_key(*fields) -> str:
+    parts = [_PROMPT_VERSION] + [_normalize_line(str(f)).lower() if f is not None else "" for f in fields]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _clone(out: LLMOutput) -> LLMOutput:
+    # 캐시 값을 호출한 쪽에서 고쳐도 캐시가 안 바뀌게
+    return LLMOutput(list(out.caption_lines), out.promo_text, list(out.hashtags))
+
+
+def _cached_copy(key: str, fetch: Callable[[], LLMOutput], fresh: bool = False) -> LLMOutput:
+    """
+    캐시 hit -> 저장된 카피 / 같은 키 호출이 진행 중 -> 그 결과를 기다림 / 아니면 fetch()
+
+    - fresh=True: 캐시/진행 중 호출을 무시하고 새로 생성 (결과는 캐시에 덮어씀)
+    - fetch가 예외면 기다리던 호출도 같은 예외 (각자 fallback)
+    """
+    ttl = float(getattr(settings, "LLM_CACHE_TTL_SEC", 0) or 0)
+    if ttl <= 0:
+        return fetch()
+
+    t0 = time.perf_counter()
+    owner = True
+    with _COPY_LOCK:
+        if not fresh:
+            hit = _COPY_CACHE.get(key)
+            if hit and hit[0] > time.time():
+                _COPY_CACHE.move_to_end(key)
+                metrics.inc("llm_cache.hits")
+                metrics.observe("llm_cache.hit_sec", time.perf_counter() - t0)
+                return _clone(hit[1])
+            fut = _COPY_INFLIGHT.get(key)
+            if fut is not None:
+                owner = False
+            else:
+                fut = _COPY_INFLIGHT[key] = Future()
+        else:
+            fut = None
+
+    if not owner:
+        metrics.inc("llm_cache.coalesced")
+        out = fut.result()
+        metrics.observe("llm_cache.coalesced_sec", time.perf_counter() - t0)
+        return _clone(out)
+
+    try:
+        out = fetch()
+    except BaseException as e:
+        if fut is not None:
+            fut.set_exception(e)
+        raise
+    else:
+        if fut is not None:
+            fut.set_result(out)
+    finally:
+        with _COPY_LOCK:
+            if fut is not None and _COPY_INFLIGHT.get(key) is fut:
+                del _COPY_INFLIGHT[key]
+
+    metrics.inc("llm_cache.misses")
+    metrics.observe("llm_cache.miss_sec", time.perf_counter() - t0)
+    with _COPY_LOCK:
+        _COPY_CACHE[key] = (time.time() + ttl, _clone(out))
+        _COPY_CACHE.move_to_end(key)
+        while len(_COPY_CACHE) > max(1, int(settings.LLM_CACHE_MAX_ENTRIES)):
+            _COPY_CACHE.popitem(last=False)
+    return _clone(out)
+
+
+def _llm_copy(
+    menu_name: str,
+    store_name: Optional[str],
+    tone: str,
+    n_lines: int,
+    price: Optional[str],
+    location: Optional[str],
+    benefit: Optional[str],
+    cta: Optional[str],
+) -> LLMOutput:
+    # OpenAI 호출 + 파싱/보정 (실패하면 예외 -> generate_copy가 fallback)
+    prompt = _COPY_PROMPT.format(
+        store_str=store_name or "미기재",
+        menu_name=menu_name,
+        tone=tone,
+        price_str=price or "미기재",
+        location_str=location or "미기재",
+        benefit_str=benefit or "미기재",
+        cta_str=cta or "미기재",
+        n_lines=n_lines,
+    )
+
     payload = {
-        "model": "gpt-4o-mini",
+        **_LLM_PARAMS,
         "messages": [
-            {"role": "system", "content": "You write short-form Korean ad copy with clear structure and strong rhythm."},
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
-        "temperature": 0.9,
-        "top_p": 0.9,
-        "frequency_penalty": 0.4,
-        "presence_penalty": 0.2,
     }
 
-    try:
-        r = requests.post(url, headers=headers, json=payload, timeout=60)
-        r.raise_for_status()
-        content = r.json()["choices"][0]["message"]["content"]
-        data = _parse_json_safely(content)
+    # provider 장애(연결/timeout/429/5xx, 재시도 소진 포함)만 공용 breaker에 기록 -> 장애 중이면 다음 job부터 바로 fallback
+    # 그 밖의 4xx(잘못된 요청, 키 오류 등)는 breaker 밖에서 올림
+    with get_breaker("openai.chat").guard():
+        r = openai_client.get_client().post("chat/completions", payload)
+        if openai_client.provider_error(r.status_code):
+            r.raise_for_status()
+    r.raise_for_status()
+    content = r.json()["choices"][0]["message"]["content"]
+    data = _parse_json_safely(content)
 
-        if not data:
-            raise ValueError("JSON parse failed")
+    if not data:
+        raise ValueError("JSON parse failed")
 
-        lines = data.get("caption_lines") or []
-        promo = data.get("promo_text") or ""
-        tags = data.get("hashtags") or []
+    lines = data.get("caption_lines") or []
+    promo = data.get("promo_text") or ""
+    tags = data.get("hashtags") or []
 
-        lines = [str(x) for x in lines][:n_lines]
-        if len(lines) < n_lines:
-            fb = _fallback(menu_name, store_name, tone, n_lines, price, location, benefit, cta).caption_lines
-            lines += fb[len(lines):n_lines]
+    lines = [str(x) for x in lines][:n_lines]
+    if len(lines) < n_lines:
+        fb = _fallback(menu_name, store_name, tone, n_lines, price, location, benefit, cta).caption_lines
+        lines += fb[len(lines):n_lines]
 
-        lines = [_cap_len(_normalize_line(x), 16) for x in lines]
+    lines = [_cap_len(_normalize_line(x), 16) for x in lines]
 
-        promo = str(promo).strip()
-        if not promo:
-            promo = _fallback(menu_name, store_name, tone, n_lines, price, location, benefit, cta).promo_text
+    promo = str(promo).strip()
+    if not promo:
+        promo = _fallback(menu_name, store_name, tone, n_lines, price, location, benefit, cta).promo_text
 
-        if not isinstance(tags, list) or len(tags) < 3:
-            tags = _hashtags(menu_name, store_name, location)
-        else:
-            out = []
-            seen = set()
-            for t in tags:
-                t = str(t).strip()
-                if not t:
-                    continue
-                if not t.startswith("#"):
-                    t = "#" + t.replace(" ", "")
-                if t not in seen:
-                    out.append(t)
-                    seen.add(t)
-                if len(out) >= 12:
-                    break
-            tags = out or _hashtags(menu_name, store_name, location)
-
-        return LLMOutput(lines, promo, tags)
+    if not isinstance(tags, list) or len(tags) < 3:
+        tags = _hashtags(menu_name, store_name, location)
+    else:
+        out = []
+        seen = set()
+        for t in tags:
+            t = str(t).strip()
+            if not t:
+                continue
+            if not t.startswith("#"):
+                t = "#" + t.replace(" ", "")
+            if t not in seen:
+                out.append(t)
+                seen.add(t)
+            if len(out) >= 12:
+                break
+        tags = out or _hashtags(menu_name, store_name, location)
+
+    return LLMOutput(lines, promo, tags)
+
+
+def generate_copy(
+    menu_name: str,
+    store_name: Optional[str],
+    tone: str,
+    n_lines: int = 6,
+    price: Optional[str] = None,
+    location: Optional[str] = None,
+    benefit: Optional[str] = None,
+    cta: Optional[str] = None,
+    fresh: bool = False,
+) -> LLMOutput:
+    """
+    LLM이 있으면 LLM, 없으면 fallback.
 
+    n_lines:
+    - routes.py에서 컷 수(target_cuts)에 맞춰 넘겨줌 (보통 6)
+    fresh:
+    - True면 캐시를 건너뛰고 새 카피 (같은 입력으로 다른 버전을 원할 때)
+    """
+    menu_name = _clean(menu_name) or "오늘의 메뉴"
+    store_name = _clean(store_name)
+    tone = _clean(tone) or "감성"
+
+    price = _clean(price)
+    location = _clean(location)
+    benefit = _clean(benefit)
+    cta = _clean(cta)
+
+    n_lines = max(4, min(12, int(n_lines or 6)))
+
+    if not settings.OPENAI_API_KEY:
+        logger.info("OPENAI_API_KEY가 없어 fallback 문구를 사용합니다.")
+        return _fallback(
+            menu_name=menu_name,
+            store_name=store_name,
+            tone=tone,
+            n_lines=n_lines,
+            price=price,
+            location=location,
+            benefit=benefit,
+            cta=cta,
+        )
+
+    fields = (menu_name, store_name, tone, n_lines, price, location, benefit, cta)
+    try:
+        return _cached_copy(_copy_key(*fields), lambda: _llm_copy(*fields), fresh=fresh)
     except Exception as e:
-        logger.warning("LLM 호출 실패/파싱 실패. fallback으로 대체합니다. err=%s", e)
+        if isinstance(e, CircuitOpenError):
+            logger.info("OpenAI chat circuit open -> fallback 문구를 사용합니다.")
+        else:
+            logger.warning("LLM 호출 실패/파싱 실패. fallback으로 대체합니다. err=%s", e)
         return _fallback(
             menu_name=menu_name,
             store_name=store_name,
@@ -0,0 +1,207 @@
+"""
+오디오 길이(초) 측정 - ffprobe 프로세스 없이
+
+왜 필요한가?
+- TTS 줄마다 ffprobe를 1번씩 띄웠음 (10줄 = 프로세스 10개)
+- 파일은 수십 KB인데 프로세스 시작 비용이 측정보다 훨씬 큼
+
+방법
+- WAV: RIFF 헤더의 fmt(byte rate) + data 크기로 계산
+- MP3: Xing/Info 헤더에 프레임 수가 있으면 그걸로, 없으면 프레임 헤더를 따라가며 샘플 수 합산
+- 그 외 형식(또는 파싱 실패)은 ffprobe로 fallback
+- 같은 파일을 여러 번 재는 경우(재사용/BGM 등)가 있어서 (경로, mtime, 크기) 기준 memo
+"""
+
+from __future__ import annotations
+
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+_MEMO: "OrderedDict[tuple, float]" = OrderedDict()
+_MEMO_MAX = 256
+_MEMO_LOCK = threading.Lock()
+
+# MPEG Layer III 테이블 (kbps / Hz)
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],   # MPEG-1
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],       # MPEG-2 / 2.5
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+def duration_sec(path: Path) -> float:
+    """
+    오디오 길이(초)
+
+    - WAV/MP3는 파일을 직접 파싱, 나머지는 ffprobe
+    - 실패하면 RuntimeError (ffprobe 실패와 같음)
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+        key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    except OSError:
+        return _probe_duration_sec(path)
+
+    with _MEMO_LOCK:
+        hit = _MEMO.get(key)
+        if hit is not None:
+            _MEMO.move_to_end(key)
+            metrics.inc("media_info.memo_hit")
+            return hit
+
+    dur = _parse_duration_sec(path)
+    if dur is not None:
+        metrics.inc("media_info.parsed")
+    else:
+        dur = _probe_duration_sec(path)
+
+    with _MEMO_LOCK:
+        _MEMO[key] = dur
+        while len(_MEMO) > _MEMO_MAX:
+            _MEMO.popitem(last=False)
+    return dur
+
+
+def _parse_duration_sec(path: Path) -> Optional[float]:
+    # 직접 읽을 수 있는 형식이면 길이, 아니면 None
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+            return _wav_duration(data)
+        return _mp3_duration(data)
+    except (struct.error, IndexError, ValueError, ZeroDivisionError) as e:
+        logger.debug("오디오 헤더 파싱 실패(ffprobe 사용): %s (%s)", path, e)
+        return None
+
+
+def _wav_duration(data: bytes) -> Optional[float]:
+    """
+    RIFF 청크를 따라가며 fmt의 byte rate, data 크기로 길이 계산
+
+    - FFmpeg가 파이프로 쓴 WAV는 data 크기가 0xFFFFFFFF(모름)일 수 있음 -> 파일 끝까지로 계산
+    """
+    pos = 12
+    byte_rate = None
+    while pos + 8 <= len(data):
+        cid = data[pos:pos + 4]
+        size = struct.unpack_from("<I", data, pos + 4)[0]
+        body = pos + 8
+        if cid == b"fmt ":
+            byte_rate = struct.unpack_from("<I", data, body + 8)[0]
+        elif cid == b"data":
+            if not byte_rate:
+                return None
+            available = len(data) - body
+            if size == 0xFFFFFFFF or size > available:
+                size = available
+            return size / byte_rate
+        pos = body + size + (size & 1)  # 청크는 2바이트 정렬
+    return None
+
+
+def _skip_id3v2(data: bytes) -> int:
+    # ID3v2 태그 크기 (syncsafe 정수) 만큼 건너뜀
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _mp3_frame(data: bytes, pos: int) -> Optional[tuple]:
+    """
+    pos의 MPEG Layer III 프레임 헤더 -> (프레임 길이, 프레임당 샘플 수, 샘플레이트, MPEG-1 여부, mono 여부)
+
+    - Layer III가 아니거나 값이 이상하면 None
+    """
+    if pos + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[pos:pos + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    br_idx = b2 >> 4
+    sr_idx = (b2 >> 2) & 3
+    if version == 1 or layer != 1 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[1 if mpeg1 else 2][br_idx] * 1000
+    sr = _MP3_SAMPLE_RATES[version][sr_idx]
+    pad = (b2 >> 1) & 1
+    spf = 1152 if mpeg1 else 576
+    length = (144 if mpeg1 else 72) * bitrate // sr + pad
+    return length, spf, sr, mpeg1, (b3 >> 6) == 3
+
+
+def _mp3_duration(data: bytes) -> Optional[float]:
+    pos = _skip_id3v2(data)
+
+    # 첫 프레임 찾기 (다음 프레임도 헤더가 맞아야 진짜 sync로 인정)
+    first = None
+    limit = min(len(data), pos + 64 * 1024)
+    while pos < limit:
+        fr = _mp3_frame(data, pos)
+        if fr and (pos + fr[0] >= len(data) or _mp3_frame(data, pos + fr[0])):
+            first = fr
+            break
+        pos += 1
+    if first is None:
+        return None
+
+    length, spf, sr, mpeg1, mono = first
+
+    # Xing/Info 헤더 (FFmpeg/LAME가 쓰는 VBR/CBR 요약 프레임) -> 프레임 수로 바로 계산
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    tag = pos + 4 + side_info
+    if data[tag:tag + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", data, tag + 4)[0]
+        if flags & 1:
+            frames = struct.unpack_from(">I", data, tag + 8)[0]
+            return frames * spf / sr
+        pos += length  # 프레임 수가 없으면 요약 프레임만 빼고 직접 셈
+
+    # 프레임 헤더를 따라가며 합산 (끝의 ID3v1 "TAG" 등을 만나면 멈춤)
+    samples = 0
+    while True:
+        fr = _mp3_frame(data, pos)
+        if fr is None:
+            break
+        samples += fr[1]
+        pos += fr[0]
+    return samples / sr if samples else None
+
+
+def _probe_duration_sec(path: Path) -> float:
+    # ffprobe fallback (알 수 없는 형식)
+    from backend.app.services.video import FFPROBE_BIN
+
+    metrics.inc("media_info.ffprobe")
+    cmd = [
+        FFPROBE_BIN,
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(path),
+    ]
+    p = subprocess.run(cmd, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"ffprobe failed:\n{p.stderr}")
+    return float((p.stdout or "").strip() or "0")
@@ -0,0 +1,284 @@
+"""
+컷 모션 엔진 (slideshow의 "움직임" 부분만 담당)
+
+왜 분리하나?
+- zoompan은 FFmpeg에서 느린 필터 중 하나이고, 컷마다 1080x1920 전체를 프레임 단위로 리샘플링함
+- 같은 프리셋(중앙/오른쪽/위/아래 줌인)을 다른 방식으로도 만들어 보고 속도를 비교하고 싶음
+
+엔진 종류 (settings.MOTION_ENGINE)
+- zoompan   : 기존 _effect_zoompan 프리셋 (기본값)
+- cropscale : 시간(t) 기반 scale(eval=frame) + crop 식으로 같은 줌인
+- kenburns  : NumPy/OpenCV로 프레임을 만들어 FFmpeg stdin(rawvideo)으로 파이프
+
+filter_based=False 엔진(kenburns)은 filter_complex에 들어갈 수 없어서
+컷별 렌더(render_cut_segments) 경로로만 동작한다.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.core import progress
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+
+# zoompan 프리셋 개수 (컷 인덱스 i % 4 로 선택)
+ZOOMPAN_PRESET_COUNT = 4
+
+# 프리셋별 (포커스 중심 x, 포커스 중심 y, 프레임당 줌 증가량, 최대 줌)
+# _effect_zoompan의 식과 같은 움직임을 다른 엔진에서도 재현하기 위한 값
+MOTION_PRESETS: List[Tuple[float, float, float, float]] = [
+    (0.50, 0.50, 0.0040, 1.20),  # 0) 중앙 줌인
+    (0.55, 0.50, 0.0030, 1.16),  # 1) 오른쪽 살짝 포커스
+    (0.50, 0.42, 0.0030, 1.16),  # 2) 위쪽 살짝 포커스
+    (0.50, 0.62, 0.0030, 1.16),  # 3) 아래쪽 살짝 포커스
+]
+
+
+def _effect_zoompan(i: int) -> str:
+    """
+    안전한 zoompan 프리셋 (ffmpeg expr에서 on/d 같은 변수 사용 X)
+
+    - zoompan 내부에서 프레임 인덱스/길이(d)를 나눗셈으로 쓰면
+      ffmpeg 버전에 따라 'd' 파싱 문제가 나서 깨질 수 있음.
+    - 그래서 "좌표를 고정"하거나 "간단한 식"만 사용
+
+    리턴값: "zoompan=..." 전체 문자열
+    """
+    k = i % ZOOMPAN_PRESET_COUNT
+
+    # 공통: 프레임 누적 줌인 (쇼츠 느낌나게)
+    # zoom은 내부 상태로 누적되므로 zoom+... 형태가 안정적
+    z_fast = "z='min(zoom+0.0040,1.20)'"
+    z_slow = "z='min(zoom+0.0030,1.16)'"
+
+    if k == 0:
+        # 0) 중앙 줌인
+        return f"zoompan={z_fast}:x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+
+    if k == 1:
+        # 1) 오른쪽 살짝 포커스 (고정 오프셋)
+        return f"zoompan={z_slow}:x='iw*0.55-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+
+    if k == 2:
+        # 2) 위쪽 살짝 포커스
+        return f"zoompan={z_slow}:x='iw/2-(iw/zoom/2)':y='ih*0.42-(ih/zoom/2)'"
+
+    # 3) 아래쪽 살짝 포커스
+    return f"zoompan={z_slow}:x='iw/2-(iw/zoom/2)':y='ih*0.62-(ih/zoom/2)'"
+
+
+class MotionEngine:
+    """
+    모션 엔진 공통 인터페이스
+
+    - input_args: 컷 이미지 입력 옵션 (-i 앞에 붙음)
+    - motion_filter: 컷 체인 중간에 들어갈 필터 문자열 (filter_based 엔진만)
+    - render_clip: 필터로 표현 못 하는 엔진이 클립을 직접 만드는 경우
+    """
+
+    name = "base"
+    filter_based = True
+
+    def input_args(self, per: float, fps: int) -> List[str]:
+        return ["-loop", "1", "-t", str(per)]
+
+    def motion_filter(self, i: int, per: float, w: int, h: int, fps: int) -> str:
+        raise NotImplementedError
+
+    def render_clip(
+        self,
+        img: Path,
+        i: int,
+        per: float,
+        w: int,
+        h: int,
+        fps: int,
+        out_clip: Path,
+        encode_args: List[str],
+        graded: bool = False,
+    ) -> Path:
+        raise NotImplementedError
+
+
+class ZoompanEngine(MotionEngine):
+    # 기존 동작 그대로
+    name = "zoompan"
+
+    def motion_filter(self, i: int, per: float, w: int, h: int, fps: int) -> str:
+        frames_per = max(1, int(per * fps))
+        return f"{_effect_zoompan(i)}:d={frames_per}:s={w}x{h}:fps={fps}"
+
+
+class CropScaleEngine(MotionEngine):
+    """
+    scale(eval=frame)로 t에 따라 조금씩 키우고 crop으로 원래 크기만 잘라냄
+
+    - zoom(t) = min(1 + 증가량*fps*t, 최대줌) -> zoompan 프리셋과 같은 속도
+    - crop의 x/y는 프레임마다 평가되므로 포커스 중심을 유지하면서 가장자리에서 clamp
+    - 입력을 fps로 넣어줘야 t가 프레임마다 바뀜
+    """
+
+    name = "cropscale"
+
+    def input_args(self, per: float, fps: int) -> List[str]:
+        return ["-loop", "1", "-framerate", str(fps), "-t", str(per)]
+
+    def motion_filter(self, i: int, per: float, w: int, h: int, fps: int) -> str:
+        cx, cy, inc, zmax = MOTION_PRESETS[i % ZOOMPAN_PRESET_COUNT]
+        rate = inc * fps  # 초당 줌 증가량
+        z = f"min(1+{rate:.4f}*t,{zmax})"
+        return (
+            f"scale=w='ceil({w}*{z}/2)*2':h='ceil({h}*{z}/2)*2':eval=frame:flags=bilinear,"
+            f"crop={w}:{h}:"
+            f"x='max(0,min(iw-ow,iw*{cx}-ow/2))':"
+            f"y='max(0,min(ih-oh,ih*{cy}-oh/2))',"
+            f"fps={fps}"
+        )
+
+
+# kenburns 진행 이벤트 간격 (FFmpeg -progress 기본 주기와 같게)
+_PROGRESS_INTERVAL_SEC = 0.5
+
+
+class KenBurnsEngine(MotionEngine):
+    """
+    NumPy/OpenCV Ken Burns: 프레임을 Python에서 만들어 rawvideo로 FFmpeg에 파이프
+
+    - cv2.warpAffine으로 서브픽셀 단위 이동(줌이 떨리지 않게)
+    - 정규화 안 된 이미지는 ingest의 fit/pad/color grade를 여기서 1번 적용
+      (크기가 이미 맞아도 색보정은 함 - 필터 엔진의 eq와 같은 결과)
+    - graded=True면 색보정은 이미 끝난 still (ingest 정규화/여러 화면비용) -> fit/pad만
+    """
+
+    name = "kenburns"
+    filter_based = False
+
+    def _frames(self, src: np.ndarray, i: int, n_frames: int, w: int, h: int):
+        import cv2
+
+        cx, cy, inc, zmax = MOTION_PRESETS[i % ZOOMPAN_PRESET_COUNT]
+        for f in range(n_frames):
+            z = min(1.0 + inc * (f + 1), zmax)
+            vw, vh = w / z, h / z  # 원본에서 보이는 창 크기
+            x0 = min(max(w * cx - vw / 2, 0.0), w - vw)
+            y0 = min(max(h * cy - vh / 2, 0.0), h - vh)
+            m = np.array([[z, 0.0, -z * x0], [0.0, z, -z * y0]], dtype=np.float32)
+            yield cv2.warpAffine(src, m, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    def _load(self, img: Path, w: int, h: int, graded: bool = False) -> np.ndarray:
+        import cv2
+
+        from backend.app.services.ingest import _color_grade, _fit_and_pad
+
+        src = cv2.imread(str(img), cv2.IMREAD_COLOR)
+        if src is None:
+            raise RuntimeError(f"kenburns: 이미지 읽기 실패 {img}")
+        if src.shape[1] != w or src.shape[0] != h:
+            src = _fit_and_pad(src, w, h)
+        if not graded:
+            src = _color_grade(src)
+        return src
+
+    def render_clip(
+        self,
+        img: Path,
+        i: int,
+        per: float,
+        w: int,
+        h: int,
+        fps: int,
+        out_clip: Path,
+        encode_args: List[str],
+        graded: bool = False,
+    ) -> Path:
+        n_frames = max(1, int(per * fps))
+        src = self._load(img, w, h, graded)
+
+        cmd = [
+            FFMPEG_BIN, "-y",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{w}x{h}", "-r", str(fps),
+            "-i", "pipe:0",
+            "-an",
+            *encode_args,
+            str(out_clip),
+        ]
+        # video가 motion을 import하므로 여기서 늦게 import (코어 예산은 _run과 공유)
+        from backend.app.services.video import get_scheduler
+
+        with get_scheduler().slot(cmd) as cmd:
+            logger.info("FFmpeg 실행(kenburns pipe): %s", " ".join(cmd))
+            p = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+            # stderr는 별도 스레드에서 받아둠 (프레임을 쓰는 동안 파이프가 차면 서로 멈춤)
+            err_chunks: List[bytes] = []
+            drain = threading.Thread(target=lambda: err_chunks.append(p.stderr.read()), daemon=True)
+            drain.start()
+            try:
+                self._write_frames(p, src, i, n_frames, w, h, fps)
+            except BrokenPipeError:
+                pass
+            finally:
+                p.stdin.close()
+            p.wait()
+            drain.join()
+        if p.returncode != 0:
+            stderr = b"".join(err_chunks).decode("utf-8", "replace")
+            raise RuntimeError(f"FFmpeg failed:\n{stderr}")
+        return out_clip
+
+    def _write_frames(self, p: subprocess.Popen, src: np.ndarray, i: int, n_frames: int, w: int, h: int, fps: int) -> None:
+        """
+        프레임을 stdin으로 쓰면서 진행 이벤트 전송 (_run_with_progress와 같은 필드)
+
+        - FFmpeg -progress처럼 0.5초마다 1번 + 마지막 프레임 (프레임마다 보내면 SSE가 넘침)
+        - pct는 영상 전체 길이(VIDEO_SECONDS) 기준
+        """
+        total = float(settings.VIDEO_SECONDS) or 1.0
+        t0 = last = time.perf_counter()
+        for f, frame in enumerate(self._frames(src, i, n_frames, w, h), start=1):
+            p.stdin.write(frame.tobytes())
+            now = time.perf_counter()
+            if now - last >= _PROGRESS_INTERVAL_SEC or f == n_frames:
+                last = now
+                out_time = round(f / fps, 3)
+                elapsed = max(now - t0, 1e-6)
+                progress.report(
+                    frame=f,
+                    out_time_sec=out_time,
+                    fps=round(f / elapsed, 2),
+                    speed=round(out_time / elapsed, 3),
+                    pct=min(1.0, out_time / total),
+                )
+
+
+_ENGINES = {
+    "zoompan": ZoompanEngine(),
+    "cropscale": CropScaleEngine(),
+    "kenburns": KenBurnsEngine(),
+}
+
+
+def get_motion_engine(name: Optional[str] = None) -> MotionEngine:
+    # 이름이 이상하면 기본(zoompan)으로
+    key = (name or getattr(settings, "MOTION_ENGINE", "zoompan") or "zoompan").strip().lower()
+    engine = _ENGINES.get(key)
+    if engine is None:
+        logger.warning("알 수 없는 MOTION_ENGINE=%s -> zoompan 사용", key)
+        engine = _ENGINES["zoompan"]
+    return engine
+
+
+def available_engines() -> List[str]:
+    return list(_ENGINES)
@@ -0,0 +1,283 @@
+"""
+폴백 카피 나레이션 미리 만들기 (narration store)
+
+왜 필요한가?
+- 키가 없을 때 llm._fallback은 닫힌 문장 뱅크(_tone_profile 훅/CTA, _shorts_bank, _FILLERS)에서 줄을 고름
+- 문장 수가 유한하니 나레이션도 미리 만들어 둘 수 있음 -> 요청 때 gTTS/say 호출도, 후처리도 없음
+- TTS 줄 캐시(cache/tts)는 LRU라 한동안 안 쓰면 지워짐 -> 뱅크 문장은 지워지지 않는 별도 저장소에 둠
+
+구조
+- bank_phrases(): 톤별 뱅크 문장 + fallback 이모지 변형 (자막 줄과 똑같이 _cap_len/normalize_for_tts 적용)
+- NarrationStore: <NARRATION_STORE_DIR>/index.json (키 -> 파일/길이) + 후처리된 줄 WAV
+  - 키는 tts._line_key와 같음 (provider/voice + TTS_SPEED + 후처리 체인 + 문구)
+- precompute(): 설정된 voice x NARRATION_SPEEDS x 문장마다 합성 -> assemble_narration으로 묶어서 후처리
+- synthesize_voice_lines는 TTS 캐시보다 먼저 여기서 찾음
+- 메뉴 이름/가격/위치/혜택이 들어간 줄은 요청마다 달라서 여전히 합성 (TTS 캐시 대상)
+
+실행
+    python -m backend.app.services.narration_bank                    # 설정된 voice, NARRATION_SPEEDS
+    python -m backend.app.services.narration_bank --speeds 1.0,1.1 --no-emoji
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
+from backend.app.services import llm, media_info, openai_client, tts
+from backend.app.utils.video_utils import normalize_for_tts
+
+logger = get_logger(__name__)
+
+# _tone_profile/_shorts_bank의 톤 그룹마다 대표값 1개
+TONES = ("감성", "힙", "고급", "가성비")
+
+# 한 번에 후처리(FFmpeg 1회)하는 문장 수
+_CHUNK = 32
+
+
+def bank_phrases(tones: Iterable[str] = TONES, with_emoji: bool = True) -> List[str]:
+    """
+    폴백 카피가 만들 수 있는 고정 문장 전부 (중복 제거, 순서 유지)
+
+    - _fallback과 같은 길이 캡(_cap_len 16자), 파이프라인과 같은 normalize_for_tts
+    - with_emoji: 정보줄이 아닌 문장에는 톤 이모지를 앞에 붙인 변형도 (_add_emojis_fallback)
+    """
+    out: List[str] = []
+    seen = set()
+
+    def add(s: str) -> None:
+        s = normalize_for_tts(s)
+        if s and s not in seen:
+            seen.add(s)
+            out.append(s)
+
+    for tone in tones:
+        prof = llm._tone_profile(tone)
+        bank = llm._shorts_bank(tone)
+        raw = [*prof["hook"], *prof["cta"], *llm._FILLERS]
+        for key in ("sensory", "usp", "trust", "urgency", "cta"):
+            raw += bank[key]
+        for phrase in (llm._cap_len(llm._normalize_line(x), 16) for x in raw):
+            add(phrase)
+            if with_emoji and not llm._looks_like_info_line(phrase):
+                for emoji in llm._emoji_pool(tone):
+                    add(f"{emoji} {phrase}")
+    return out
+
+
+class NarrationStore:
+    """
+    미리 만든 줄 WAV 저장소 (LRU 삭제 없음)
+
+    - index.json: {키: {"file", "duration_sec", "provider", "speed_up", "text"}}
+    - 다른 프로세스(워밍업 명령)가 index를 갱신하면 mtime을 보고 다시 읽음
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = {}
+        self._mtime: Optional[int] = None
+
+    def _load(self) -> Dict[str, dict]:
+        # lock 안에서 호출
+        path = self.root / self.INDEX
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return self._index
+        if mtime != self._mtime:
+            try:
+                self._index = json.loads(path.read_text(encoding="utf-8"))
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                logger.warning("narration index 읽기 실패: %s", e)
+        return self._index
+
+    def _save(self) -> None:
+        # lock 안에서 호출 (tmp에 쓰고 os.replace)
+        path = self.root / self.INDEX
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(json.dumps(self._index, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, path)
+        self._mtime = path.stat().st_mtime_ns
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def get(self, key: str, record: bool = True) -> Optional[Tuple[Path, float]]:
+        # hit이면 (줄 WAV, 길이)
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry:
+            return None
+        path = self.root / entry["file"]
+        if not path.exists():
+            return None
+        if record:
+            metrics.inc("narration_store.hits")
+        return path, float(entry["duration_sec"])
+
+    def put(self, key: str, wav: Path, duration: float, **meta) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        dst = self.root / f"{key}.wav"
+        tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+        shutil.copyfile(wav, tmp)
+        os.replace(tmp, dst)
+        with self._lock:
+            self._load()
+            self._index[key] = {"file": dst.name, "duration_sec": round(float(duration), 4), **meta}
+            self._save()
+        return dst
+
+
+_STORE: Optional[NarrationStore] = None
+
+
+def get_store() -> NarrationStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = NarrationStore(Path(settings.NARRATION_STORE_DIR))
+    return _STORE
+
+
+def configured_speeds() -> List[float]:
+    # NARRATION_SPEEDS="1.10,1.0" -> [1.1, 1.0] (synthesize_voice_lines의 speed_up 값들)
+    out = []
+    for part in str(settings.NARRATION_SPEEDS or "").split(","):
+        try:
+            out.append(float(part))
+        except ValueError:
+            continue
+    return out or [1.10]
+
+
+def configured_providers() -> List[str]:
+    # 키가 있으면 OpenAI voice + 실패했을 때 쓰는 로컬 voice, 없으면 로컬 voice만
+    providers = [tts._provider(True)] if settings.OPENAI_API_KEY else []
+    providers.append(tts._provider(False))
+    return providers
+
+
+def _synth_fn(provider: str) -> Callable[[str, Path], Optional[Path]]:
+    if provider.startswith("openai:"):
+        return tts._openai_tts
+    if provider.startswith("say:"):
+        return tts._macos_say
+    return tts._gtts_synthesize
+
+
+def _synthesize_all(synth: Callable, phrases: List[str], out_dir: Path) -> List[Tuple[str, Path]]:
+    # 문장마다 원본 TTS (동시에 TTS_CONCURRENCY개), 실패한 문장은 빠짐
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def one(i: int, phrase: str) -> Optional[Tuple[str, Path]]:
+        raw = out_dir / f"bank_{i:03d}_raw.mp3"
+        try:
+            if synth(phrase, raw) and raw.exists() and raw.stat().st_size >= 1000:
+                return phrase, raw
+        except Exception as e:
+            logger.warning("뱅크 문장 합성 실패: %s (%s)", phrase, e)
+        return None
+
+    workers = max(1, min(int(settings.TTS_CONCURRENCY), len(phrases)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="narration-bank") as pool:
+        futs = [pool.submit(contextvars.copy_context().run, one, i, p) for i, p in enumerate(phrases)]
+        results = [f.result() for f in futs]
+    return [r for r in results if r is not None]
+
+
+def precompute(
+    speeds: Optional[List[float]] = None,
+    providers: Optional[List[str]] = None,
+    phrases: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    뱅크 문장 나레이션을 저장소에 채움 (이미 있는 건 건너뜀) -> 통계
+
+    - 후처리는 _CHUNK개씩 assemble_narration 1회 (줄마다 FFmpeg를 띄우지 않음)
+    - 백그라운드 작업이라 OpenAI 호출은 BATCH 우선순위
+    """
+    with openai_client.priority(openai_client.BATCH):
+        return _precompute(speeds, providers, phrases)
+
+
+def _precompute(
+    speeds: Optional[List[float]],
+    providers: Optional[List[str]],
+    phrases: Optional[List[str]],
+) -> Dict[str, int]:
+    store = get_store()
+    speeds = speeds or configured_speeds()
+    providers = providers or configured_providers()
+    phrases = bank_phrases() if phrases is None else phrases
+    stats = {"phrases": len(phrases), "stored": 0, "skipped": 0, "failed": 0}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        n = 0
+        for provider in providers:
+            synth = _synth_fn(provider)
+            for speed in speeds:
+                todo = [p for p in phrases if store.get(tts._line_key(provider, p, speed), record=False) is None]
+                stats["skipped"] += len(phrases) - len(todo)
+                for start in range(0, len(todo), _CHUNK):
+                    part = todo[start:start + _CHUNK]
+                    n += 1
+                    raws = _synthesize_all(synth, part, tmp / f"raw_{n}")
+                    stats["failed"] += len(part) - len(raws)
+                    if not raws:
+                        continue
+                    try:
+                        _voice, wavs = tts.assemble_narration(
+                            [raw for _p, raw in raws], tmp / f"out_{n}", speed=speed, pause_sec=0,
+                        )
+                    except Exception as e:
+                        logger.warning("뱅크 문장 후처리 실패: %s x%s (%s)", provider, speed, e)
+                        stats["failed"] += len(raws)
+                        continue
+                    for (phrase, _raw), wav in zip(raws, wavs):
+                        dur = media_info.duration_sec(wav)
+                        store.put(
+                            tts._line_key(provider, phrase, speed), wav, dur,
+                            provider=provider, speed_up=speed, text=phrase,
+                        )
+                        stats["stored"] += 1
+                logger.info("narration bank: provider=%s speed=%s %s", provider, speed, stats)
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="fallback copy narration precompute")
+    ap.add_argument("--speeds", default=None, help="쉼표 구분 speed_up 값 (기본 NARRATION_SPEEDS)")
+    ap.add_argument("--tones", default=",".join(TONES))
+    ap.add_argument("--no-emoji", action="store_true", help="이모지 변형은 만들지 않음")
+    args = ap.parse_args()
+
+    speeds = [float(s) for s in args.speeds.split(",")] if args.speeds else None
+    tones = [t.strip() for t in args.tones.split(",") if t.strip()]
+    phrases = bank_phrases(tones, with_emoji=not args.no_emoji)
+    stats = precompute(speeds=speeds, phrases=phrases)
+    print(f"providers={configured_providers()} speeds={speeds or configured_speeds()}")
+    print(f"phrases={stats['phrases']} stored={stats['stored']} skipped={stats['skipped']} failed={stats['failed']}")
+    print(f"store={get_store().root} entries={len(get_store())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+OpenAI HTTP 클라이언트 (LLM 카피 + TTS 공용)
+
+왜 필요한가?
+- llm.generate_copy / tts._openai_tts가 호출마다 requests.post -> 매번 DNS + TCP/TLS 연결부터
+- 일시적인 429/5xx 한 번에 바로 fallback 카피/gTTS로 떨어짐
+
+구조
+- 프로세스 공용 requests.Session 1개 (keep-alive 연결 풀, 크기는 IO_WORKERS/TTS_CONCURRENCY 기준)
+- 429 / 5xx / 연결 에러 / timeout은 OPENAI_MAX_RETRIES번까지 재시도
+  - 대기: 지수 백오프 + full jitter (OPENAI_BACKOFF_BASE_SEC * 2^n, 최대 OPENAI_BACKOFF_MAX_SEC)
+  - 서버가 Retry-After를 주면 그 값 (같은 상한)
+- 엔드포인트별 timeout (chat: OPENAI_CHAT_TIMEOUT_SEC, speech: OPENAI_TTS_TIMEOUT_SEC)
+- 시도마다 지연시간 -> metrics "openai.<endpoint>.latency_sec" (히스토그램 + p50/p95/p99), 재시도/실패 카운터
+- base URL은 OPENAI_BASE_URL (테스트에서는 로컬 stub 서버)
+- 엔드포인트별 token bucket (RateLimiter): RPM/TPM 한도 안에서만 보냄 -> 429 후 fallback 대신 줄 서서 기다림
+  - 요청 토큰은 글자 수로 대충 추정 (estimate_tokens)
+  - 대기열은 우선순위 순 (INTERACTIVE가 BATCH보다 먼저), 우선순위는 contextvar로 전달 (batch.py가 BATCH로 설정)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.app.core.config import settings
+from backend.app.core.logger import get_logger
+from backend.app.core.metrics import LATENCY_BUCKETS, metrics
+
+logger = get_logger(__name__)
+
+# 재시도할 상태 코드 (요청 자체가 잘못된 4xx는 재시도해도 같음)
+RETRY_STATUS = (408, 429, 500, 502, 503, 504)
+
+def provider_error(status: int) -> bool:
+    """
+    provider 쪽 장애로 볼 상태 코드인지 (circuit breaker에 실패로 기록할 것)
+
+    - 429 / 408 / 5xx만: 요청이 잘못된 400, 키 문제 401, 404 등은 입력/설정 문제라 breaker를 열지 않음
+    """
+    return status in RETRY_STATUS or status >= 500
+
+
+# 연결 timeout (읽기 timeout은 엔드포인트별)
+_CONNECT_TIMEOUT_SEC = 5.0
+
+
+# 대기열 우선순위 (작을수록 먼저)
+INTERACTIVE = 0
+BATCH = 1
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("openai_priority", default=INTERACTIVE)
+
+# chat 응답 토큰 추정치 (payload에 max_tokens가 없을 때, 카피 JSON 1개 정도)
+_COMPLETION_TOKENS = 512
+
+
+def set_priority(priority: int) -> None:
+    # 지금 컨텍스트(asyncio task / executors.run_in으로 넘어간 스레드)의 OpenAI 호출 우선순위
+    _priority.set(priority)
+
+
+@contextmanager
+def priority(value: int) -> Iterator[None]:
+    # with 블록 안에서만 우선순위 변경 (끝나면 원래대로)
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def estimate_tokens(text: str) -> int:
+    # 대략치: 영문/숫자는 4글자 ≈ 1토큰, 한글 등은 1글자 ≈ 1토큰 (한도를 넘지 않게 넉넉히)
+    ascii_n = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_n / 4 + (len(text) - ascii_n)) + 1
+
+
+def request_tokens(endpoint: str, payload: Dict[str, Any]) -> int:
+    # TPM에 잡히는 양 = 프롬프트 + 요청한 최대 응답 토큰
+    if endpoint == "chat/completions":
+        prompt = sum(estimate_tokens(str(m.get("content", ""))) + 4 for m in payload.get("messages", []))
+        return prompt + int(payload.get("max_tokens") or _COMPLETION_TOKENS)
+    return estimate_tokens(str(payload.get("input", "")))
+
+
+class _Bucket:
+    # 분당 한도 -> 초당 rate로 채워지는 token bucket (용량 = 분당 한도)
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.t = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.t) * self.rate)
+        self.t = now
+
+    def wait_for(self, amount: float) -> float:
+        # amount만큼 꺼낼 수 있을 때까지 남은 초 (한도보다 큰 요청은 한도만큼만)
+        need = min(amount, self.capacity)
+        return 0.0 if self.level >= need else (need - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    엔드포인트 1개의 RPM/TPM token bucket + 우선순위 대기열
+
+    - acquire(tokens, priority): 보낼 수 있을 때까지 블록 -> 기다린 초
+    - 대기열 맨 앞(우선순위, 도착 순)만 bucket을 확인 -> 뒤의 작은 요청이 앞을 새치기하지 않음
+    - rpm/tpm이 0이면 그 한도는 없음 (둘 다 0이면 바로 통과)
+    """
+
+    def __init__(self, name: str, rpm: float, tpm: float, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        now = clock()
+        self._req = _Bucket(rpm, now) if rpm > 0 else None
+        self._tok = _Bucket(tpm, now) if tpm > 0 else None
+        self._cond = threading.Condition()
+        self._heap: list = []
+        self._seq = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return self._req is not None or self._tok is not None
+
+    def _wait_sec(self, tokens: int) -> float:
+        now = self._clock()
+        wait = 0.0
+        if self._req is not None:
+            self._req.refill(now)
+            wait = max(wait, self._req.wait_for(1))
+        if self._tok is not None:
+            self._tok.refill(now)
+            wait = max(wait, self._tok.wait_for(tokens))
+        return wait
+
+    def acquire(self, tokens: int, priority: int = INTERACTIVE) -> float:
+        if not self.enabled:
+            return 0.0
+        t0 = self._clock()
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._heap, ticket)
+            metrics.set(f"openai.{self.name}.queue_depth", len(self._heap))
+            try:
+                while True:
+                    if self._heap[0] != ticket:
+                        self._cond.wait()
+                        continue
+                    wait = self._wait_sec(tokens)
+                    if wait <= 0:
+                        if self._req is not None:
+                            self._req.take(1)
+                        if self._tok is not None:
+                            self._tok.take(tokens)
+                        heapq.heappop(self._heap)
+                        return self._clock() - t0
+                    self._cond.wait(wait)
+            finally:
+                # 예외로 빠져도 대기열에서 빼고, 다음 차례를 깨움
+                if ticket in self._heap:
+                    self._heap.remove(ticket)
+                    heapq.heapify(self._heap)
+                metrics.set(f"openai.{self.name}.queue_depth", len(self._heap))
+                self._cond.notify_all()
+
+
+def _endpoint_timeout(endpoint: str) -> float:
+    if endpoint == "audio/speech":
+        return float(settings.OPENAI_TTS_TIMEOUT_SEC)
+    return float(settings.OPENAI_CHAT_TIMEOUT_SEC)
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    # Retry-After: 초 또는 HTTP 날짜
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_sec(attempt: int, retry_after: Optional[float] = None) -> float:
+    """attempt(0부터)번째 재시도 전 대기 시간"""
+    cap = float(settings.OPENAI_BACKOFF_MAX_SEC)
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, float(settings.OPENAI_BACKOFF_BASE_SEC) * (2 ** attempt)))
+
+
+class OpenAIClient:
+    """
+    OpenAI REST 호출 (세션 공용 + 재시도)
+
+    - post("chat/completions", payload) -> requests.Response (마지막 시도의 응답, 상태 확인은 호출한 쪽)
+    - 재시도를 다 써도 연결 에러면 마지막 예외를 그대로 올림
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int,
+        max_retries: int,
+        limiters: Optional[Dict[str, RateLimiter]] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max(0, int(max_retries))
+        self.limiters = limiters or {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_size)))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> requests.Response:
+        url = f"{self.base_url}/{endpoint}"
+        headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+        read_timeout = timeout or _endpoint_timeout(endpoint)
+        name = endpoint.replace("/", ".")
+        limiter = self.limiters.get(endpoint)
+        tokens = request_tokens(endpoint, payload)
+
+        attempt = 0
+        while True:
+            if limiter is not None and limiter.enabled:
+                # 재시도도 요청 1개로 잡히니까 매 시도마다 한도 확인
+                metrics.observe(f"openai.{name}.queue_wait_sec", limiter.acquire(tokens, current_priority()))
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.post(
+                    url, headers=headers, json=payload, timeout=(_CONNECT_TIMEOUT_SEC, read_timeout),
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.observe(f"openai.{name}.latency_sec", time.perf_counter() - t0, buckets=LATENCY_BUCKETS)
+                if attempt >= self.max_retries:
+                    metrics.inc(f"openai.{name}.errors")
+                    raise
+                wait = backoff_sec(attempt)
+                logger.warning("OpenAI %s 연결 실패, %.2fs 후 재시도(%d/%d): %s",
+                               endpoint, wait, attempt + 1, self.max_retries, e)
+            else:
+                metrics.observe(f"openai.{name}.latency_sec", time.perf_counter() - t0, buckets=LATENCY_BUCKETS)
+                if resp.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    if resp.status_code >= 400:
+                        metrics.inc(f"openai.{name}.errors")
+                    return resp
+                wait = backoff_sec(attempt, _retry_after(resp))
+                logger.warning("OpenAI %s %d, %.2fs 후 재시도(%d/%d)",
+                               endpoint, resp.status_code, wait, attempt + 1, self.max_retries)
+                _ = resp.content  # 본문을 다 읽어야 연결이 끊기지 않고 풀로 돌아감
+            metrics.inc(f"openai.{name}.retries")
+            time.sleep(wait)
+            attempt += 1
+
+
+_CLIENT: Optional[OpenAIClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> OpenAIClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = OpenAIClient(
+                base_url=settings.OPENAI_BASE_URL,
+                pool_size=max(int(settings.IO_WORKERS), int(settings.TTS_CONCURRENCY)),
+                max_retries=int(settings.OPENAI_MAX_RETRIES),
+                limiters={
+                    "chat/completions": RateLimiter(
+                        "chat.completions", float(settings.OPENAI_CHAT_RPM), float(settings.OPENAI_CHAT_TPM),
+                    ),
+                    "audio/speech": RateLimiter(
+                        "audio.speech", float(settings.OPENAI_TTS_RPM), float(settings.OPENAI_TTS_TPM),
+                    ),
+                },
+            )
+        return _CLIENT
@@ -1,9 +1,15 @@
 from __future__ import annotations
+import json
 import os
+import re
 import uuid
 from pathlib import Path
+from typing import Optional
 from backend.app.core.config import settings
 
+# make_job_dir가 만드는 job_id 형식 (경로 조작 방지용 검증)
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{12}$")
+
 def make_job_dir() -> Path:
     job_id = uuid.uuid4().hex[:12]
     out_root = Path(settings.OUTPUT_DIR)
@@ -13,6 +19,45 @@ def make_job_dir() -> Path:
     (job_dir / "artifacts").mkdir(exist_ok=True)
     return job_dir
 
+def open_job_dir(job_id: Optional[str]) -> Optional[Path]:
+    # 기존 job 디렉토리 (미리보기 -> 본 렌더 재사용), 형식이 이상하거나 없으면 None
+    job_id = (job_id or "").strip().lower()
+    if not _JOB_ID_RE.match(job_id):
+        return None
+    job_dir = Path(settings.OUTPUT_DIR) / job_id
+    if not job_dir.is_dir():
+        return None
+    (job_dir / "inputs").mkdir(exist_ok=True)
+    (job_dir / "artifacts").mkdir(exist_ok=True)
+    return job_dir
+
 def public_video_path(job_dir: Path) -> Path:
     # 결과 영상은 job_dir/artifacts/final.mp4 로 고정
     return job_dir / "artifacts" / "final.mp4"
+
+def load_job_state(job_dir: Path) -> dict:
+    # job.json: 카피/TTS 결과 등 다음 렌더에서 재사용할 값 (없거나 깨졌으면 빈 dict)
+    p = job_dir / "job.json"
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_job_state(job_dir: Path, state: dict) -> None:
+    _write_json(job_dir / "job.json", state)
+
+def load_job_status(job_dir: Path) -> dict:
+    # status.json: 비동기 job 큐 상태 (queued/running/done/error + 결과), 동기 요청이면 없음
+    try:
+        return json.loads((job_dir / "status.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_job_status(job_dir: Path, status: dict) -> None:
+    _write_json(job_dir / "status.json", status)
+
+def _write_json(p: Path, data: dict) -> None:
+    # 임시 파일에 쓰고 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않게)
+    tmp = p.with_name(f".{p.stem}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, p)
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import contextvars
+import json
 import os
 import platform
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
+from backend.app.core import progress
+from backend.app.core.circuit_breaker import CircuitOpenError, get_breaker
 from backend.app.core.config import settings
 from backend.app.core.logger import get_logger
+from backend.app.services import media_info, openai_client
+from backend.app.services.disk_cache import DiskLRUCache, make_key
+from backend.app.utils.video_utils import normalize_for_tts
 
 logger = get_logger(__name__)
 
@@ -93,15 +102,8 @@ def _openai_tts(text: str, out_mp3: Path) -> Optional[Path]:
     if not text.strip():
         return None
 
-    import requests
-
     out_mp3.parent.mkdir(parents=True, exist_ok=True)
 
-    url = "https://api.openai.com/v1/audio/speech"
-    headers = {
-        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
     payload = {
         "model": "tts-1",
         "voice": settings.OPENAI_TTS_VOICE,
@@ -111,7 +113,12 @@ def _openai_tts(text: str, out_mp3: Path) -> Optional[Path]:
         "instructions": "Speak fast and energetic like a short-form ad. Minimal pauses. Clear diction.",
     }
 
-    r = requests.post(url, headers=headers, json=payload, timeout=120)
+    # provider 장애(연결/timeout/429/5xx, 재시도 소진 포함)만 공용 breaker에 기록 -> 장애 중이면 다음 job부터 바로 CircuitOpenError
+    # 그 밖의 4xx(너무 긴 입력, 키 오류 등)는 breaker 밖에서 올림
+    with get_breaker("openai.tts").guard():
+        r = openai_client.get_client().post("audio/speech", payload)
+        if openai_client.provider_error(r.status_code):
+            raise RuntimeError(f"OpenAI TTS failed: {r.status_code} {r.text}")
     if r.status_code >= 400:
         raise RuntimeError(f"OpenAI TTS failed: {r.status_code} {r.text}")
 
@@ -126,10 +133,14 @@ def _gtts_synthesize(text: str, out_mp3: Path) -> Optional[Path]:
         
     out_mp3.parent.mkdir(parents=True, exist_ok=True)
     try:
-        from gtts import gTTS
-        tts = gTTS(text=text, lang='ko')
-        tts.save(str(out_mp3))
+        with get_breaker("gtts").guard():
+            from gtts import gTTS
+            tts = gTTS(text=text, lang='ko')
+            tts.save(str(out_mp3))
         return out_mp3
+    except CircuitOpenError:
+        logger.info("gTTS circuit open -> 스킵")
+        return None
     except Exception as e:
         logger.warning("gTTS 실패: %s", e)
         return None
@@ -143,8 +154,10 @@ def synthesize_voice(text: str, out_mp3: Path) -> Optional[Path]:
     2) 없으면 macOS say로 fallback
     3) 그것도 안되면 gTTS (Linux/Docker 등)
     """
-    # 1. OpenAI TTS 시도
-    if settings.OPENAI_API_KEY:
+    # 1. OpenAI TTS 시도 (장애로 breaker가 열려 있으면 바로 fallback)
+    if settings.OPENAI_API_KEY and not get_breaker("openai.tts").available():
+        logger.info("OpenAI TTS circuit open -> OpenAI TTS 스킵")
+    elif settings.OPENAI_API_KEY:
         try:
             logger.info("OpenAI TTS 시도... (len=%d)", len(text))
             return _openai_tts(text, out_mp3)
@@ -174,34 +187,19 @@ def synthesize_voice(text: str, out_mp3: Path) -> Optional[Path]:
     return None
 
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
-def _ffprobe_duration_sec(path: Path) -> float:
-    # mp3 실제 길이(초) 측정 - 자막 싱크의 기준이 됨
-    ffprobe = os.getenv("FFPROBE_BIN", "ffprobe")
-    cmd = [
-        ffprobe, "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(path),
-    ]
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    if p.returncode != 0:
-        raise RuntimeError(f"ffprobe failed:\n{p.stderr}")
-    return float((p.stdout or "").strip() or "0")
+# 줄 후처리 체인 (줄마다 같은 값)
+# - '느리고 액션감 없는' 원인 1순위 = 말 사이 공백 + 전체 템포
+# - silenceremove로 앞/뒤 작은 무음 줄이고, atempo로 살짝 빠르게, loudnorm으로 음량 정리(영상에서 또렷해짐)
+# - 마지막에 48kHz mono로 맞춤 (concat은 줄끼리 포맷이 같아야 함)
+_LINE_FORMAT = "aformat=sample_fmts=s16:sample_rates=48000:channel_layouts=mono"
 
-def _postprocess_voice(in_mp3: Path, out_mp3: Path, speed: float = 1.10) -> Path:
-    """
-    '느리고 액션감 없는' 원인 1순위 = 말 사이 공백 + 전체 템포
-    → silenceremove로 앞/뒤/중간 작은 무음 줄이고, atempo로 살짝 빠르게,
-      loudnorm로 음량 정리(영상에서 또렷해짐)
-    """
-    out_mp3.parent.mkdir(parents=True, exist_ok=True)
 
+def _voice_filter(speed: float) -> str:
     # atempo는 0.5~2.0 범위만 안전
     speed = max(0.8, min(1.4, float(speed)))
-
-    af = ",".join([
+    return ",".join([
         # 앞/뒤 무음 제거 (0.05 -> 0.1로 완화해서 단어 짤림 방지)
         "silenceremove=start_periods=1:start_duration=0.1:start_threshold=-40dB:"
         "stop_periods=1:stop_duration=0.1:stop_threshold=-40dB",
@@ -209,19 +207,187 @@ def _postprocess_voice(in_mp3: Path, out_mp3: Path, speed: float = 1.10) -> Path
         f"atempo={speed}",
         # 음량/다이내믹 정리 (목소리 또렷)
         "loudnorm=I=-16:LRA=11:TP=-1.5",
+        "aresample=48000",
+        _LINE_FORMAT,
     ])
 
-    cmd = [
-        FFMPEG_BIN, "-y",
-        "-i", str(in_mp3),
-        "-vn",
-        "-af", af,
-        "-codec:a", "libmp3lame",
-        "-b:a", "192k",
-        str(out_mp3),
-    ]
+
+def assemble_narration(
+    raws: List[Path],
+    out_dir: Path,
+    speed: float = 1.10,
+    pause_sec: float = 0.03,
+    processed: Optional[List[bool]] = None,
+) -> Tuple[Path, List[Path]]:
+    """
+    줄별 원본 TTS -> 나레이션 1개 (FFmpeg 1회)
+
+    - 예전: 줄마다 후처리 mp3 인코딩 N번 + concat 인코딩 1번 (+ ffprobe N번)
+    - 지금: 원본 N개를 입력으로 filter_complex 하나에서 줄마다 후처리 -> concat
+      - 줄 사이에는 pause_sec 무음을 실제로 넣음 (자막 타이밍 계산과 맞춤)
+      - 후처리된 줄은 asplit으로 line_XX.wav도 같이 저장 -> 길이는 media_info로 (프로세스 없이)
+    - 결과는 무손실 WAV (mp3 재인코딩 세대 없음)
+    - processed[i]=True인 입력은 이미 후처리된 줄(TTS 캐시) -> 포맷만 맞추고 line WAV도 안 만듦
+    - 리턴값: (voice.wav, [줄별 후처리 WAV, ...]) (캐시 줄은 입력 경로 그대로)
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n = len(raws)
+    chain = _voice_filter(speed)
+    processed = list(processed or [False] * n)
+
+    cmd = [FFMPEG_BIN, "-y"]
+    for raw in raws:
+        cmd += ["-i", str(raw)]
+
+    filters = []
+    seq = []
+    for i in range(n):
+        if processed[i]:
+            filters.append(f"[{i}:a]{_LINE_FORMAT}[c{i}]")
+        else:
+            filters.append(f"[{i}:a]{chain},asplit=2[c{i}][o{i}]")
+        if i < n - 1 and pause_sec > 0:
+            filters.append(f"[c{i}]apad=pad_dur={pause_sec}[p{i}]")
+            seq.append(f"[p{i}]")
+        else:
+            seq.append(f"[c{i}]")
+    filters.append("".join(seq) + f"concat=n={n}:v=0:a=1[voice]")
+
+    voice = out_dir / "voice.wav"
+    lines = [raws[i] if processed[i] else out_dir / f"line_{i:02d}.wav" for i in range(n)]
+    cmd += ["-filter_complex", ";".join(filters), "-map", "[voice]", "-c:a", "pcm_s16le", str(voice)]
+    for i, line in enumerate(lines):
+        if not processed[i]:
+            cmd += ["-map", f"[o{i}]", "-c:a", "pcm_s16le", str(line)]
     _run(cmd)
-    return out_mp3
+    return voice, lines
+
+
+class _OpenAIGate:
+    """
+    나레이션 1개(줄 묶음) 안에서 OpenAI TTS를 계속 쓸지
+
+    - 한 줄이라도 OpenAI가 실패하면 나머지 줄은 바로 fallback (줄마다 timeout까지 기다리지 않게)
+    - 줄들이 여러 스레드에서 동시에 돌아서 Event로 공유
+    """
+
+    def __init__(self, enabled: bool):
+        self._off = threading.Event()
+        if not enabled:
+            self._off.set()
+
+    def allowed(self) -> bool:
+        return not self._off.is_set()
+
+    def trip(self, i: int) -> None:
+        if not self._off.is_set():
+            logger.warning("Line %d: OpenAI TTS Failed -> Disabling OpenAI for remaining lines.", i)
+        self._off.set()
+
+
+GTTS_PROVIDER = "gtts:ko"
+
+
+def _provider(openai: bool) -> str:
+    # TTS 캐시 키에 들어가는 엔진/목소리 (엔진마다 소리가 달라서 따로 저장)
+    if openai:
+        return f"openai:{settings.OPENAI_TTS_VOICE}"
+    if platform.system() == "Darwin":
+        return f"say:{settings.TTS_VOICE}"
+    return GTTS_PROVIDER
+
+
+def _synthesize_line(i: int, line: str, raw: Path, gate: _OpenAIGate) -> Optional[Tuple[Path, str]]:
+    """
+    줄 1개 -> (원본 TTS mp3, 실제로 쓴 provider) (실패/무음이면 None)
+
+    - OpenAI (gate가 열려 있을 때) -> macOS say -> gTTS 순서
+    - provider는 실제로 파일을 만든 엔진 (say가 실패해서 gTTS로 만든 줄을 say 키로 캐시하지 않게)
+    """
+    tts_out = None
+    provider = None
+    if gate.allowed():
+        try:
+            tts_out = _openai_tts(line, raw)
+            provider = _provider(True)
+        except Exception as e:
+            logger.warning("Line %d: OpenAI TTS 실패: %s", i, e)
+        if not tts_out:
+            gate.trip(i)
+
+    if not tts_out and platform.system() == "Darwin":
+        tts_out = _macos_say(line, raw)
+        provider = f"say:{settings.TTS_VOICE}"
+    if not tts_out:
+        tts_out = _gtts_synthesize(line, raw)
+        provider = GTTS_PROVIDER
+
+    # 핵심: TTS가 None이거나 파일이 안 생기면 이 줄은 스킵
+    if (tts_out is None) or (not raw.exists()) or (raw.stat().st_size < 1000):
+        logger.warning("TTS line_%02d 생성 실패/무음 (OS=%s, key=%s) → 스킵",
+                       i, platform.system(), bool(settings.OPENAI_API_KEY))
+        return None
+    return raw, provider
+
+
+_CACHE: Optional[DiskLRUCache] = None
+
+
+def _cache() -> Optional[DiskLRUCache]:
+    # 줄 캐시 (TTS_CACHE_ENABLED=False면 None)
+    global _CACHE
+    if not getattr(settings, "TTS_CACHE_ENABLED", True):
+        return None
+    if _CACHE is None:
+        _CACHE = DiskLRUCache(
+            Path(settings.TTS_CACHE_DIR),
+            max_bytes=int(settings.TTS_CACHE_MAX_MB) * 1024 * 1024,
+            name="tts_cache",
+        )
+    return _CACHE
+
+
+def _line_key(provider: str, text: str, speed_up: float) -> str:
+    # 후처리 체인 문자열(speed_up 포함)까지 키에 넣음 -> 필터를 바꾸면 자동으로 새 캐시
+    return make_key("tts-line-v1", provider, settings.TTS_SPEED, _voice_filter(speed_up), normalize_for_tts(text))
+
+
+def _cached_line(provider: str, text: str, speed_up: float) -> Optional[Tuple[Path, float]]:
+    # 미리 만든 뱅크 문장(narration_bank) -> 줄 캐시 순서로 찾음, hit이면 (후처리된 줄 WAV, 길이)
+    key = _line_key(provider, text, speed_up)
+    if getattr(settings, "NARRATION_STORE_ENABLED", True):
+        from backend.app.services.narration_bank import get_store  # 순환 import 방지
+
+        stored = get_store().get(key)
+        if stored:
+            return stored
+
+    cache = _cache()
+    if cache is None:
+        return None
+    hit = cache.get(key, ".wav")
+    meta = cache.get(key, ".json", record=False) if hit else None
+    if not (hit and meta):
+        return None
+    try:
+        return hit, float(json.loads(meta.read_text(encoding="utf-8"))["duration_sec"])
+    except (ValueError, KeyError, OSError):
+        return None
+
+
+def _store_line(provider: str, text: str, speed_up: float, wav: Path, duration: float) -> None:
+    cache = _cache()
+    if cache is None:
+        return
+    key = _line_key(provider, text, speed_up)
+    try:
+        meta = wav.with_suffix(".json")
+        meta.write_text(json.dumps({"duration_sec": duration, "provider": provider, "text": text}, ensure_ascii=False), encoding="utf-8")
+        cache.put(key, wav, ".wav")
+        cache.put(key, meta, ".json")
+    except Exception as e:
+        logger.warning("TTS 캐시 저장 실패(무시): %s", e)
+
 
 def synthesize_voice_lines(
     lines: List[str],
@@ -233,100 +399,67 @@ def synthesize_voice_lines(
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    parts: List[Path] = []
-    durs: List[float] = []
-
-    # OpenAI TTS 실패 시, 이후 줄들은 바로 스킵하기 위한 플래그
-    disable_openai_for_this_batch = False
-
-    for i, line in enumerate(lines):
-        line = (line or "").strip()
-        if not line:
-            continue
-
+    # 줄마다 합성 (OpenAI/gTTS는 대부분 네트워크 대기라 TTS_CONCURRENCY개씩 동시에)
+    jobs = [(i, (line or "").strip()) for i, line in enumerate(lines)]
+    jobs = [(i, line) for i, line in jobs if line]
+    # 공용 breaker가 열려 있으면(다른 job에서 OpenAI 장애 확인) 처음부터 fallback
+    gate = _OpenAIGate(bool(settings.OPENAI_API_KEY) and get_breaker("openai.tts").available())
+    results: Dict[int, Optional[Tuple[Path, str]]] = {}
+
+    # 같은 문구(폴백 카피의 훅/CTA 등)는 후처리된 줄 WAV를 캐시에서 바로 (네트워크/후처리 없음)
+    provider = _provider(gate.allowed())
+    hits: Dict[int, Tuple[Path, float]] = {}
+    for i, line in jobs:
+        hit = _cached_line(provider, line, speed_up)
+        if hit:
+            hits[i] = hit
+
+    def one(i: int, line: str) -> Optional[Tuple[Path, str]]:
         raw = out_dir / f"line_{i:02d}_raw.mp3"
-        part = out_dir / f"line_{i:02d}.mp3"
-
         try:
-            # 1) TTS 생성 (Circuit Breaker 적용)
-            # 만약 이전에 실패했다면, synthesize_voice 내부가 아니라 여기서 이미 알고 스킵/fallback 유도 가능
-            # 하지만 synthesize_voice 함수 자체가 전역 설정을 안쓰므로, 
-            # 여기서는 "OPENAI_API_KEY가 없는 척" 호출하거나 별도 파라미터를 넘겨야 함.
-            # 가장 쉬운 건: 임시로 settings 값을 바꾸거나, synthesize_voice에 'force_disable_openai' 인자를 추가.
-            # 여기서는 간단히: synthesize_voice 내부 로직을 수정하지 않고, 호출 전에 체크.
-            
-            # (수정) synthesize_voice를 수정하는 대신, 
-            # 여기서 disable_openai_for_this_batch가 True면 -> _gtts_synthesize 바로 호출
-            is_openai_ok = (not disable_openai_for_this_batch) and bool(settings.OPENAI_API_KEY)
-            
-            tts_out = None
-            if is_openai_ok:
-                # OpenAI 시도
-                tts_out = synthesize_voice(line, raw)
-                # 만약 결과가 None이거나 실패했다면 -> disable 플래그 켜기
-                # (synthesize_voice는 실패시 내부적으로 fallback 시도하므로, 
-                #  반환값이 있으면 성공으로 간주하지만, 
-                #  그 '성공'이 gTTS에 의한 것인지 OpenAI에 의한 것인지 구분 불가.
-                #  로그를 보면 'OpenAI 실패 -> fallback -> gTTS 성공' 패턴임.
-                #  즉, synthesize_voice가 '느리게' 성공함.
-                #  따라서 '느린 성공'을 감지하려면, synthesize_voice를 쪼개서 호출해야 함.)
-                
-                # 리팩토링: synthesize_voice를 직접 부르는 대신, 단계를 쪼갬
-                # 1. OpenAI (if allowed)
-                res = None
-                try:
-                    res = _openai_tts(line, raw)
-                except Exception:
-                    # 실패 시 바로 플래그 켜고, 아래 Fallback으로 진행
-                    logger.warning("Line %d: OpenAI TTS Failed -> Disabling OpenAI for remaining lines.", i)
-                    disable_openai_for_this_batch = True
-                
-                if res:
-                    tts_out = res
-                else:
-                    disable_openai_for_this_batch = True
-                    # Fallback Logic (mac -> gtts)
-                    if platform.system() == "Darwin":
-                       tts_out = _macos_say(line, raw)
-                    
-                    if not tts_out:
-                        tts_out = _gtts_synthesize(line, raw)
-            else:
-                # OpenAI 이미 비활성화됨 -> 바로 Fallback
-                if platform.system() == "Darwin":
-                    tts_out = _macos_say(line, raw)
-                if not tts_out:
-                    tts_out = _gtts_synthesize(line, raw)
-
-            # 핵심: TTS가 None이거나 파일이 안 생기면 이 줄은 스킵
-            if (tts_out is None) or (not raw.exists()) or (raw.stat().st_size < 1000):
-                logger.warning("TTS line_%02d 생성 실패/무음 (OS=%s, key=%s) → 스킵",
-                               i, platform.system(), bool(settings.OPENAI_API_KEY))
-                continue
-
-            # 2) 후처리(무음 제거/속도/정규화)
-            _postprocess_voice(raw, part, speed=speed_up)
-
-            # 후처리 결과 파일 체크
-            if (not part.exists()) or (part.stat().st_size < 1000):
-                logger.warning("TTS line_%02d 후처리 결과가 비정상 → 스킵", i)
-                continue
-
-            # 3) 길이 측정 (ffprobe 실패해도 대충 추정해서 진행)
-            try:
-                dur = _ffprobe_duration_sec(part)
-            except Exception:
-                dur = max(0.7, min(2.2, len(line) / 7.0))  # 글자수 기반 추정
-
-            parts.append(part)
-            durs.append(dur)
-
+            return _synthesize_line(i, line, raw, gate)
         except Exception as e:
             logger.warning("TTS line_%02d 처리 중 예외 → 스킵: %s", i, e)
+            return None
+
+    # OpenAI를 쓸 때는 첫 줄만 먼저 (키/쿼터 문제면 나머지 줄은 OpenAI를 아예 안 부름)
+    pending = [(i, line) for i, line in jobs if i not in hits]
+    if gate.allowed() and pending:
+        i, line = pending.pop(0)
+        results[i] = one(i, line)
+        progress.report(pct=(len(hits) + 1) / len(jobs), line=len(hits) + 1, lines=len(jobs))
+
+    if pending:
+        workers = max(1, min(int(settings.TTS_CONCURRENCY), len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-line") as pool:
+            # contextvar(OpenAI 우선순위 등)를 줄 스레드에도 넘김 (submit마다 복사본 1개)
+            futs = {pool.submit(contextvars.copy_context().run, one, i, line): i for i, line in pending}
+            for fut in as_completed(futs):
+                results[futs[fut]] = fut.result()
+                # 줄 단위 진행 이벤트 (job 진행 중일 때만 전송됨)
+                done = len(hits) + len(results)
+                progress.report(pct=done / len(jobs), line=done, lines=len(jobs))
+
+    # 줄 순서대로 다시 모음 (실패한 줄은 빠짐)
+    raws: List[Path] = []
+    texts: List[str] = []
+    cached: List[Optional[float]] = []  # 캐시 줄이면 길이, 새로 만든 줄이면 None
+    providers: List[Optional[str]] = []
+    for i, line in jobs:
+        if i in hits:
+            raws.append(hits[i][0])
+            cached.append(hits[i][1])
+            providers.append(None)
+        elif results.get(i) is not None:
+            raws.append(results[i][0])
+            cached.append(None)
+            providers.append(results[i][1])
+        else:
             continue
+        texts.append(line)
 
     # 아무 파트도 없으면: '명확한 원인 로그'를 남기고 무음으로 반환(파이프라인은 유지)
-    if not parts:
+    if not raws:
         logger.error(
             "TTS 결과가 0개입니다. (OS=%s, OPENAI_API_KEY=%s) "
             "→ Linux/Docker면 OPENAI_API_KEY가 백엔드에 주입돼야 합니다.",
@@ -344,26 +477,30 @@ def synthesize_voice_lines(
         _run(cmd_silence)
         return empty, []
 
-    # concat은 기존 그대로
-    concat_txt = out_dir / "concat.txt"
-    concat_content = "\n".join([f"file '{p.name}'" for p in parts])
-    concat_txt.write_text(concat_content, encoding="utf-8")
-    
-    logger.info("TTS Concat Content:\n%s", concat_content)
-
-    voice_mp3 = out_dir / "voice.mp3"
-    cmd_concat = [
-        FFMPEG_BIN, "-y",
-        "-f", "concat", "-safe", "0",
-        "-i", str(concat_txt),
-        "-codec:a", "libmp3lame", "-b:a", "192k",
-        str(voice_mp3),
-    ]
+    # 후처리(무음 제거/속도/정규화) + 이어붙이기를 FFmpeg 1회로
     try:
-        _run(cmd_concat)
+        voice_path, line_wavs = assemble_narration(
+            raws, out_dir, speed=speed_up, pause_sec=tiny_pause_sec,
+            processed=[d is not None for d in cached],
+        )
     except Exception as e:
-        logger.error("FFmpeg Concat Failed. cmd=%s, content=%s", cmd_concat, concat_content)
-        raise e
+        logger.error("나레이션 조립 실패: lines=%d (%s)", len(raws), e)
+        raise
+
+    # 줄 길이 측정 (WAV 헤더를 직접 읽음, 실패해도 대충 추정해서 진행)
+    # 새로 만든 줄은 캐시에 저장 (길이를 제대로 잰 경우만)
+    durs: List[float] = []
+    for line_wav, text, hit_dur, used in zip(line_wavs, texts, cached, providers):
+        if hit_dur is not None:
+            durs.append(hit_dur)
+            continue
+        try:
+            dur = media_info.duration_sec(line_wav)
+        except Exception:
+            durs.append(max(0.7, min(2.2, len(text) / 7.0)))  # 글자수 기반 추정
+            continue
+        durs.append(dur)
+        _store_line(used, text, speed_up, line_wav, dur)
 
     timings: List[Tuple[float, float]] = []
     t = 0.0
@@ -373,4 +510,4 @@ def synthesize_voice_lines(
         timings.append((start, end))
         t = end + float(tiny_pause_sec)
 
-    return voice_mp3, timings
+    return voice_path, timings
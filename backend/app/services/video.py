@@ -12,14 +12,32 @@
 
 from __future__ import annotations
 
+import contextvars
+import json
+import math
 import os
+import shutil
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Iterator, Optional, List, Tuple
 
+import cv2
+import numpy as np
+
+from backend.app.core import progress
 from backend.app.core.config import settings
 from backend.app.core.logger import get_logger
+from backend.app.core.metrics import metrics
 from backend.app.services.caption_placement import pick_anchors_for_images
+from backend.app.services import media_info
+from backend.app.services.disk_cache import DiskLRUCache, file_sha256, make_key, link_or_copy
+from backend.app.services.motion import ZOOMPAN_PRESET_COUNT, _effect_zoompan, get_motion_engine
 
 from typing import Optional
 from pathlib import Path
@@ -28,6 +46,12 @@ logger = get_logger(__name__)
 
 FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
 
+# 출력 fps 기본값 (미리보기는 RenderOptions.fps로 낮춤)
+DEFAULT_FPS = 30
+
+# services/bgm_library.py가 만드는 BGM bed (이미 정규화 + VIDEO_SECONDS 길이) 파일 이름 끝
+BGM_BED_SUFFIX = ".bed.wav"
+
 # ffprobe도 같은 prefix를 쓰도록 맞추기
 if Path(FFMPEG_BIN).name == "ffmpeg":
     FFPROBE_BIN = os.getenv("FFPROBE_BIN", "ffprobe")
@@ -40,28 +64,217 @@ def _project_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
+def _available_cpus() -> list[int]:
+    # 이 프로세스가 쓸 수 있는 CPU id (컨테이너 cpuset 반영, 없는 OS면 0..N-1)
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+class RenderScheduler:
+    """
+    프로세스 전역 FFmpeg 코어 예산
+
+    왜 필요한가?
+    - 컷 병렬 렌더(워커 N개) + 동시 요청(MEDIA_WORKERS) + HLS 패키징이 겹치면
+      x264가 각자 "코어 수만큼" 스레드를 띄워서 코어 수의 몇 배로 과구독됨
+    - 컨텍스트 스위칭/캐시 경합 때문에 다 같이 느려짐 -> 예산 안에서만 돌리고 나머지는 줄 세움
+
+    동작
+    - FFmpeg 실행 전에 코어를 예산에서 빌리고, 모자라면 먼저 온 순서대로 대기 (큰 작업이 굶지 않게 FIFO)
+    - 빌린 코어 수에 맞춰 -threads(인코더별로 나눔) / -filter_complex_threads를 넣음
+    - pin=True면 빌린 CPU id에 taskset으로 고정
+    - libx264 인코딩이 없는 커맨드(-c copy, 자막 PNG 등)는 코어 1개
+    - 인코더 수 = 출력 비디오 스트림 수 (HLS처럼 -c:v libx264 1개로 rung N개를 인코딩해도 N개)
+    """
+
+    def __init__(self, budget: int = 0, per_job: int = 0, pin: bool = False):
+        cpus = _available_cpus()
+        self.budget = max(1, budget or len(cpus))
+        self.per_job = max(0, per_job)
+        self.pin = pin and shutil.which("taskset") is not None
+        # 예산이 실제 코어보다 크면 CPU id를 돌려가며 씀
+        self._free = [cpus[k % len(cpus)] for k in range(self.budget)]
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+
+    def default_threads(self) -> int:
+        # 인코딩 1건 기본 코어: 설정값 또는 예산을 동시 렌더 수로 나눈 값
+        workers = max(1, int(getattr(settings, "MEDIA_WORKERS", 2) or 2))
+        return self.per_job or max(1, self.budget // workers)
+
+    @staticmethod
+    def encoders(cmd: list[str]) -> int:
+        # x264 인코더 인스턴스 수: var_stream_map이 있으면 비디오 스트림(v:k) 수, 없으면 libx264 지정 수
+        n_enc = cmd.count("libx264")
+        if n_enc and "-var_stream_map" in cmd:
+            var_map = cmd[cmd.index("-var_stream_map") + 1]
+            n_enc = max(n_enc, sum(1 for part in var_map.replace(",", " ").split() if part.startswith("v:")))
+        return n_enc
+
+    def cores_for(self, cmd: list[str]) -> int:
+        # 커맨드가 가져갈 코어 수 (명시된 -threads가 있으면 그 값, 0/없음이면 기본값) x 인코더 수
+        n_enc = self.encoders(cmd)
+        if not n_enc:
+            return 1
+        explicit = [int(cmd[k + 1]) for k, a in enumerate(cmd[:-1]) if a == "-threads" and cmd[k + 1].isdigit()]
+        per_enc = max(explicit, default=0) or self.default_threads()
+        return max(1, min(self.budget, per_enc * n_enc))
+
+    def apply(self, cmd: list[str], cpus: list[int]) -> list[str]:
+        # 빌린 코어 기준으로 스레드 옵션 주입 (+ taskset)
+        # -threads는 출력의 비디오 스트림마다 적용되니까 인코더 수로 나눈 값
+        n = len(cpus)
+        out = list(cmd)
+        n_enc = self.encoders(out)
+        if n_enc:
+            per_enc = str(max(1, n // n_enc))
+            if "-threads" in out:
+                out = [per_enc if k and out[k - 1] == "-threads" else a for k, a in enumerate(out)]
+            else:
+                k = 0
+                while k < len(out):
+                    if out[k] == "libx264":
+                        out[k + 1:k + 1] = ["-threads", per_enc]
+                    k += 1
+        if "-filter_complex" in out:
+            # 전역 옵션이라 위치는 상관없음 (읽기 좋게 -filter_complex 바로 앞)
+            k = out.index("-filter_complex")
+            out[k:k] = ["-filter_complex_threads", str(n)]
+        if self.pin:
+            out = ["taskset", "-c", ",".join(str(c) for c in sorted(set(cpus))), *out]
+        return out
+
+    def _acquire(self, n: int) -> list[int]:
+        n = min(n, self.budget)
+        ticket = object()
+        t0 = time.perf_counter()
+        with self._cond:
+            self._queue.append(ticket)
+            metrics.set("render.queue_depth", len(self._queue))
+            while self._queue[0] is not ticket or len(self._free) < n:
+                self._cond.wait()
+            self._queue.popleft()
+            cpus, self._free = self._free[:n], self._free[n:]
+            metrics.set("render.queue_depth", len(self._queue))
+            metrics.set("render.cores_in_use", self.budget - len(self._free))
+            # 남은 코어로 다음 대기자도 시작할 수 있으면 깨움
+            self._cond.notify_all()
+        metrics.observe("render.queue_wait_sec", time.perf_counter() - t0)
+        return cpus
+
+    def _release(self, cpus: list[int]) -> None:
+        with self._cond:
+            self._free.extend(cpus)
+            metrics.set("render.cores_in_use", self.budget - len(self._free))
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, cmd: list[str]) -> Iterator[list[str]]:
+        """
+        with scheduler.slot(cmd) as cmd: subprocess.run(cmd, ...)
+
+        - 코어를 빌릴 때까지 대기 -> 스레드 옵션이 들어간 커맨드를 돌려줌 -> 끝나면 반납
+        """
+        cpus = self._acquire(self.cores_for(cmd))
+        try:
+            yield self.apply(cmd, cpus)
+        finally:
+            self._release(cpus)
+
+
+_SCHEDULER: Optional[RenderScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_scheduler() -> RenderScheduler:
+    # 프로세스 전역 스케줄러 (설정은 처음 만들 때 1번 읽음)
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = RenderScheduler(
+                budget=int(getattr(settings, "RENDER_CORE_BUDGET", 0) or 0),
+                per_job=int(getattr(settings, "RENDER_THREADS_PER_JOB", 0) or 0),
+                pin=bool(getattr(settings, "RENDER_PIN_CPUS", False)),
+            )
+        return _SCHEDULER
+
+
 def _run(cmd: list[str]):
-    # FFmpeg 실행 유틸
+    """
+    FFmpeg 실행 유틸
+
+    - FFmpeg면 RenderScheduler에서 코어를 빌려서 실행 (예산이 차면 여기서 대기)
+    - job 진행 중이면 -progress로 실시간 진행률 전송
+    """
+    is_ffmpeg = bool(cmd) and cmd[0] == FFMPEG_BIN
+    track = is_ffmpeg and progress.current_job() is not None
+    if track:
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    if not is_ffmpeg:
+        return _exec(cmd, track)
+    with get_scheduler().slot(cmd) as scheduled:
+        return _exec(scheduled, track)
+
+
+def _exec(cmd: list[str], track: bool = False):
     logger.info("FFmpeg 실행: %s", " ".join(cmd))
+    if track:
+        return _run_with_progress(cmd)
     p = subprocess.run(cmd, capture_output=True, text=True)
     if p.returncode != 0:
         raise RuntimeError(f"FFmpeg failed:\n{p.stderr}")
     return p
 
 
-def get_audio_duration_sec(audio_path: Path) -> float:
-    # ffprobe로 오디오 길이(초) 측정
-    cmd = [
-        FFPROBE_BIN,
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(audio_path),
-    ]
-    p = subprocess.run(cmd, capture_output=True, text=True)
+def _run_with_progress(cmd: list[str]) -> subprocess.CompletedProcess:
+    """
+    FFmpeg를 -progress pipe:1로 실행하고 블록 단위로 파싱해서 진행 이벤트 전송
+
+    - cmd에는 이미 -progress pipe:1 -nostats가 들어 있음 (_run이 넣음)
+    - stdout: key=value 줄들, progress=continue/end 줄이 한 블록의 끝
+    - stderr는 별도 스레드에서 받아둠 (파이프가 차서 FFmpeg가 멈추지 않게)
+    - pct는 영상 전체 길이(VIDEO_SECONDS) 기준 -> 컷/자막 같은 짧은 작업은 조금만 올라감
+    - 마지막 블록의 fps/speed는 metrics(ffmpeg.encode_fps / ffmpeg.speed)에 기록 (용량 산정용)
+    """
+    total = float(settings.VIDEO_SECONDS) or 1.0
+
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+    err_chunks: list[str] = []
+    drain = threading.Thread(target=lambda: err_chunks.append(p.stderr.read()), daemon=True)
+    drain.start()
+
+    block: dict = {}
+    last: dict = {}
+    for line in p.stdout:
+        key, _, value = line.strip().partition("=")
+        if not key:
+            continue
+        block[key] = value
+        if key == "progress":
+            last = progress.parse_ffmpeg_progress(block)
+            if "out_time_sec" in last:
+                last["pct"] = min(1.0, last["out_time_sec"] / total)
+            progress.report(**last)
+            block = {}
+
+    p.wait()
+    drain.join()
+    stderr = "".join(err_chunks)
     if p.returncode != 0:
-        raise RuntimeError(f"ffprobe failed:\n{p.stderr}")
-    return float((p.stdout or "").strip() or "0")
+        raise RuntimeError(f"FFmpeg failed:\n{stderr}")
+
+    if last.get("fps"):
+        metrics.observe("ffmpeg.encode_fps", last["fps"])
+    if last.get("speed"):
+        metrics.observe("ffmpeg.speed", last["speed"])
+    return subprocess.CompletedProcess(cmd, p.returncode, "", stderr)
+
+
+def get_audio_duration_sec(audio_path: Path) -> float:
+    # 오디오 길이(초) - WAV/MP3는 프로세스 없이 헤더로, 나머지는 ffprobe (services/media_info.py)
+    return media_info.duration_sec(audio_path)
 
 
 def _escape_drawtext(s: str) -> str:
@@ -83,98 +296,460 @@ def _pick_y_by_anchor_name(anchor_name: str) -> str:
     return "h*0.82"
 
 
-def _effect_zoompan(i: int) -> str:
+def _video_dims() -> Tuple[int, int]:
+    # settings.VIDEO_SIZE("1080x1920") -> (1080, 1920)
+    w, h = settings.VIDEO_SIZE.split("x")
+    return int(w), int(h)
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """
+    job 단위 렌더 옵션 (슬라이드쇼/자막/믹스 함수들이 같이 받음)
+
+    - normalized: ingest.normalize_images로 정규화된 still인지 (컷 체인에서 scale/pad/eq 생략)
+    - graded: 색보정만 끝난 still인지 (여러 화면비용 - 크기/패딩은 렌디션마다 필터에서)
+    - profile: 인코딩 프로필 이름 (None이면 settings.ENCODE_PROFILE)
+    - size: 출력 크기 (None이면 settings.VIDEO_SIZE)
+    - fps: 출력 fps (None이면 DEFAULT_FPS)
     """
-    안전한 zoompan 프리셋 (ffmpeg expr에서 on/d 같은 변수 사용 X)
+    normalized: bool = False
+    graded: bool = False
+    profile: Optional[str] = None
+    size: Optional[Tuple[int, int]] = None
+    fps: Optional[int] = None
+
+
+def _dims(opts: Optional[RenderOptions] = None) -> Tuple[int, int]:
+    # 이번 렌더의 출력 크기 (opts.size 우선)
+    if opts is not None and opts.size:
+        return opts.size
+    return _video_dims()
 
-    - zoompan 내부에서 프레임 인덱스/길이(d)를 나눗셈으로 쓰면
-      ffmpeg 버전에 따라 'd' 파싱 문제가 나서 깨질 수 있음.
-    - 그래서 "좌표를 고정"하거나 "간단한 식"만 사용
 
-    리턴값: "zoompan=..." 전체 문자열
+def _fps(opts: Optional[RenderOptions] = None) -> int:
+    return int(opts.fps) if opts is not None and opts.fps else DEFAULT_FPS
+
+
+@dataclass(frozen=True)
+class Rendition:
     """
-    k = i % 4
+    출력 화면비 1개 (예: 9:16 -> 1080x1920)
 
-    # 공통: 프레임 누적 줌인 (쇼츠 느낌나게)
-    # zoom은 내부 상태로 누적되므로 zoom+... 형태가 안정적
-    z_fast = "z='min(zoom+0.0040,1.20)'"
-    z_slow = "z='min(zoom+0.0030,1.16)'"
+    - tag: 파일 이름/디렉토리용 ("1:1" -> "1x1")
+    """
+    aspect: str
+    w: int
+    h: int
 
-    if k == 0:
-        # 0) 중앙 줌인
-        return f"zoompan={z_fast}:x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+    @property
+    def tag(self) -> str:
+        return self.aspect.replace(":", "x")
 
-    if k == 1:
-        # 1) 오른쪽 살짝 포커스 (고정 오프셋)
-        return f"zoompan={z_slow}:x='iw*0.55-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
 
-    if k == 2:
-        # 2) 위쪽 살짝 포커스
-        return f"zoompan={z_slow}:x='iw/2-(iw/zoom/2)':y='ih*0.42-(ih/zoom/2)'"
+def _even(x: float) -> int:
+    # yuv420p는 가로/세로가 짝수여야 함
+    return max(2, int(round(x / 2)) * 2)
 
-    # 3) 아래쪽 살짝 포커스
-    return f"zoompan={z_slow}:x='iw/2-(iw/zoom/2)':y='ih*0.62-(ih/zoom/2)'"
 
+def rendition_for_size(w: int, h: int) -> Rendition:
+    # 1080x1920 -> Rendition("9:16", 1080, 1920)
+    g = math.gcd(w, h)
+    return Rendition(f"{w // g}:{h // g}", w, h)
 
 
+def parse_aspects(spec: Optional[str] = None) -> list[Rendition]:
+    """
+    "9:16,1:1,16:9" -> Rendition 목록 (순서 유지, 중복 제거)
 
-def build_slideshow(images: list[Path], out_video: Path) -> Path:
+    - 짧은 변은 settings.VIDEO_SIZE의 짧은 변(기본 1080)에 맞춤
+    - 비어 있으면 settings.VIDEO_ASPECTS, 그것도 비면 VIDEO_SIZE 1개
+    - 형식이 이상하면 ValueError (API에서 400으로 변환)
     """
-    이미지 -> 무음 슬라이드쇼 mp4 생성
+    base_w, base_h = _video_dims()
+    spec = (spec if spec is not None else getattr(settings, "VIDEO_ASPECTS", "")) or ""
+
+    out: list[Rendition] = []
+    for raw in spec.replace(" ", "").split(","):
+        if not raw:
+            continue
+        try:
+            a, b = (int(x) for x in raw.split(":"))
+        except ValueError:
+            raise ValueError(f"invalid aspect: {raw} (예: 9:16,1:1,16:9)")
+        if a <= 0 or b <= 0:
+            raise ValueError(f"invalid aspect: {raw}")
+        g = math.gcd(a, b)
+        a, b = a // g, b // g
+        short = min(base_w, base_h)
+        w, h = (short, _even(short * b / a)) if a <= b else (_even(short * a / b), short)
+        r = Rendition(f"{a}:{b}", w, h)
+        if r not in out:
+            out.append(r)
+
+    if not out:
+        out.append(rendition_for_size(base_w, base_h))
+    return out
+
+
+def rendition_path(out_video: Path, r: Rendition, primary: bool) -> Path:
+    # 첫 번째 렌디션은 기존 이름(final.mp4), 나머지는 final_1x1.mp4 처럼
+    if primary:
+        return out_video
+    return out_video.with_name(f"{out_video.stem}_{r.tag}{out_video.suffix}")
+
+
+def _per_size_dir(parent: Path, name: str, opts: Optional[RenderOptions]) -> Path:
+    # 기본 크기면 기존 디렉토리 이름 그대로, 다른 크기면 name_WxH (렌디션끼리 안 겹치게)
+    w, h = _dims(opts)
+    if (w, h) == _video_dims():
+        return parent / name
+    return parent / f"{name}_{w}x{h}"
+
+
+def get_encode_profile(name: Optional[str] = None) -> dict:
+    """
+    settings.ENCODE_PROFILES에서 프로필 조회 (이름이 없으면 기본 프로필)
+
+    - 모르는 이름이면 ValueError (API에서 400으로 변환)
+    """
+    key = (name or settings.ENCODE_PROFILE or "balanced").strip().lower()
+    profiles = settings.ENCODE_PROFILES
+    if key not in profiles:
+        raise ValueError(f"unknown encode profile: {key} (available: {', '.join(profiles)})")
+    return profiles[key]
+
+
+def encode_args(profile: Optional[str] = None, gop: Optional[int] = None, threads: Optional[int] = None) -> list[str]:
+    """
+    libx264 인코딩 옵션 (-preset/-tune/-crf/-maxrate/-g/-threads)
+
+    - 정지 이미지 슬라이드쇼라 기본 tune은 stillimage
+    - gop/threads를 넘기면 프로필 값 대신 사용 (컷별 closed-GOP 렌더 등)
+    """
+    p = get_encode_profile(profile)
+    args = ["-c:v", "libx264", "-preset", str(p.get("preset", "medium"))]
+    if p.get("tune"):
+        args += ["-tune", str(p["tune"])]
+    if p.get("crf") is not None:
+        args += ["-crf", str(p["crf"])]
+    if p.get("maxrate"):
+        args += ["-maxrate", str(p["maxrate"]), "-bufsize", str(p.get("bufsize") or p["maxrate"])]
+    g = gop or p.get("gop")
+    if g:
+        args += ["-g", str(g)]
+    t = threads if threads is not None else p.get("threads", 0)
+    args += ["-threads", str(t), "-pix_fmt", "yuv420p"]
+    return args
+
+
+def _cut_filter(
+    i: int,
+    in_label: str,
+    per: float,
+    w: int,
+    h: int,
+    fps: int,
+    normalized: bool = False,
+    graded: bool = False,
+    out_label: Optional[str] = None,
+) -> str:
+    """
+    컷 1개 필터 체인 (입력 라벨 -> [v{i}] 또는 [out_label])
 
-    포인트
-    - images 개수로 18초를 균등 분할
-    - 각 컷마다 zoompan 모션을 다르게 줘서 지루함 줄임
     - scale/pad/setsar로 입력 포맷이 달라도 concat 안정화
+    - motion은 컷 인덱스 i로부터 만든다 (settings.MOTION_ENGINE 엔진의 필터)
+    - normalized=True: ingest.normalize_images로 크기/패딩/색보정이 끝난 still
+      -> 프레임마다 돌 필요 없는 scale/pad/eq는 빼고 zoompan만
+    - graded=True: 색보정만 끝난 still (여러 화면비) -> eq만 생략
     """
-    out_video.parent.mkdir(parents=True, exist_ok=True)
+    motion = get_motion_engine().motion_filter(i, per, w, h, fps)
+    if normalized:
+        prep = "setsar=1,"
+    else:
+        prep = (
+            f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,"
+            f"setsar=1,"
+        )
+    grade = "" if (normalized or graded) else "eq=contrast=1.06:saturation=1.05,"
+    return (
+        f"[{in_label}]"
+        f"{prep}"
+        f"{motion},"
+        f"{grade}"
+        f"trim=duration={per},setpts=PTS-STARTPTS,"
+        f"format=yuv420p"
+        f"[{out_label or f'v{i}'}]"
+    )
 
-    total = float(settings.VIDEO_SECONDS)  # 기본 18초
-    fps = 30
-    n = max(1, len(images))
-    per = total / n
 
-    w, h = settings.VIDEO_SIZE.split("x")
-    w, h = int(w), int(h)
-    frames_per = max(1, int(per * fps))
+def _cut_label(i: int, r: int) -> str:
+    # 렌디션 0은 기존 라벨 [v{i}] 그대로
+    return f"v{i}" if r == 0 else f"v{i}_{r}"
 
-    cmd = [FFMPEG_BIN, "-y"]
 
-    # 1) 이미지 입력 추가 (-loop 1로 각 이미지를 영상처럼)
-    for img in images:
-        cmd += ["-loop", "1", "-t", str(per), "-i", str(img)]
+def _slideshow_filters(
+    n: int,
+    per: float,
+    w: int,
+    h: int,
+    fps: int,
+    out_label: str = "vout",
+    normalized: bool = False,
+    graded: bool = False,
+) -> list[str]:
+    """
+    슬라이드쇼 필터 체인 (build_slideshow / render_single_pass 공용)
 
-    # 2) 각 이미지별 필터 체인 생성 (핵심: motion은 i로부터 만든다)
+    - 입력 [0:v]..[n-1:v] 각각 컷 체인 -> [v{i}]
+    - concat으로 이어붙여 [out_label]로 내보냄
+    """
+    return _multi_slideshow_filters(n, per, [(w, h)], fps, [out_label], normalized, graded)
+
+
+def _multi_slideshow_filters(
+    n: int,
+    per: float,
+    sizes: list[Tuple[int, int]],
+    fps: int,
+    out_labels: list[str],
+    normalized: bool = False,
+    graded: bool = False,
+) -> list[str]:
+    """
+    여러 화면비 슬라이드쇼 필터 체인 (그래프 1개)
+
+    - 입력 [i:v]는 1번만 디코딩하고 split으로 렌디션 수만큼 나눔
+    - 렌디션 r마다 컷 체인(scale/pad/motion) -> concat -> [out_labels[r]]
+    - 렌디션이 1개면 split 없이 기존 체인과 동일
+    """
+    k = len(sizes)
     filters: list[str] = []
-    for i, _img in enumerate(images):
-        motion = _effect_zoompan(i)  
+
+    # 각 이미지별 필터 체인 생성
+    for i in range(n):
+        if k == 1:
+            branches = [f"{i}:v"]
+        else:
+            branches = [f"s{i}_{r}" for r in range(k)]
+            filters.append(f"[{i}:v]split={k}" + "".join(f"[{b}]" for b in branches))
+        for r, (w, h) in enumerate(sizes):
+            filters.append(
+                _cut_filter(i, branches[r], per, w, h, fps, normalized, graded, out_label=_cut_label(i, r))
+            )
+
+    # concat으로 이어붙이기 (렌디션마다 v{i}를 하나로)
+    for r, out_label in enumerate(out_labels):
+        concat_inputs = "".join([f"[{_cut_label(i, r)}]" for i in range(n)])
         filters.append(
-            f"[{i}:v]"
-            f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
-            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,"
+            f"{concat_inputs}"
+            f"concat=n={n}:v=1:a=0,"
             f"setsar=1,"
-            f"{motion}:d={frames_per}:s={w}x{h}:fps={fps},"
-            f"eq=contrast=1.06:saturation=1.05,"
-            f"trim=duration={per},setpts=PTS-STARTPTS,"
             f"format=yuv420p"
-            f"[v{i}]"
+            f"[{out_label}]"
         )
+    return filters
 
-    # 3) concat으로 이어붙이기 (모든 v{i}를 하나로)
-    concat_inputs = "".join([f"[v{i}]" for i in range(n)])
-    filters.append(
-        f"{concat_inputs}"
-        f"concat=n={n}:v=1:a=0,"
-        f"setsar=1,"
-        f"format=yuv420p"
-        f"[vout]"
+
+def _slideshow_renderer() -> str:
+    """
+    graph: FFmpeg 1개 프로세스에서 concat 필터 / parallel: 컷별 병렬 렌더 + concat demuxer
+
+    - 필터로 표현 못 하는 모션 엔진(kenburns)은 항상 parallel
+    """
+    if not get_motion_engine().filter_based:
+        return "parallel"
+    return (getattr(settings, "SLIDESHOW_RENDERER", "graph") or "graph").strip().lower()
+
+
+def _render_workers(n_jobs: int) -> int:
+    # 워커 수: 설정값(0이면 코어 예산) 이내, 작업 수보다 많을 필요는 없음
+    workers = int(getattr(settings, "RENDER_WORKERS", 0) or 0) or get_scheduler().budget
+    return max(1, min(workers, n_jobs))
+
+
+def _render_cut(
+    img: Path,
+    i: int,
+    per: float,
+    w: int,
+    h: int,
+    fps: int,
+    out_clip: Path,
+    threads: int,
+    opts: Optional[RenderOptions] = None,
+) -> Path:
+    """
+    컷 1개를 closed-GOP 클립으로 인코딩
+
+    - GOP 길이 = 컷 프레임 수, scene-cut 끔 -> 클립마다 키프레임 1개로 시작
+    - 그래야 concat demuxer + -c copy로 재인코딩 없이 이어붙일 수 있음
+    - 필터 기반이 아닌 모션 엔진은 엔진이 직접 클립을 만든다
+    """
+    opts = opts or RenderOptions()
+    frames_per = max(1, int(per * fps))
+    # out_clip이 캐시 hit을 하드링크한 파일일 수 있음 -> 그대로 덮어쓰면 캐시 원본(같은 inode)까지 바뀜
+    out_clip.unlink(missing_ok=True)
+    cut_args = [
+        *encode_args(opts.profile, gop=frames_per, threads=threads),
+        "-r", str(fps),
+        "-keyint_min", str(frames_per),
+        "-sc_threshold", "0",
+        "-flags", "+cgop",
+    ]
+
+    engine = get_motion_engine()
+    if not engine.filter_based:
+        # 정규화된 still도 색보정이 끝난 상태 (필터 엔진에서 eq를 빼는 조건과 같게)
+        return engine.render_clip(img, i, per, w, h, fps, out_clip, cut_args, graded=opts.graded or opts.normalized)
+
+    cmd = [
+        FFMPEG_BIN, "-y",
+        *engine.input_args(per, fps), "-i", str(img),
+        "-filter_complex", _cut_filter(i, "0:v", per, w, h, fps, opts.normalized, opts.graded),
+        "-map", f"[v{i}]",
+        "-an",
+        *cut_args,
+        str(out_clip),
+    ]
+    _run(cmd)
+    return out_clip
+
+
+_SEGMENT_CACHE: Optional[DiskLRUCache] = None
+
+
+def _segment_cache() -> Optional[DiskLRUCache]:
+    # 컷 클립 캐시 (SEGMENT_CACHE_ENABLED=False면 None)
+    global _SEGMENT_CACHE
+    if not getattr(settings, "SEGMENT_CACHE_ENABLED", True):
+        return None
+    if _SEGMENT_CACHE is None:
+        _SEGMENT_CACHE = DiskLRUCache(
+            Path(settings.SEGMENT_CACHE_DIR),
+            max_bytes=int(settings.SEGMENT_CACHE_MAX_MB) * 1024 * 1024,
+            name="segment_cache",
+        )
+    return _SEGMENT_CACHE
+
+
+def _segment_key(img: Path, i: int, per: float, w: int, h: int, fps: int, opts: RenderOptions) -> str:
+    """
+    컷 클립 캐시 키
+
+    - 이미지 내용 해시 + 모션 엔진 + 프리셋 번호 + 크기 + fps + 프레임 수 (+ 전처리 상태/인코딩 프로필)
+    - 같은 메뉴 사진으로 문구/톤만 바꿔 재생성하면 모션 렌더를 건너뜀
+    """
+    frames_per = max(1, int(per * fps))
+    return make_key(
+        "cut-v5",
+        file_sha256(img),
+        get_motion_engine().name,
+        i % ZOOMPAN_PRESET_COUNT,
+        f"{w}x{h}",
+        fps,
+        frames_per,
+        f"{per:.4f}",
+        int(opts.normalized),
+        int(opts.graded),
+        json.dumps(get_encode_profile(opts.profile), sort_keys=True),
     )
 
-    filter_complex = ";".join(filters)
 
-    cmd += [
-        "-filter_complex", filter_complex,
-        "-map", "[vout]",
+def render_cut_segments(
+    images: list[Path],
+    seg_dir: Path,
+    fps: Optional[int] = None,
+    opts: Optional[RenderOptions] = None,
+) -> Path:
+    """
+    컷별로 클립을 병렬 렌더하고 concat demuxer용 목록 파일을 만든다.
+
+    - 컷 하나 = FFmpeg 프로세스 하나, 프로세스 수는 RENDER_WORKERS(0이면 코어 예산)까지
+    - 병렬로 돌리는 만큼 x264 스레드는 코어 예산/워커 수로 나눠서 과구독 방지
+      (동시 요청끼리는 RenderScheduler가 예산 안에서 줄 세움)
+    - 세그먼트 캐시에 있는 컷은 렌더하지 않고 재사용, 없는 컷만 렌더 후 캐시에 저장
+    - 리턴값: segments.txt (ffmpeg -f concat 입력)
+    """
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    opts = opts or RenderOptions()
+    fps = fps or _fps(opts)
+
+    total = float(settings.VIDEO_SECONDS)
+    n = max(1, len(images))
+    per = total / n
+    w, h = _dims(opts)
+
+    cache = _segment_cache()
+    clips = [seg_dir / f"cut_{i:02d}.mp4" for i in range(n)]
+
+    # 1) 캐시 조회 (같은 job 안에서 키가 같은 컷은 1번만 렌더)
+    keys: list[Optional[str]] = [None] * n
+    todo: dict[str, int] = {}  # key -> 렌더할 대표 컷 인덱스
+    pending: list[int] = []
+    for i, img in enumerate(images):
+        if cache is None:
+            pending.append(i)
+            continue
+        key = _segment_key(img, i, per, w, h, fps, opts)
+        keys[i] = key
+        if key in todo:
+            continue
+        hit = cache.get(key, ".mp4")
+        if hit is not None:
+            link_or_copy(hit, clips[i])
+        else:
+            todo[key] = i
+            pending.append(i)
+
+    # 2) 없는 컷만 병렬 렌더
+    workers = _render_workers(max(1, len(pending)))
+    threads = max(1, get_scheduler().budget // workers)
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # 워커 스레드에도 job 컨텍스트(진행 이벤트 대상)를 넘김
+            futures = [
+                pool.submit(contextvars.copy_context().run, _render_cut, images[i], i, per, w, h, fps, clips[i], threads, opts)
+                for i in pending
+            ]
+            for f in futures:
+                f.result()  # 실패한 컷이 있으면 여기서 예외
+
+    # 3) 새로 렌더한 컷은 캐시에 저장 + 같은 키의 나머지 컷 채우기
+    if cache is not None:
+        for key, i in todo.items():
+            try:
+                cache.put(key, clips[i], ".mp4")
+            except Exception as e:
+                logger.warning("세그먼트 캐시 저장 실패(무시): %s", e)
+        for i in range(n):
+            if not clips[i].exists():
+                link_or_copy(clips[todo[keys[i]]], clips[i])
+
+    list_path = seg_dir / "segments.txt"
+    list_path.write_text("\n".join(f"file '{c.resolve()}'" for c in clips), encoding="utf-8")
+    logger.info(
+        "컷 렌더 완료: n=%d rendered=%d cached=%d workers=%d threads/cut=%d",
+        n, len(pending), n - len(pending), workers, threads,
+    )
+    return list_path
+
+
+def build_slideshow_parallel(images: list[Path], out_video: Path, opts: Optional[RenderOptions] = None) -> Path:
+    """
+    컷별 병렬 렌더 -> concat demuxer(-c copy)로 이어붙이기 (재인코딩 없음)
+    """
+    out_video.parent.mkdir(parents=True, exist_ok=True)
+
+    total = float(settings.VIDEO_SECONDS)
+    list_path = render_cut_segments(images, _per_size_dir(out_video.parent, "segments", opts), opts=opts)
+
+    cmd = [
+        FFMPEG_BIN, "-y",
+        "-f", "concat", "-safe", "0",
+        "-i", str(list_path),
+        "-c", "copy",
         "-t", str(total),
         str(out_video),
     ]
@@ -182,84 +757,433 @@ def build_slideshow(images: list[Path], out_video: Path) -> Path:
     return out_video
 
 
+def build_slideshow(images: list[Path], out_video: Path, opts: Optional[RenderOptions] = None) -> Path:
+    """
+    이미지 -> 무음 슬라이드쇼 mp4 생성
 
-def burn_text_overlays(
-    in_video: Path,
+    포인트
+    - images 개수로 18초를 균등 분할
+    - 각 컷마다 zoompan 모션을 다르게 줘서 지루함 줄임
+    - scale/pad/setsar로 입력 포맷이 달라도 concat 안정화
+    - SLIDESHOW_RENDERER=parallel이면 컷별 병렬 렌더로 위임
+    - opts.normalized=True면 이미 정규화된 still이라 컷 체인에서 scale/pad/eq 생략
+    """
+    opts = opts or RenderOptions()
+    return build_slideshow_renditions(images, [(rendition_for_size(*_dims(opts)), out_video)], opts)[0]
+
+
+def build_slideshow_renditions(
+    images: list[Path],
+    targets: list[Tuple[Rendition, Path]],
+    opts: Optional[RenderOptions] = None,
+) -> list[Path]:
+    """
+    이미지 -> 화면비별 무음 슬라이드쇼 mp4 (targets 순서대로 경로 리턴)
+
+    - graph: FFmpeg 1회, 이미지 디코딩 1번 -> split -> 렌디션마다 컷 체인 -> 출력 N개
+    - parallel: 렌디션마다 컷별 병렬 렌더 (컷 클립은 크기별로 따로 캐시)
+    """
+    opts = opts or RenderOptions()
+    if _slideshow_renderer() == "parallel":
+        return [
+            build_slideshow_parallel(images, out, replace(opts, size=(r.w, r.h)))
+            for r, out in targets
+        ]
+
+    for _r, out in targets:
+        out.parent.mkdir(parents=True, exist_ok=True)
+
+    total = float(settings.VIDEO_SECONDS)  # 기본 18초
+    fps = _fps(opts)
+    n = max(1, len(images))
+    per = total / n
+
+    cmd = [FFMPEG_BIN, "-y"]
+
+    # 1) 이미지 입력 추가 (-loop 1로 각 이미지를 영상처럼, 옵션은 모션 엔진이 정함)
+    input_args = get_motion_engine().input_args(per, fps)
+    for img in images:
+        cmd += [*input_args, "-i", str(img)]
+
+    # 2) 각 이미지별 필터 체인 + concat (렌디션이 여러 개면 split으로 분기)
+    out_labels = ["vout"] if len(targets) == 1 else [f"vout{r}" for r in range(len(targets))]
+    filter_complex = ";".join(_multi_slideshow_filters(
+        n, per, [(r.w, r.h) for r, _ in targets], fps, out_labels,
+        normalized=opts.normalized, graded=opts.graded,
+    ))
+
+    cmd += ["-filter_complex", filter_complex]
+    for label, (_r, out) in zip(out_labels, targets):
+        cmd += [
+            "-map", f"[{label}]",
+            *encode_args(opts.profile),
+            "-t", str(total),
+            str(out),
+        ]
+    _run(cmd)
+    return [out for _r, out in targets]
+
+
+def _even_timings(n: int, total: float) -> List[Tuple[float, float]]:
+    # total/n 균등 분배 (마지막 줄은 total까지)
+    per = total / n
+    timings = [(i * per, (i + 1) * per) for i in range(n)]
+    timings[-1] = (timings[-1][0], total)
+    return timings
+
+
+@dataclass(frozen=True)
+class CaptionSpec:
+    text: str      # drawtext용 escape 완료된 문자열
+    y_expr: str    # "h*0.12" 같은 y 위치 식
+    start: float
+    end: float
+
+
+def _caption_specs(
     image_paths: list[Path],
     lines: list[str],
-    out_video: Path,
-    timings: Optional[List[Tuple[float, float]]] = None, 
-) -> Path:
+    timings: Optional[List[Tuple[float, float]]],
+    total: float,
+) -> list[CaptionSpec]:
     """
-    libass 없이도 항상 동작하는 drawtext 자막
+    자막 줄 -> (텍스트, y 위치, 시작/끝) 목록
 
     - timings가 있으면: 각 줄의 (start,end) 구간을 그대로 사용(싱크 개선)
     - timings가 없으면: total/n 균등 분배
+    - 빈 줄은 빼버림 (깨짐 방지)
     """
-    out_video.parent.mkdir(parents=True, exist_ok=True)
-
-    total = float(settings.VIDEO_SECONDS)
     lines = lines or [" "]
     n = max(1, len(lines))
 
     if not timings or len(timings) != n:
-        per = total / n
-        timings = [(i * per, (i + 1) * per) for i in range(n)]
-        timings[-1] = (timings[-1][0], total)
+        timings = _even_timings(n, total)
 
     anchors = pick_anchors_for_images(image_paths)[:n]
 
+    specs: list[CaptionSpec] = []
+    for i, raw in enumerate(lines):
+        start, end = timings[i]
+        txt = _escape_drawtext((raw or "").strip())
+        if not txt:
+            continue
+        y_expr = _pick_y_by_anchor_name(anchors[i].name) if i < len(anchors) else "h*0.12"
+        specs.append(CaptionSpec(txt, y_expr, start, end))
+    return specs
+
+
+def _fontfile() -> str:
     # 실행 위치 상관없이 안정적으로 폰트 찾기
     fontfile_path = (_project_root() / "assets" / "fonts" / "BMHANNAPro.ttf").resolve()
     # FFmpeg 필터 내에서 백슬래시(\)는 이스케이프 문자로 오인될 수 있으므로 슬래시(/)로 통일
-    fontfile = str(fontfile_path).replace("\\", "/")
+    return str(fontfile_path).replace("\\", "/")
 
-    # 자막 스타일: settings에서 읽기
-    fontsize = int(getattr(settings, "CAPTION_FONT_SIZE", 104))
-    borderw = int(getattr(settings, "CAPTION_BORDER_W", 12))
-    box_alpha = float(getattr(settings, "CAPTION_BOX_ALPHA", 0.35))
-    boxborder = int(getattr(settings, "CAPTION_BOX_BORDER", 18))
 
+def _caption_style(size: Optional[Tuple[int, int]] = None) -> Tuple[int, int, float, int]:
+    """
+    자막 스타일: settings에서 읽기 (fontsize, borderw, box_alpha, boxborder)
 
-    draw_filters: list[str] = []
-    for i, raw in enumerate(lines):
-        start, end = timings[i]
-        txt = _escape_drawtext((raw or "").strip())
+    - settings 값은 VIDEO_SIZE 기준 픽셀 -> 다른 크기(미리보기 360x640 등)면 짧은 변 비율로 축소/확대
+    """
+    scale = 1.0
+    if size is not None:
+        scale = min(size) / min(_video_dims())
+    return (
+        max(8, round(int(getattr(settings, "CAPTION_FONT_SIZE", 104)) * scale)),
+        max(1, round(int(getattr(settings, "CAPTION_BORDER_W", 12)) * scale)),
+        float(getattr(settings, "CAPTION_BOX_ALPHA", 0.35)),
+        max(1, round(int(getattr(settings, "CAPTION_BOX_BORDER", 18)) * scale)),
+    )
 
-        # 빈 텍스트면 필터 자체를 생략 (깨짐 방지)
-        if not txt:
-            continue
 
-        y_expr = _pick_y_by_anchor_name(anchors[i].name) if i < len(anchors) else "h*0.12"
+def _drawtext_style(text: str, y_expr: str, size: Optional[Tuple[int, int]] = None) -> str:
+    # drawtext 1줄 (타이밍 enable 제외) - 직접 burn-in / 래스터화 공용
+    fontsize, borderw, box_alpha, boxborder = _caption_style(size)
+    return (
+        "drawtext="
+        f"fontfile='{_fontfile()}':"
+        f"text='{text}':"
+
+        # 폰트 
+        f"fontsize={fontsize}:"
 
-        draw_filters.append(
-            "drawtext="
-            f"fontfile='{fontfile}':"
-            f"text='{txt}':"
 
-            # 폰트 
-            f"fontsize={fontsize}:"
+        # 글자색/테두리/그림자 
+        "fontcolor=white:"
+        f"borderw={borderw}:"
+        "bordercolor=black:"
+        "shadowx=3:shadowy=3:shadowcolor=black@0.7:"
 
+        # 반투명 박스배경 깔기
+        "box=1:"
+        f"boxcolor=black@{box_alpha}:"
+        f"boxborderw={boxborder}:"
 
-            # 글자색/테두리/그림자 
-            "fontcolor=white:"
-            f"borderw={borderw}:"
-            "bordercolor=black:"
-            "shadowx=3:shadowy=3:shadowcolor=black@0.7:"
 
-            # 반투명 박스배경 깔기
-            "box=1:"
-            f"boxcolor=black@{box_alpha}:"
-            f"boxborderw={boxborder}:"
+        # 위치: 가운데 정렬
+        "x=(w-text_w)/2:"
+        f"y={y_expr}"
+    )
 
 
-            # 위치: 가운데 정렬
-            "x=(w-text_w)/2:"
-            f"y={y_expr}:"
+def _drawtext_filters(
+    image_paths: list[Path],
+    lines: list[str],
+    timings: Optional[List[Tuple[float, float]]],
+    total: float,
+    size: Optional[Tuple[int, int]] = None,
+) -> list[str]:
+    """
+    자막 줄마다 drawtext 필터 문자열 생성 (CAPTION_RENDERER=drawtext 또는 래스터 실패 시)
+    """
+    return [
+        _drawtext_style(c.text, c.y_expr, size)
+        # 타이밍
+        + f":enable='between(t,{c.start:.2f},{c.end:.2f})'"
+        for c in _caption_specs(image_paths, lines, timings, total)
+    ]
 
-            # 타이밍
-            f"enable='between(t,{start:.2f},{end:.2f})'"
+
+@dataclass(frozen=True)
+class CaptionImage:
+    path: Path     # 텍스트 영역만 잘라낸 투명 PNG
+    x: int         # 영상 위 좌상단 좌표
+    y: int
+    start: float
+    end: float
+
+
+_CAPTION_CACHE: Optional[DiskLRUCache] = None
+
+
+def _caption_cache() -> Optional[DiskLRUCache]:
+    # 자막 PNG 캐시 (같은 문구/스타일/크기면 재사용)
+    global _CAPTION_CACHE
+    if not getattr(settings, "CAPTION_CACHE_ENABLED", True):
+        return None
+    if _CAPTION_CACHE is None:
+        _CAPTION_CACHE = DiskLRUCache(
+            Path(settings.CAPTION_CACHE_DIR),
+            max_bytes=int(settings.CAPTION_CACHE_MAX_MB) * 1024 * 1024,
+            name="caption_cache",
         )
+    return _CAPTION_CACHE
+
+
+def _caption_key(spec: CaptionSpec, w: int, h: int) -> str:
+    return make_key("caption-v2", spec.text, spec.y_expr, _caption_style((w, h)), Path(_fontfile()).name, f"{w}x{h}")
+
+
+def _matte(on_black: Path, on_white: Path) -> np.ndarray:
+    """
+    검은/흰 불투명 배경에 각각 그린 자막 2장 -> BGRA (difference matte)
+
+    - 투명 캔버스(black@0.0 + rgba)에 drawtext를 그리면 FFmpeg blend가 알파를 한 번 더 곱함
+      (box 0.35 -> 약 0.12, 그림자 0.7 -> 약 0.49) -> drawtext burn-in과 다르게 보임
+    - 불투명 배경 두 장이면 알파가 정확히 나옴: alpha = 1 - (white - black) / 255
+    - 색은 검은 배경 쪽에서 알파로 나눠서 복원 (premultiplied -> straight)
+    """
+    b = cv2.imread(str(on_black), cv2.IMREAD_COLOR)
+    wt = cv2.imread(str(on_white), cv2.IMREAD_COLOR)
+    if b is None or wt is None or b.shape != wt.shape:
+        raise RuntimeError(f"자막 PNG 읽기 실패: {on_black}")
+
+    bf = b.astype(np.float32)
+    alpha = 1.0 - (wt.astype(np.float32) - bf).mean(axis=2) / 255.0
+    alpha = np.clip(alpha, 0.0, 1.0)
+    color = np.where(alpha[..., None] > 0, bf / np.maximum(alpha[..., None], 1e-6), 0.0)
+
+    out = np.empty(b.shape[:2] + (4,), dtype=np.uint8)
+    out[..., :3] = np.clip(np.rint(color), 0, 255)
+    out[..., 3] = np.rint(alpha * 255.0)
+    return out
+
+
+def _crop_to_alpha(img: np.ndarray, out_png: Path) -> Optional[Tuple[int, int]]:
+    """
+    전체 캔버스 BGRA -> 알파가 있는 영역만 잘라서 저장
+
+    - overlay 면적이 작을수록 프레임당 합성 비용이 줄어듦
+    - 좌표는 yuv420 chroma 정렬을 위해 짝수로 내림
+    """
+    ys, xs = np.nonzero(img[..., 3])
+    if len(xs) == 0:
+        return None
+
+    x0, y0 = int(xs.min()) // 2 * 2, int(ys.min()) // 2 * 2
+    x1, y1 = int(xs.max()) + 1, int(ys.max()) + 1
+    # out_png가 캐시 hit을 하드링크한 파일일 수 있음 -> 제자리에 쓰면 캐시 PNG(같은 inode)까지 바뀜
+    out_png.unlink(missing_ok=True)
+    cv2.imwrite(str(out_png), img[y0:y1, x0:x1])
+    return x0, y0
+
+
+def rasterize_captions(specs: list[CaptionSpec], out_dir: Path, w: int, h: int) -> list[CaptionImage]:
+    """
+    자막 줄마다 drawtext를 "한 번만" 그려서 투명 PNG로 저장
+
+    - 기존 방식은 drawtext가 영상 전체 프레임마다 글리프 배치/테두리/그림자/박스를 다시 그림
+      (자막이 안 보이는 프레임에서도 enable 식을 매번 평가)
+    - 여기서는 같은 drawtext 스타일로 1프레임만 그리고 (검은/흰 배경 2장 -> _matte로 알파 복원)
+      글자 영역만 잘라서 overlay로 해당 구간에만 얹는다
+    - 캐시에 없는 줄만 모아서 FFmpeg 1번으로 렌더 (split -> drawtext -> 출력 2N개)
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = _caption_cache()
+
+    placed: list[Optional[Tuple[Path, int, int]]] = [None] * len(specs)
+    todo: list[int] = []
+    for i, spec in enumerate(specs):
+        png = out_dir / f"caption_{i:02d}.png"
+        if cache is not None:
+            key = _caption_key(spec, w, h)
+            hit = cache.get(key, ".png")
+            meta = cache.get(key, ".json", record=False) if hit else None
+            if hit and meta:
+                xy = json.loads(meta.read_text(encoding="utf-8"))
+                placed[i] = (link_or_copy(hit, png), int(xy["x"]), int(xy["y"]))
+                continue
+        todo.append(i)
+
+    if todo:
+        n = len(todo)
+        filters = []
+        for src, bg in ((0, "b"), (1, "w")):
+            filters.append(f"[{src}:v]format=rgb24,split={n}" + "".join(f"[{bg}{k}]" for k in range(n)))
+            for k, i in enumerate(todo):
+                filters.append(f"[{bg}{k}]{_drawtext_style(specs[i].text, specs[i].y_expr, (w, h))}[{bg}o{k}]")
+
+        cmd = [
+            FFMPEG_BIN, "-y",
+            "-f", "lavfi", "-i", f"color=c=black:s={w}x{h}:r=1:d=1",
+            "-f", "lavfi", "-i", f"color=c=white:s={w}x{h}:r=1:d=1",
+            "-filter_complex", ";".join(filters),
+        ]
+        raws = [
+            (out_dir / f"caption_{i:02d}_black.png", out_dir / f"caption_{i:02d}_white.png")
+            for i in todo
+        ]
+        for k, (on_black, on_white) in enumerate(raws):
+            cmd += ["-map", f"[bo{k}]", "-frames:v", "1", "-update", "1", str(on_black)]
+            cmd += ["-map", f"[wo{k}]", "-frames:v", "1", "-update", "1", str(on_white)]
+        _run(cmd)
+
+        for i, (on_black, on_white) in zip(todo, raws):
+            png = out_dir / f"caption_{i:02d}.png"
+            xy = _crop_to_alpha(_matte(on_black, on_white), png)
+            for raw in (on_black, on_white):
+                try:
+                    raw.unlink(missing_ok=True)
+                except Exception:
+                    pass
+            if xy is None:
+                continue
+            placed[i] = (png, xy[0], xy[1])
+
+            if cache is not None:
+                key = _caption_key(specs[i], w, h)
+                meta = out_dir / f"caption_{i:02d}.json"
+                meta.write_text(json.dumps({"x": xy[0], "y": xy[1]}), encoding="utf-8")
+                try:
+                    cache.put(key, png, ".png")
+                    cache.put(key, meta, ".json")
+                except Exception as e:
+                    logger.warning("자막 캐시 저장 실패(무시): %s", e)
+
+    return [
+        CaptionImage(p[0], p[1], p[2], spec.start, spec.end)
+        for spec, p in zip(specs, placed)
+        if p is not None
+    ]
+
+
+def _overlay_filters(in_label: str, captions: list[CaptionImage], first_idx: int, out_label: str) -> list[str]:
+    """
+    자막 PNG들을 overlay 체인으로 연결 (각 PNG는 입력 first_idx부터 순서대로)
+
+    - enable로 해당 줄 구간에서만 합성, 나머지 프레임은 그대로 통과
+    - PNG는 1프레임 입력이라 overlay 기본 eof_action=repeat로 계속 유지됨
+    """
+    if not captions:
+        return [f"[{in_label}]null[{out_label}]"]
+
+    filters: list[str] = []
+    prev = in_label
+    for k, cap in enumerate(captions):
+        label = out_label if k == len(captions) - 1 else f"{out_label}_cap{k}"
+        filters.append(
+            f"[{prev}][{first_idx + k}:v]"
+            f"overlay=x={cap.x}:y={cap.y}:"
+            f"enable='between(t,{cap.start:.2f},{cap.end:.2f})'"
+            f"[{label}]"
+        )
+        prev = label
+    return filters
+
+
+def _caption_renderer() -> str:
+    # raster: 자막을 PNG로 1번 그리고 overlay / drawtext: 프레임마다 drawtext (기존)
+    return (getattr(settings, "CAPTION_RENDERER", "raster") or "raster").strip().lower()
+
+
+def _raster_captions_or_none(
+    image_paths: list[Path],
+    lines: list[str],
+    timings: Optional[List[Tuple[float, float]]],
+    total: float,
+    out_dir: Path,
+    size: Optional[Tuple[int, int]] = None,
+) -> Optional[list[CaptionImage]]:
+    # 래스터 자막 준비. 설정이 drawtext거나 실패하면 None -> 호출측은 drawtext로 fallback
+    if _caption_renderer() != "raster":
+        return None
+    w, h = size or _video_dims()
+    try:
+        return rasterize_captions(_caption_specs(image_paths, lines, timings, total), out_dir, w, h)
+    except Exception as e:
+        logger.warning("자막 래스터화 실패 -> drawtext로 fallback: %s", e)
+        return None
+
+
+def burn_text_overlays(
+    in_video: Path,
+    image_paths: list[Path],
+    lines: list[str],
+    out_video: Path,
+    timings: Optional[List[Tuple[float, float]]] = None, 
+    opts: Optional[RenderOptions] = None,
+) -> Path:
+    """
+    libass 없이도 항상 동작하는 자막 burn-in
+
+    - timings가 있으면: 각 줄의 (start,end) 구간을 그대로 사용(싱크 개선)
+    - timings가 없으면: total/n 균등 분배
+    - CAPTION_RENDERER=raster(기본): 줄마다 PNG 1장 + overlay / drawtext: 프레임마다 drawtext
+    """
+    out_video.parent.mkdir(parents=True, exist_ok=True)
+    opts = opts or RenderOptions()
+
+    total = float(settings.VIDEO_SECONDS)
+
+    captions = _raster_captions_or_none(
+        image_paths, lines, timings, total, _per_size_dir(out_video.parent, "captions", opts), _dims(opts),
+    )
+    if captions:
+        cmd = [FFMPEG_BIN, "-y", "-i", str(in_video)]
+        for cap in captions:
+            cmd += ["-i", str(cap.path)]
+        cmd += [
+            "-filter_complex", ";".join(_overlay_filters("0:v", captions, 1, "vout")),
+            "-map", "[vout]",
+            "-map", "0:a?",
+            *encode_args(opts.profile),
+            "-c:a", "copy",
+            str(out_video),
+        ]
+        _run(cmd)
+        return out_video
+
+    draw_filters = [] if captions is not None else _drawtext_filters(image_paths, lines, timings, total, _dims(opts))
 
     if not draw_filters:
         cmd = [FFMPEG_BIN, "-y", "-i", str(in_video), "-c", "copy", str(out_video)]
@@ -272,6 +1196,7 @@ def burn_text_overlays(
         FFMPEG_BIN, "-y",
         "-i", str(in_video),
         "-vf", vf,
+        *encode_args(opts.profile),
         "-c:a", "copy",
         str(out_video),
     ]
@@ -280,17 +1205,76 @@ def burn_text_overlays(
 
 
 
+def _bgm_input_args(bgm_path: Path) -> list[str]:
+    # bed는 이미 영상 길이라 그대로, 원본 곡은 끝까지 반복 (atrim으로 자름)
+    if str(bgm_path).endswith(BGM_BED_SUFFIX):
+        return ["-i", str(bgm_path)]
+    return ["-stream_loop", "-1", "-i", str(bgm_path)]
+
+
+def _audio_filters(
+    voice_idx: Optional[int],
+    bgm_idx: Optional[int],
+    total: float,
+) -> list[str]:
+    """
+    voice/BGM 믹싱 필터 체인 (mix_audio / render_single_pass 공용)
+
+    - voice_idx/bgm_idx: ffmpeg 입력 인덱스 (없으면 None)
+    - 결과는 항상 [a_out] 라벨로 나옴
+    """
+    filter_parts: list[str] = []
+
+    # Voice chain
+    if voice_idx is not None:
+        filter_parts.append(
+            f"[{voice_idx}:a]"
+            f"volume=1.0,"
+            f"apad,"
+            f"atrim=0:{total},"
+            f"asetpts=N/SR/TB"
+            f"[a_voice]"
+        )
+
+    # BGM chain
+    if bgm_idx is not None:
+        filter_parts.append(
+            f"[{bgm_idx}:a]"
+            f"volume=0.22,"
+            f"atrim=0:{total},"
+            f"asetpts=N/SR/TB"
+            f"[a_bgm]"
+        )
+
+    # Mix / Ducking
+    if voice_idx is not None and bgm_idx is not None:
+        # 간단한 mix로 변경 (ducking 로직이 복잡해서 에러 가능성 높음)
+        # BGM 소리 줄이고 + Voice 합치기 (BGM 볼륨은 앞 단계에서 이미 0.22로 줄어있음)
+        filter_parts.append(
+            f"[a_voice][a_bgm]amix=inputs=2:duration=first:dropout_transition=2[a_out]"
+        )
+
+    elif voice_idx is not None:
+        filter_parts.append("[a_voice]anull[a_out]")
+
+    elif bgm_idx is not None:
+        filter_parts.append("[a_bgm]anull[a_out]")
+
+    return filter_parts
+
+
 def mix_audio(
     in_video: Path,
     voice_path: Optional[Path],
     bgm_path: Optional[Path],
     out_video: Path,
+    opts: Optional[RenderOptions] = None,
 ) -> Path:
     """
     최종 길이를 항상 settings.VIDEO_SECONDS로 고정 + voice/BGM 믹싱
 
     - voice가 짧아도: apad + atrim으로 total 길이 맞춤
-    - bgm은 loop 후 total로 자름
+    - bgm은 loop 후 total로 자름 (bgm_library의 bed면 이미 total 길이라 그대로)
     - 둘 다 있으면:
         1) voice 정리(볼륨 1.0, apad, trim)
         2) bgm 정리(볼륨 0.22로 낮춤, trim)
@@ -299,6 +1283,7 @@ def mix_audio(
     Note: 현재는 단순 amix 합성. 향후 sidechaincompress ducking 구현 가능.
     """
     out_video.parent.mkdir(parents=True, exist_ok=True)
+    opts = opts or RenderOptions()
 
     total = float(settings.VIDEO_SECONDS)
     cmd = [FFMPEG_BIN, "-y", "-i", str(in_video)]
@@ -312,68 +1297,165 @@ def mix_audio(
         _run(cmd)
         return out_video
 
-    filter_parts: list[str] = []
     idx = 1  # 0은 video 입력
+    voice_idx = bgm_idx = None
 
-    # Voice chain
     if has_voice:
         cmd += ["-i", str(voice_path)]
-        # idx가 1인지 확인
         logger.info("DEBUG: voice input index = %d, path=%s", idx, voice_path)
-        
-        filter_parts.append(
-            f"[{idx}:a]"
-            f"volume=1.0,"
-            f"apad,"
-            f"atrim=0:{total},"
-            f"asetpts=N/SR/TB"
-            f"[a_voice]"
-        )
+        voice_idx = idx
         idx += 1
 
-    # BGM chain
     if has_bgm:
-        cmd += ["-stream_loop", "-1", "-i", str(bgm_path)]
+        cmd += _bgm_input_args(bgm_path)
         logger.info("DEBUG: bgm input index = %d, path=%s", idx, bgm_path)
-        
-        filter_parts.append(
-            f"[{idx}:a]"
-            f"volume=0.22,"
-            f"atrim=0:{total},"
-            f"asetpts=N/SR/TB"
-            f"[a_bgm]"
-        )
+        bgm_idx = idx
         idx += 1
 
-    # Mix / Ducking
-    if has_voice and has_bgm:
-        # 간단한 mix로 변경 (ducking 로직이 복잡해서 에러 가능성 높음)
-        # BGM 소리 줄이고 + Voice 합치기
-        # 간단한 mix로 변경 (ducking 로직이 복잡해서 에러 가능성 높음)
-        # BGM 소리 줄이고 + Voice 합치기 (BGM 볼륨은 앞 단계에서 이미 0.22로 줄어있음)
-        filter_parts.append(
-            f"[a_voice][a_bgm]amix=inputs=2:duration=first:dropout_transition=2[a_out]"
-        )
-
-    elif has_voice and not has_bgm:
-        filter_parts.append("[a_voice]anull[a_out]")
-
-    elif has_bgm and not has_voice:
-        filter_parts.append("[a_bgm]anull[a_out]")
-
     # 디버깅용 로그
-    full_filter = ";".join(filter_parts)
+    full_filter = ";".join(_audio_filters(voice_idx, bgm_idx, total))
     logger.info("DEBUG: mix_audio filter_complex=%s", full_filter)
 
     cmd += [
         "-filter_complex", full_filter,
         "-map", "0:v:0",
         "-map", "[a_out]",
-        "-c:v", "libx264",
-        "-pix_fmt", "yuv420p",
+        *encode_args(opts.profile),
         "-movflags", "+faststart",
         "-t", str(total),
         str(out_video),
     ]
     _run(cmd)
     return out_video
+
+
+def render_single_pass(
+    images: list[Path],
+    lines: list[str],
+    out_video: Path,
+    voice_path: Optional[Path] = None,
+    bgm_path: Optional[Path] = None,
+    timings: Optional[List[Tuple[float, float]]] = None,
+    opts: Optional[RenderOptions] = None,
+) -> Path:
+    """
+    build_slideshow + burn_text_overlays + mix_audio를 FFmpeg 1회로 합친 렌더
+
+    - 3단계 경로는 H.264 인코딩 3번 + 디코딩 2번
+    - 여기서는 zoompan/concat -> 자막(overlay 또는 drawtext) -> amix를 filter_complex 하나로 묶어서 인코딩 1번
+    - 필터 문자열은 3단계 경로와 같은 헬퍼를 쓰므로 결과물 모양은 동일
+    - SLIDESHOW_RENDERER=parallel이면 컷은 병렬로 미리 인코딩하고 여기서는 자막/오디오만 합성
+    """
+    opts = opts or RenderOptions()
+    targets = [(rendition_for_size(*_dims(opts)), out_video)]
+    return render_renditions(images, lines, targets, voice_path, bgm_path, timings, opts)[0]
+
+
+def render_renditions(
+    images: list[Path],
+    lines: list[str],
+    targets: list[Tuple[Rendition, Path]],
+    voice_path: Optional[Path] = None,
+    bgm_path: Optional[Path] = None,
+    timings: Optional[List[Tuple[float, float]]] = None,
+    opts: Optional[RenderOptions] = None,
+) -> list[Path]:
+    """
+    render_single_pass의 여러 화면비 버전 (FFmpeg 1회 -> 출력 N개)
+
+    - 이미지 디코딩 1번 -> split -> 렌디션마다 컷 체인/자막 -> 각자 인코딩
+    - 나레이션/BGM 믹스도 1번만 하고 asplit으로 나눠서 모든 렌디션이 같은 오디오/자막 타이밍을 씀
+    - 자막 PNG는 크기별로 따로 래스터화 (y 위치가 화면 높이 비율이라)
+    - 렌디션이 1개면 split/asplit 없이 기존 single pass 그래프와 동일
+    """
+    opts = opts or RenderOptions()
+    for _r, out in targets:
+        out.parent.mkdir(parents=True, exist_ok=True)
+    work_dir = targets[0][1].parent
+
+    total = float(settings.VIDEO_SECONDS)
+    fps = _fps(opts)
+    n = max(1, len(images))
+    per = total / n
+    k = len(targets)
+    sized = [replace(opts, size=(r.w, r.h)) for r, _ in targets]
+
+    def _label(base: str, r: int) -> str:
+        return base if k == 1 else f"{base}{r}"
+
+    # parallel이면 컷은 병렬로 미리 렌더하고, 여기서는 concat demuxer로 받아서 자막/오디오만 얹음
+    parallel = _slideshow_renderer() == "parallel"
+
+    cmd = [FFMPEG_BIN, "-y"]
+    if parallel:
+        for o in sized:
+            list_path = render_cut_segments(images, _per_size_dir(work_dir, "segments", o), fps=fps, opts=o)
+            cmd += ["-f", "concat", "-safe", "0", "-i", str(list_path)]
+        idx = k  # 0..k-1은 렌디션별 컷 목록
+    else:
+        input_args = get_motion_engine().input_args(per, fps)
+        for img in images:
+            cmd += [*input_args, "-i", str(img)]
+        idx = n  # 0..n-1은 이미지 입력
+
+    has_voice = bool(voice_path and Path(voice_path).exists())
+    has_bgm = bool(bgm_path and Path(bgm_path).exists())
+
+    voice_idx = bgm_idx = None
+    if has_voice:
+        cmd += ["-i", str(voice_path)]
+        voice_idx = idx
+        idx += 1
+    if has_bgm:
+        cmd += _bgm_input_args(bgm_path)
+        bgm_idx = idx
+        idx += 1
+
+    if parallel:
+        filters = [f"[{r}:v]setpts=PTS-STARTPTS[{_label('vslide', r)}]" for r in range(k)]
+    else:
+        filters = _multi_slideshow_filters(
+            n, per, [(r.w, r.h) for r, _ in targets], fps, [_label("vslide", r) for r in range(k)],
+            normalized=opts.normalized, graded=opts.graded,
+        )
+
+    # 자막: 렌디션마다 PNG 입력(CAPTION_RENDERER=raster) 또는 drawtext
+    for r, o in enumerate(sized):
+        vslide, vout = _label("vslide", r), _label("vout", r)
+        captions = _raster_captions_or_none(
+            images, lines, timings, total, _per_size_dir(work_dir, "captions", o), _dims(o),
+        )
+        for cap in captions or []:
+            cmd += ["-i", str(cap.path)]
+
+        if captions is not None:
+            filters += _overlay_filters(vslide, captions, idx, vout)
+            idx += len(captions)
+        else:
+            draw_filters = _drawtext_filters(images, lines, timings, total, _dims(o))
+            if draw_filters:
+                filters.append(f"[{vslide}]" + ",".join(draw_filters) + f"[{vout}]")
+            else:
+                filters.append(f"[{vslide}]null[{vout}]")
+
+    has_audio = voice_idx is not None or bgm_idx is not None
+    filters += _audio_filters(voice_idx, bgm_idx, total)
+    if has_audio and k > 1:
+        filters.append(f"[a_out]asplit={k}" + "".join(f"[a_out{r}]" for r in range(k)))
+
+    full_filter = ";".join(filters)
+    logger.info("DEBUG: render_single_pass filter_complex=%s", full_filter)
+
+    cmd += ["-filter_complex", full_filter]
+    for r, (_rend, out) in enumerate(targets):
+        cmd += ["-map", f"[{_label('vout', r)}]"]
+        if has_audio:
+            cmd += ["-map", f"[{_label('a_out', r)}]"]
+        cmd += [
+            *encode_args(opts.profile),
+            "-movflags", "+faststart",
+            "-t", str(total),
+            str(out),
+        ]
+    _run(cmd)
+    return [out for _r, out in targets]
@@ -1,21 +1,285 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Optional, List
 from fastapi import UploadFile, HTTPException
 
+from backend.app.core import executors, progress
+from backend.app.core.config import settings
 from backend.app.core.logger import get_logger
 from backend.app.schemas import GenerateResponse
-from backend.app.services.storage import make_job_dir, public_video_path
+from backend.app.services.storage import (
+    make_job_dir,
+    open_job_dir,
+    public_video_path,
+    load_job_state,
+    save_job_state,
+)
+from backend.app.services import bgm_library
+from backend.app.services.disk_cache import make_key
+from backend.app.services.caption_placement import pick_anchors_for_images
 from backend.app.services.llm import generate_copy
 from backend.app.services.tts import synthesize_voice_lines
+from backend.app.services.ingest import normalize_images
+from backend.app.services.hls import package_hls
 from backend.app.services.video import (
-    build_slideshow,
+    build_slideshow_renditions,
     burn_text_overlays,
     mix_audio,
+    render_renditions,
+    rendition_path,
+    rendition_for_size,
+    parse_aspects,
+    Rendition,
+    RenderOptions,
+    get_encode_profile,
 )
 from backend.app.utils.video_utils import project_root, normalize_for_tts, safe_segments
 
 logger = get_logger(__name__)
 
+
+def _render_three_step(
+    image_paths: list[Path],
+    lines: list[str],
+    timings,
+    voice_path: Optional[Path],
+    bgm_path: Optional[Path],
+    artifacts_dir: Path,
+    targets: list[tuple[Rendition, Path]],
+    opts: RenderOptions,
+) -> list[Path]:
+    # 기존 경로: 슬라이드쇼 -> 자막 burn-in -> 오디오 믹스 (인코딩 3회)
+    # 슬라이드쇼는 화면비 전부 그래프 1개로, 자막/믹스는 렌디션마다
+    silents = build_slideshow_renditions(
+        image_paths,
+        [(r, rendition_path(artifacts_dir / "silent.mp4", r, i == 0)) for i, (r, _) in enumerate(targets)],
+        opts,
+    )
+    outs: list[Path] = []
+    for i, ((r, dst), silent_video) in enumerate(zip(targets, silents)):
+        sized = replace(opts, size=(r.w, r.h))
+        sub_video = burn_text_overlays(
+            in_video=silent_video,
+            image_paths=image_paths,
+            lines=lines,
+            out_video=rendition_path(artifacts_dir / "subtitled.mp4", r, i == 0),
+            timings=timings,
+            opts=sized,
+        )
+        outs.append(mix_audio(sub_video, voice_path, bgm_path, dst, sized))
+    return outs
+
+
+def _render_final(
+    image_paths: list[Path],
+    lines: list[str],
+    timings,
+    voice_path: Optional[Path],
+    bgm_path: Optional[Path],
+    artifacts_dir: Path,
+    targets: list[tuple[Rendition, Path]],
+    opts: RenderOptions,
+) -> list[Path]:
+    """
+    settings.RENDER_MODE에 따라 최종 영상 렌더 (targets 화면비 전부, 순서대로 경로 리턴)
+
+    - single_pass: FFmpeg 1회 렌더, 실패하면 three_step으로 fallback
+    - 경로별 wall time은 로그 + artifacts/render_report.json에 남김
+    - RENDER_COMPARE=True면 나머지 경로도 compare_*.mp4로 돌려서 비교
+    """
+    mode = (settings.RENDER_MODE or "single_pass").strip().lower()
+    wall: dict[str, float] = {}
+    used = None
+
+    def _single_pass(dsts: list[tuple[Rendition, Path]]) -> list[Path]:
+        return render_renditions(image_paths, lines, dsts, voice_path, bgm_path, timings, opts)
+
+    def _three_step(dsts: list[tuple[Rendition, Path]]) -> list[Path]:
+        return _render_three_step(image_paths, lines, timings, voice_path, bgm_path, artifacts_dir, dsts, opts)
+
+    paths = {"single_pass": _single_pass, "three_step": _three_step}
+    order = ["single_pass", "three_step"] if mode == "single_pass" else ["three_step"]
+
+    final_paths = None
+    for name in order:
+        t0 = time.perf_counter()
+        try:
+            final_paths = paths[name](targets)
+            used = name
+        except Exception as e:
+            logger.warning("RENDER %s 실패 -> fallback: %s", name, e)
+        finally:
+            wall[name] = round(time.perf_counter() - t0, 3)
+        if final_paths is not None:
+            break
+
+    if final_paths is None:
+        raise RuntimeError("렌더링 실패 (single_pass/three_step 모두 실패)")
+
+    if settings.RENDER_COMPARE:
+        for name, fn in paths.items():
+            if name in wall:
+                continue
+            t0 = time.perf_counter()
+            try:
+                fn([
+                    (r, rendition_path(artifacts_dir / f"compare_{name}.mp4", r, i == 0))
+                    for i, (r, _) in enumerate(targets)
+                ])
+            except Exception as e:
+                logger.warning("RENDER compare %s 실패: %s", name, e)
+            wall[name] = round(time.perf_counter() - t0, 3)
+
+    aspects = [r.aspect for r, _ in targets]
+    logger.info("RENDER | mode=%s used=%s profile=%s aspects=%s wall=%s", mode, used, opts.profile, aspects, wall)
+    report = {"mode": mode, "used": used, "profile": opts.profile, "aspects": aspects, "wall_sec": wall}
+    (artifacts_dir / "render_report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return final_paths
+
+
+@dataclass
+class SharedAssets:
+    """
+    배치 생성(/api/generate-batch)에서 아이템끼리 같이 쓰는 준비물
+
+    - image_paths: 컷 수만큼 늘어놓은 (정규화된) 이미지 -> 디코딩/정규화/자막 위치 분석은 배치당 1번
+    - bgm_path: 선택된 BGM (없으면 None)
+    """
+    image_paths: List[Path]
+    render_opts: RenderOptions
+    profile: str
+    renditions: List[Rendition]
+    bgm_path: Optional[Path] = None
+
+
+class StoredUpload:
+    """디스크에 저장해 둔 업로드 파일 (generate_video가 쓰는 UploadFile의 filename/read()만 흉내)"""
+
+    def __init__(self, path: Path, filename: str):
+        self.path = path
+        self.filename = filename
+
+    async def read(self) -> bytes:
+        return self.path.read_bytes()
+
+
+async def save_uploads(images: list, inputs_dir: Path) -> list[Path]:
+    # 업로드 이미지를 inputs/img_N.ext로 저장 (비동기 job이 이미 저장해 둔 StoredUpload는 그 파일 그대로)
+    img_paths: list[Path] = []
+    for i, uf in enumerate(images, start=1):
+        if isinstance(uf, StoredUpload):
+            img_paths.append(uf.path)
+            continue
+        suffix = Path(uf.filename).suffix.lower() or ".jpg"
+        save_path = inputs_dir / f"img_{i}{suffix}"
+        save_path.write_bytes(await uf.read())
+        img_paths.append(save_path)
+    return img_paths
+
+
+async def ingest_images(
+    img_paths: list[Path],
+    renditions: list[Rendition],
+    profile: str,
+    out_dir: Path,
+    preview: bool = False,
+) -> tuple[list[Path], RenderOptions]:
+    """
+    저장된 이미지 -> (컷 수만큼의 렌더 입력 이미지, RenderOptions)
+
+    - 쇼츠 템포용 컷 수(safe_segments)만큼 이미지를 돌려가며 배치
+    - 이미지 정규화 (1장당 1번 디코딩 + 회전/리사이즈/색보정), 결과는 out_dir/normalized
+    - 화면비가 여러 개면 패딩 없이 가장 큰 렌디션 박스로 축소 + 색보정만 (패딩은 렌디션마다)
+    """
+    target_cuts = safe_segments()
+    image_paths_for_video = [img_paths[i % len(img_paths)] for i in range(target_cuts)]
+
+    multi = len(renditions) > 1
+    if multi:
+        size = (max(r.w for r in renditions), max(r.h for r in renditions))
+    else:
+        size = (renditions[0].w, renditions[0].h)
+    # 블로킹 작업은 전부 executors 풀에서 -> 이벤트 루프는 다른 요청 처리
+    normalized_paths = await executors.run_in(
+        "cpu", normalize_images, image_paths_for_video, out_dir / "normalized", size, pad=not multi,
+    )
+    if normalized_paths is not None:
+        image_paths_for_video = normalized_paths
+    prepared = normalized_paths is not None
+    render_opts = RenderOptions(
+        normalized=prepared and not multi,
+        graded=prepared and multi,
+        profile=profile,
+        size=size if not multi else None,
+        fps=settings.PREVIEW_FPS if preview else None,
+    )
+    return image_paths_for_video, render_opts
+
+
+async def select_bgm(use_bgm: bool, bgm_file, out_dir: Path) -> Optional[Path]:
+    """
+    사용자가 업로드한 BGM이 있으면 우선, 없으면 assets/bgm의 기본 BGM
+
+    - 둘 다 bgm_library의 bed(loudness 정규화 + 영상 길이로 loop/trim)로 바꿔서 돌려줌
+    - 업로드 BGM은 내용 해시로 캐시 -> 같은 파일을 다시 올리면 FFmpeg 없이 재사용
+    - bed는 out_dir에 link_or_copy된 경로 (캐시 eviction과 상관없이 렌더 끝까지 유지)
+    """
+    if not use_bgm:
+        return None
+    if isinstance(bgm_file, StoredUpload):
+        # 비동기 job: inputs/에 저장해 둔 파일을 그대로
+        logger.info("Using custom BGM: %s", bgm_file.path)
+        return await executors.run_in("media", bgm_library.bed_for, bgm_file.path, out_dir)
+    if bgm_file and bgm_file.filename:
+        suffix = Path(bgm_file.filename).suffix.lower() or ".mp3"
+        custom_bgm_path = out_dir / f"custom_bgm{suffix}"
+        custom_bgm_path.write_bytes(await bgm_file.read())
+        logger.info("Using custom BGM: %s", custom_bgm_path)
+        return await executors.run_in("media", bgm_library.bed_for, custom_bgm_path, out_dir)
+    return await executors.run_in("media", bgm_library.get_library().default_bed, out_dir)
+
+
+def validate_request(
+    images: list,
+    menu_name: Optional[str],
+    profile: Optional[str] = None,
+    aspects: Optional[str] = None,
+    preview: bool = False,
+) -> tuple[str, list[Rendition]]:
+    """
+    요청 값 검증 -> (인코딩 프로필, 렌디션 목록), 잘못되면 HTTPException(400)
+
+    - 비동기 job 큐도 큐에 넣기 전에 같은 검증을 함 (잘못된 요청이 대기열을 차지하지 않게)
+    """
+    if len(images) < 1:
+        raise HTTPException(400, "이미지를 1장 이상 업로드해주세요.")
+    if not (menu_name or "").strip():
+        raise HTTPException(400, "메뉴 이름은 필수입니다.")
+
+    profile = (profile or "").strip().lower() or settings.ENCODE_PROFILE
+    try:
+        get_encode_profile(profile)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    # 출력 화면비 목록 (비우면 settings.VIDEO_ASPECTS -> VIDEO_SIZE 1개)
+    #  미리보기는 PREVIEW_SIZE 1개만
+    try:
+        if preview:
+            pw, ph = (int(x) for x in settings.PREVIEW_SIZE.split("x"))
+            renditions = [rendition_for_size(pw, ph)]
+            profile = settings.PREVIEW_PROFILE
+        else:
+            renditions = parse_aspects((aspects or "").strip() or None)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return profile, renditions
+
+
+@progress.tracked
 async def generate_video(
     images: list[UploadFile],
     menu_name: str,
@@ -28,12 +292,30 @@ async def generate_video(
     use_tts: bool = True,
     use_bgm: bool = True,
     bgm_file: Optional[UploadFile] = None,
+    profile: Optional[str] = None,
+    aspects: Optional[str] = None,
+    hls: bool = False,
+    job_id: Optional[str] = None,
+    preview: bool = False,
+    shared: Optional[SharedAssets] = None,
+    fresh_copy: bool = False,
 ) -> GenerateResponse:
+    """
+    이미지 + 가게 정보 -> 카피(LLM) -> 나레이션(TTS) -> 영상
+
+    - job_id: 기존 job(미리보기 등)을 이어서 씀. 카피 입력이 같으면 LLM/TTS 결과를 job.json에서 재사용
+    - preview=True: PREVIEW_SIZE/PREVIEW_FPS/PREVIEW_PROFILE로 저해상도 초안만 (artifacts/preview/)
+    - shared: 배치에서 미리 준비한 이미지/BGM (images/bgm_file/profile/aspects 대신 사용)
+    - fresh_copy=True: job.json/LLM 캐시의 카피를 쓰지 않고 새 버전 생성
+    - 진행 이벤트(ingest/llm/tts/render/package)는 /api/jobs/{job_id}/events로 나감
+    """
     # 0) 입력 검증
-    if len(images) < 1:
-        raise HTTPException(400, "이미지를 1장 이상 업로드해주세요.")
-    if not (menu_name or "").strip():
-        raise HTTPException(400, "메뉴 이름은 필수입니다.")
+    if shared is None:
+        profile, renditions = validate_request(images, menu_name, profile, aspects, preview)
+    else:
+        if not (menu_name or "").strip():
+            raise HTTPException(400, "메뉴 이름은 필수입니다.")
+        profile, renditions = shared.profile, shared.renditions
 
     menu_name = menu_name.strip()
     store_name = (store_name or "").strip() or None
@@ -44,83 +326,102 @@ async def generate_video(
     benefit = (benefit or "").strip() or None
     cta = (cta or "").strip() or None
 
-    # 1) 작업 디렉토리 생성
-    job_dir = make_job_dir()
+    # 1) 작업 디렉토리 생성 (job_id가 있으면 기존 job 이어서)
+    job_dir = None
+    if (job_id or "").strip():
+        job_dir = open_job_dir(job_id)
+        if job_dir is None:
+            raise HTTPException(404, f"job을 찾을 수 없습니다: {job_id}")
+    job_dir = job_dir or make_job_dir()
     inputs_dir = job_dir / "inputs"
     artifacts_dir = job_dir / "artifacts"
+    # 미리보기 산출물은 본 렌더와 섞이지 않게 하위 디렉토리로
+    render_dir = artifacts_dir / "preview" if preview else artifacts_dir
+    render_dir.mkdir(parents=True, exist_ok=True)
+    state = load_job_state(job_dir)
+    progress.bind(job_dir.name)
 
-    # 2) 이미지 저장
-    img_paths: list[Path] = []
-    for i, uf in enumerate(images, start=1):
-        suffix = Path(uf.filename).suffix.lower() or ".jpg"
-        save_path = inputs_dir / f"img_{i}{suffix}"
-        save_path.write_bytes(await uf.read())
-        img_paths.append(save_path)
+    progress.stage("ingest", preview=preview, reused=shared is not None)
 
-    # 3) 쇼츠 템포용 컷 수 확정
+    # 2) 이미지 저장 -> 3) 컷 배치 + 정규화 (배치 아이템이면 이미 준비된 것 사용)
     target_cuts = safe_segments()
-    image_paths_for_video = [img_paths[i % len(img_paths)] for i in range(target_cuts)]
+    if shared is None:
+        img_paths = await save_uploads(images, inputs_dir)
+        image_paths_for_video, render_opts = await ingest_images(img_paths, renditions, profile, render_dir, preview)
+        # 3-1) 자막 위치 분석(OpenCV)은 LLM/TTS를 기다리는 동안 cpu 풀에서 미리 (렌더에서는 memo hit)
+        #      자막 위치 판단도 실제 화면과 같은 정규화 이미지를 기준으로 함
+        anchors_task = asyncio.create_task(executors.run_in("cpu", pick_anchors_for_images, image_paths_for_video))
+    else:
+        image_paths_for_video, render_opts = list(shared.image_paths), shared.render_opts
+        anchors_task = None
 
-    # 4) LLM 카피 생성
-    llm_out = generate_copy(
-        menu_name=menu_name,
-        store_name=store_name,
-        tone=tone,
-        n_lines=target_cuts,
-        price=price,
-        location=location,
-        benefit=benefit,
-        cta=cta,
-    )
+    # 4) LLM 카피 생성 (같은 job + 같은 입력이면 job.json의 카피 재사용)
+    copy_key = make_key("copy-v1", menu_name, store_name, tone, price, location, benefit, cta, target_cuts)
+    copy = state.get("copy") if state.get("copy_key") == copy_key and not fresh_copy else None
+    progress.stage("llm", reused=copy is not None)
+    if copy is not None:
+        logger.info("카피 재사용 (job=%s)", job_dir.name)
+    else:
+        llm_out = await executors.run_in(
+            "io",
+            generate_copy,
+            menu_name=menu_name,
+            store_name=store_name,
+            tone=tone,
+            n_lines=target_cuts,
+            price=price,
+            location=location,
+            benefit=benefit,
+            cta=cta,
+            fresh=fresh_copy,
+        )
+
+        caption_lines = (llm_out.caption_lines or [])[:target_cuts]
+        if len(caption_lines) < target_cuts:
+            caption_lines += [""] * (target_cuts - len(caption_lines))
 
-    caption_lines = (llm_out.caption_lines or [])[:target_cuts]
-    if len(caption_lines) < target_cuts:
-        caption_lines += [""] * (target_cuts - len(caption_lines))
+        caption_lines_clean = [normalize_for_tts(s) for s in caption_lines if s and s.strip()]
 
-    caption_lines_clean = [normalize_for_tts(s) for s in caption_lines if s and s.strip()]
+        if not caption_lines_clean:
+            fallback = normalize_for_tts(llm_out.promo_text) if getattr(llm_out, "promo_text", "") else ""
+            caption_lines_clean = [fallback] if fallback else ["지금 바로 방문해보세요!"]
 
-    if not caption_lines_clean:
-        fallback = normalize_for_tts(llm_out.promo_text) if getattr(llm_out, "promo_text", "") else ""
-        caption_lines_clean = [fallback] if fallback else ["지금 바로 방문해보세요!"]
+        copy = {"lines": caption_lines_clean, "hashtags": list(llm_out.hashtags or [])}
+        # 카피가 바뀌면 이전 나레이션도 무효
+        state = {"copy_key": copy_key, "copy": copy}
+        save_job_state(job_dir, state)
 
+    caption_lines_clean = list(copy["lines"])
+    hashtags = list(copy.get("hashtags") or [])
     tts_text = "\n".join(caption_lines_clean)
 
-    # 5) TTS (조건부)
+    # 5) TTS (조건부, 같은 카피로 만든 나레이션이 있으면 재사용)
     voice_path = None
     timings = None
     if use_tts:
-        voice_path, timings = synthesize_voice_lines(
-            caption_lines_clean,
-            artifacts_dir / "voice_parts",
-        )
-
-    # 6) 슬라이드쇼(무음) 생성
-    silent_video = build_slideshow(image_paths_for_video, artifacts_dir / "silent.mp4")
-
-    # 7) drawtext로 자막 burn-in
-    sub_video = burn_text_overlays(
-        in_video=silent_video,
-        image_paths=image_paths_for_video,
-        lines=caption_lines_clean,
-        out_video=artifacts_dir / "subtitled.mp4",
-        timings=timings,
-    )
-
-    # 8) BGM 선택 (조건부)
-    bgm_path = None
-    if use_bgm:
-        # 사용자가 업로드한 BGM이 있으면 우선 사용
-        if bgm_file and bgm_file.filename:
-            suffix = Path(bgm_file.filename).suffix.lower() or ".mp3"
-            custom_bgm_path = artifacts_dir / f"custom_bgm{suffix}"
-            custom_bgm_path.write_bytes(await bgm_file.read())
-            bgm_path = custom_bgm_path
-            logger.info("Using custom BGM: %s", bgm_path)
+        voice = state.get("voice")
+        progress.stage("tts", reused=bool(voice), lines=len(caption_lines_clean))
+        if voice and Path(voice["path"]).exists():
+            logger.info("나레이션 재사용 (job=%s)", job_dir.name)
+            voice_path = Path(voice["path"])
+            timings = [tuple(t) for t in voice["timings"]]
         else:
-            # 기본 BGM 사용
-            bgm_dir = project_root() / "assets" / "bgm"
-            bgm_candidates = list(bgm_dir.glob("*.mp3")) + list(bgm_dir.glob("*.wav"))
-            bgm_path = bgm_candidates[0] if bgm_candidates else None
+            voice_path, timings = await executors.run_in(
+                "io",
+                synthesize_voice_lines,
+                caption_lines_clean,
+                artifacts_dir / "voice_parts",
+            )
+            # 전부 실패한 무음 결과는 저장 안 함 (다음 렌더에서 다시 시도)
+            if timings:
+                state["voice"] = {"path": str(voice_path), "timings": [list(t) for t in timings]}
+                save_job_state(job_dir, state)
+
+    # 6) BGM 선택 (조건부)
+    if shared is not None:
+        bgm_path = shared.bgm_path if use_bgm else None
+    else:
+        bgm_path = await select_bgm(use_bgm, bgm_file, artifacts_dir)
 
     logger.info(
         "AUDIO DEBUG | use_tts=%s voice_path=%s | use_bgm=%s bgm_path=%s",
@@ -128,16 +429,56 @@ async def generate_video(
         use_bgm, bgm_path,
     )
 
-    # 9) 오디오 믹스
-    final_path = mix_audio(sub_video, voice_path, bgm_path, public_video_path(job_dir))
+    # 7) 슬라이드쇼 + 자막 + 오디오 믹스 (RENDER_MODE에 따라 1회 또는 3단계)
+    #    화면비가 여러 개면 같은 나레이션/자막 타이밍으로 final.mp4, final_1x1.mp4 ...
+    progress.stage("render", aspects=[r.aspect for r in renditions])
+    final_out = render_dir / "preview.mp4" if preview else public_video_path(job_dir)
+    targets = [(r, rendition_path(final_out, r, i == 0)) for i, r in enumerate(renditions)]
+    if anchors_task is not None:
+        try:
+            await anchors_task
+        except Exception as e:
+            logger.warning("자막 위치 미리 분석 실패(렌더에서 다시 계산): %s", e)
+
+    final_paths = await executors.run_in(
+        "media",
+        _render_final,
+        image_paths=image_paths_for_video,
+        lines=caption_lines_clean,
+        timings=timings,
+        voice_path=voice_path,
+        bgm_path=bgm_path,
+        artifacts_dir=render_dir,
+        targets=targets,
+        opts=render_opts,
+    )
 
-    # 10) 결과 반환
+    # 7-1) HLS 패키징 (선택) - 첫 번째 화면비만, 실패해도 mp4 결과는 그대로 반환
     job_id = job_dir.name
-    video_url = f"/outputs/{job_id}/artifacts/final.mp4"
+    playlist_url = None
+    if (hls or settings.HLS_ENABLED) and not preview:
+        primary = renditions[0]
+        has_audio = any(p is not None and Path(p).exists() for p in (voice_path, bgm_path))
+        progress.stage("package", format="hls")
+        try:
+            await executors.run_in(
+                "media", package_hls, final_paths[0], artifacts_dir / "hls", (primary.w, primary.h), has_audio, profile,
+                render_opts.fps,
+            )
+            playlist_url = f"/outputs/{job_id}/artifacts/hls/master.m3u8"
+        except Exception as e:
+            logger.warning("HLS 패키징 실패(무시, mp4만 반환): %s", e)
+
+    # 8) 결과 반환
+    url_base = f"/outputs/{job_id}/artifacts" + ("/preview" if preview else "")
+    urls = {r.aspect: f"{url_base}/{p.name}" for (r, _), p in zip(targets, final_paths)}
+    video_url = urls[renditions[0].aspect]
 
     return GenerateResponse(
         job_id=job_id,
         video_url=video_url,
         caption_text=tts_text,
-        hashtags=llm_out.hashtags,
+        hashtags=hashtags,
+        renditions=urls,
+        playlist_url=playlist_url,
     )
@@ -0,0 +1,70 @@
+"""
+인코딩 프로필 벤치마크 (encode time vs output size)
+
+실행
+    python -m benchmarks.encode_bench                        # 합성 이미지 6장으로 슬라이드쇼
+    python -m benchmarks.encode_bench --images a.jpg b.jpg   # 실제 사진 사용
+    python -m benchmarks.encode_bench --profiles draft,balanced --repeat 2
+
+출력: 프로필별 평균 인코딩 시간 / 결과 파일 크기 / 평균 비트레이트
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services import video  # noqa: E402
+from benchmarks.motion_bench import _synthetic_image  # noqa: E402
+
+
+def bench(profiles: list[str], images: list[Path], repeat: int, normalized: bool) -> list[dict]:
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in profiles:
+            times = []
+            size = 0
+            for r in range(repeat):
+                out = Path(tmp) / f"{name}_{r}" / "slideshow.mp4"
+                opts = video.RenderOptions(normalized=normalized, profile=name)
+                t0 = time.perf_counter()
+                video.build_slideshow(images, out, opts)
+                times.append(time.perf_counter() - t0)
+                size = out.stat().st_size
+            avg = sum(times) / len(times)
+            kbps = size * 8 / 1000 / float(settings.VIDEO_SECONDS)
+            rows.append({"profile": name, "avg_sec": avg, "size_mb": size / (1 << 20), "kbps": kbps})
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="encode profile benchmark")
+    ap.add_argument("--images", type=Path, nargs="*", default=None)
+    ap.add_argument("--profiles", default=",".join(settings.ENCODE_PROFILES))
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images = args.images
+        if not images:
+            w, h = video._video_dims()
+            images = [_synthetic_image(Path(tmp) / f"bench_{i}.png", w, h) for i in range(6)]
+        # 합성 이미지는 VIDEO_SIZE 그대로라 정규화된 still과 같은 조건
+        rows = bench(profiles, images, args.repeat, normalized=not args.images)
+
+    print(f"{'profile':<12}{'avg_sec':>10}{'size_mb':>10}{'kbps':>10}")
+    for r in rows:
+        print(f"{r['profile']:<12}{r['avg_sec']:>10.2f}{r['size_mb']:>10.2f}{r['kbps']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+모션 엔진 벤치마크 (컷 1개 렌더 fps 비교)
+
+실행
+    python -m benchmarks.motion_bench                 # 합성 테스트 이미지 사용
+    python -m benchmarks.motion_bench --image a.jpg   # 실제 사진 사용
+    python -m benchmarks.motion_bench --engines zoompan,cropscale --repeat 3
+
+출력: 엔진별 평균 wall time / 렌더 fps (프레임 수 / 초)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services import video  # noqa: E402
+from backend.app.services.motion import available_engines  # noqa: E402
+
+
+def _synthetic_image(path: Path, w: int, h: int) -> Path:
+    # 디테일이 있는 그라디언트 + 노이즈 (완전 단색이면 인코더가 너무 쉬워서 비교가 안 됨)
+    yy, xx = np.mgrid[0:h, 0:w]
+    img = np.stack([(xx * 255 // w), (yy * 255 // h), ((xx + yy) * 255 // (w + h))], axis=-1)
+    noise = np.random.default_rng(0).integers(0, 40, size=img.shape)
+    cv2.imwrite(str(path), np.clip(img + noise, 0, 255).astype(np.uint8))
+    return path
+
+
+def bench(engines: list[str], image: Path, per: float, fps: int, repeat: int, normalized: bool) -> list[dict]:
+    w, h = video._video_dims()
+    frames = max(1, int(per * fps))
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in engines:
+            settings.MOTION_ENGINE = name
+            times = []
+            for r in range(repeat):
+                out = Path(tmp) / f"{name}_{r}.mp4"
+                t0 = time.perf_counter()
+                video._render_cut(image, 0, per, w, h, fps, out, threads=0, opts=video.RenderOptions(normalized=normalized))
+                times.append(time.perf_counter() - t0)
+            avg = sum(times) / len(times)
+            rows.append({"engine": name, "frames": frames, "avg_sec": avg, "fps": frames / avg if avg else 0.0})
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="motion engine benchmark")
+    ap.add_argument("--image", type=Path, default=None)
+    ap.add_argument("--engines", default=",".join(available_engines()))
+    ap.add_argument("--seconds", type=float, default=1.8, help="컷 길이(초)")
+    ap.add_argument("--fps", type=int, default=30)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        w, h = video._video_dims()
+        image = args.image or _synthetic_image(Path(tmp) / "bench.png", w, h)
+        # 합성 이미지는 VIDEO_SIZE 그대로라 정규화된 still과 같은 조건
+        normalized = args.image is None
+        rows = bench(engines, image, args.seconds, args.fps, args.repeat, normalized)
+
+    print(f"{'engine':<12}{'frames':>8}{'avg_sec':>10}{'fps':>10}")
+    for r in rows:
+        print(f"{r['engine']:<12}{r['frames']:>8}{r['avg_sec']:>10.3f}{r['fps']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
+import json
 import os
+import time
 import requests
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+# 진행 단계 표시 이름 (백엔드 core/progress.py의 STAGE_WEIGHTS와 같은 키)
+STAGE_LABELS = {
+    "ingest": "이미지 준비 중",
+    "llm": "광고 문구 생성 중",
+    "tts": "나레이션 생성 중",
+    "render": "영상 렌더링 중",
+    "package": "스트리밍용 패키징 중",
+}
 
 class VideoAPI:
     """백엔드 API 호출을 전담하는 클래스"""
@@ -34,6 +45,94 @@ class VideoAPI:
             st.stop()
             return {}
 
+    def create_job(self) -> Optional[str]:
+        """진행 상황을 구독할 job_id를 먼저 받아옵니다. (실패하면 None)"""
+        try:
+            r = requests.post(f"{self.api_base}/api/jobs", timeout=10)
+            r.raise_for_status()
+            return r.json().get("job_id")
+        except Exception:
+            return None
+
+    def iter_job_events(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """/api/jobs/{job_id}/events SSE를 읽어서 이벤트(dict)를 하나씩 돌려줍니다."""
+        with requests.get(f"{self.api_base}/api/jobs/{job_id}/events", stream=True, timeout=(10, 660)) as r:
+            r.raise_for_status()
+            for line in r.iter_lines(decode_unicode=True):
+                if line and line.startswith("data:"):
+                    yield json.loads(line[len("data:"):].strip())
+
+    def submit_job(self, files: List[tuple], data: Dict[str, Any], endpoint: str) -> Optional[str]:
+        """async_job=true로 제출하고 job_id를 받습니다. (202가 아니면 None)
+
+        - 대기열이 가득 찬 경우(429)는 사용자에게 알리고 중단
+        """
+        try:
+            r = requests.post(f"{self.api_base}{endpoint}", files=files, data={**data, "async_job": "true"}, timeout=60)
+        except Exception:
+            return None
+        if r.status_code == 429:
+            st.warning("지금 생성 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+            st.stop()
+        if r.status_code != 202:
+            return None
+        return r.json().get("job_id")
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """GET /api/jobs/{job_id} (status: queued/running/done/error)"""
+        r = requests.get(f"{self.api_base}/api/jobs/{job_id}", timeout=10)
+        r.raise_for_status()
+        return r.json()
+
+    def wait_job(self, job_id: str, timeout: float = 600.0) -> Dict[str, Any]:
+        """job이 done/error가 될 때까지 상태를 폴링합니다."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job.get("status") in ("done", "error") or time.monotonic() > deadline:
+                return job
+            time.sleep(1.0)
+
+    def generate_video_with_progress(self, files: List[tuple], data: Dict[str, Any], endpoint: str = "/api/generate") -> Dict[str, Any]:
+        """generate_video와 같지만, 생성 중에는 SSE 진행 이벤트로 progress bar를 보여줍니다.
+
+        - 요청은 async_job=true로 제출 (202 + job_id, HTTP 연결을 10분씩 잡고 있지 않음)
+        - 진행 이벤트로 progress bar 갱신 -> 끝나면 GET /api/jobs/{job_id}로 결과 조회
+        - 비동기 제출이 안 되면 기존처럼 spinner로 대기
+        """
+        job_id = self.submit_job(files, data, endpoint)
+        if not job_id:
+            with st.spinner("영상을 생성 중입니다... (수 초~수십 초)"):
+                return self.generate_video(files, data, endpoint)
+
+        bar = st.progress(0.0, text="대기열에서 순서를 기다리는 중...")
+        try:
+            for ev in self.iter_job_events(job_id):
+                text = STAGE_LABELS.get(ev.get("stage") or "", "작업 중")
+                if ev.get("reused"):
+                    text += " (이전 결과 재사용)"
+                if ev.get("stage") == "render" and ev.get("fps"):
+                    text += f" · {ev['fps']:.0f} fps"
+                    if ev.get("speed"):
+                        text += f" ({ev['speed']:.1f}x)"
+                bar.progress(min(1.0, float(ev.get("overall") or 0.0)), text=text)
+                if ev.get("type") in ("done", "error"):
+                    break
+        except Exception:
+            pass  # SSE가 끊겨도 상태 폴링으로 결과를 받음
+
+        try:
+            job = self.wait_job(job_id)
+        except Exception as e:
+            job = {"status": "error", "error": str(e)}
+        bar.empty()
+
+        if job.get("status") != "done":
+            st.error(f"백엔드 요청 중 오류가 발생했습니다: {job.get('error') or '시간 초과'}")
+            st.stop()
+            return {}
+        return job.get("result") or {}
+
     def get_public_video_url(self, video_url: Optional[str]) -> Optional[str]:
         """상대 경로인 video_url을 외부 접근 가능한 전체 URL로 변환합니다."""
         if not video_url:
@@ -67,9 +67,8 @@ if make_btn:
         img.seek(0)
         files.append(("images", (img.name, img.getvalue(), img.type)))
 
-    with st.spinner("영상을 생성 중입니다... (수 초~수십 초)"):
-        # API 호출 (모듈화된 api 사용)
-        out = api.generate_video(files=files, data=data)
+    # API 호출 (모듈화된 api 사용, 진행 상황은 progress bar로)
+    out = api.generate_video_with_progress(files=files, data=data)
 
     # 4. 결과 노출 (모듈화된 컴포넌트 사용)
     full_video_url = api.get_public_video_url(out.get("video_url"))
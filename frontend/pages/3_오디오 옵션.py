@@ -111,9 +111,8 @@ if make_btn:
         "use_bgm": str(use_bgm).lower(),
     })
 
-    with st.spinner("요청하신 옵션으로 영상을 생성 중입니다... (수 초~수십 초)"):
-        # API 호출 (/api/generate-flex 사용)
-        out = api.generate_video(files=files, data=data, endpoint="/api/generate-flex")
+    # API 호출 (/api/generate-flex 사용, 진행 상황은 progress bar로)
+    out = api.generate_video_with_progress(files=files, data=data, endpoint="/api/generate-flex")
 
     # 5. 결과 노출
     full_video_url = api.get_public_video_url(out.get("video_url"))
@@ -0,0 +1,90 @@
+"""
+batch.py 유닛 테스트
+
+테스트 대상:
+- parse_items: items JSON 검증 (menu_name 필수, 최대 개수)
+- prepare_batch + run_batch: 이미지 정규화/자막 위치 분석은 배치당 1번, 메뉴마다 job/결과 따로
+- 한 메뉴가 실패해도 나머지는 계속, 마지막 줄은 요약
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import batch
+from backend.app.services import video_generator as vg
+
+
+class TestParseItems:
+    def test_requires_menu_name_and_drops_unknown_keys(self):
+        items = batch.parse_items('[{"menu_name": "떡볶이", "price": 4500, "x": 1}]')
+        assert items == [{"menu_name": "떡볶이", "price": "4500"}]
+        with pytest.raises(HTTPException):
+            batch.parse_items('[{"price": "1"}]')
+        with pytest.raises(HTTPException):
+            batch.parse_items("not json")
+
+    def test_rejects_too_many_items(self, monkeypatch):
+        monkeypatch.setattr(batch.settings, "BATCH_MAX_ITEMS", 2)
+        with pytest.raises(HTTPException):
+            batch.parse_items('[{"menu_name": "a"}, {"menu_name": "b"}, {"menu_name": "c"}]')
+
+
+class TestRunBatch:
+    """공용 준비물은 1번, 메뉴별 카피/렌더는 각각"""
+
+    def test_shared_ingest_once_and_results_per_item(self, monkeypatch, tmp_path):
+        calls = {"normalize": 0, "anchors": 0, "copy": [], "render": []}
+
+        def fake_normalize(paths, out_dir, size, pad=True):
+            calls["normalize"] += 1
+            return None
+
+        def fake_anchors(paths):
+            calls["anchors"] += 1
+            return ["mid"] * len(paths)
+
+        def fake_copy(**kw):
+            if kw["menu_name"] == "실패":
+                raise RuntimeError("LLM down")
+            calls["copy"].append(kw["menu_name"])
+            return SimpleNamespace(caption_lines=[kw["menu_name"]], promo_text="", hashtags=[])
+
+        def fake_render(image_paths, lines, timings, voice_path, bgm_path, artifacts_dir, targets, opts):
+            calls["render"].append(image_paths)
+            return [out for _r, out in targets]
+
+        monkeypatch.setattr(vg.settings, "OUTPUT_DIR", str(tmp_path / "outputs"))
+        monkeypatch.setattr(vg, "normalize_images", fake_normalize)
+        monkeypatch.setattr(vg, "pick_anchors_for_images", fake_anchors)
+        monkeypatch.setattr(batch, "pick_anchors_for_images", fake_anchors)
+        monkeypatch.setattr(vg, "generate_copy", fake_copy)
+        monkeypatch.setattr(vg, "_render_final", fake_render)
+
+        items = batch.parse_items('[{"menu_name": "떡볶이"}, {"menu_name": "실패"}, {"menu_name": "김밥"}]')
+
+        async def scenario():
+            images = [UploadFile(file=io.BytesIO(b"img"), filename="a.jpg")]
+            batch_id, shared = await batch.prepare_batch(images, use_bgm=False)
+            return [r async for r in batch.run_batch(batch_id, shared, items, use_tts=False, use_bgm=False)]
+
+        results = asyncio.run(scenario())
+
+        assert calls["normalize"] == 1 and calls["anchors"] == 1
+        assert sorted(calls["copy"]) == ["김밥", "떡볶이"]
+        assert len(calls["render"]) == 2
+        assert calls["render"][0] == calls["render"][1]  # 같은 공용 이미지
+
+        per_item = {r["index"]: r for r in results if r["type"] == "item"}
+        assert per_item[0]["ok"] and per_item[2]["ok"] and not per_item[1]["ok"]
+        assert per_item[0]["job_id"] != per_item[2]["job_id"]
+        assert results[-1] == {"type": "done", "batch_id": results[-1]["batch_id"], "ok": 2, "failed": 1}
@@ -0,0 +1,83 @@
+"""
+bgm_library.py 유닛 테스트
+
+테스트 대상:
+- prepare_track: loudness 측정 -> 목표 LUFS까지 gain -> loop/trim된 bed 생성, 같은 내용이면 캐시 hit
+- 믹스 입력: bed는 -stream_loop 없이, 원본 곡은 기존처럼 루프
+- bed_for: 캐시 파일이 아니라 job 폴더로 link_or_copy한 경로 (eviction돼도 남음)
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import bgm_library, video
+
+_LOUDNORM_OUT = """
+[Parsed_loudnorm_0 @ 0x1]
+{
+	"input_i" : "-10.00",
+	"input_tp" : "-1.00",
+	"input_lra" : "5.00",
+	"input_thresh" : "-20.00"
+}
+"""
+
+
+def _patch(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_run(cmd):
+        calls.append(cmd)
+        if "loudnorm=print_format=json" in cmd:
+            return subprocess.CompletedProcess(cmd, 0, "", _LOUDNORM_OUT)
+        Path(cmd[-1]).write_bytes(b"RIFF-bed")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(bgm_library, "_run", fake_run)
+    monkeypatch.setattr(bgm_library.media_info, "duration_sec", lambda p: 42.0)
+    monkeypatch.setattr(bgm_library.settings, "BGM_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(bgm_library.settings, "BGM_TARGET_LUFS", -16.0)
+    monkeypatch.setattr(bgm_library, "_CACHE", None)
+    return calls
+
+
+class TestPrepareTrack:
+    def test_bed_is_gain_adjusted_and_cached_by_content(self, monkeypatch, tmp_path):
+        calls = _patch(monkeypatch, tmp_path)
+        src = tmp_path / "song.mp3"
+        src.write_bytes(b"same-song")
+
+        track = bgm_library.prepare_track(src)
+        assert track.loudness_lufs == -10.0 and track.duration_sec == 42.0
+        assert track.bed.name.endswith(video.BGM_BED_SUFFIX) and track.bed.exists()
+        bed_cmd = calls[-1]
+        assert "volume=-6.0dB,aresample=48000" in bed_cmd
+        assert bed_cmd[bed_cmd.index("-t") + 1] == f"{float(video.settings.VIDEO_SECONDS):.3f}"
+
+        # 같은 내용을 다른 이름으로 올려도 FFmpeg 없이 재사용
+        upload = tmp_path / "custom_bgm.mp3"
+        upload.write_bytes(b"same-song")
+        n = len(calls)
+        job_bed = bgm_library.bed_for(upload, tmp_path / "job")
+        assert len(calls) == n
+        assert job_bed.parent == tmp_path / "job" and job_bed.read_bytes() == track.bed.read_bytes()
+
+    def test_job_bed_survives_cache_eviction(self, monkeypatch, tmp_path):
+        _patch(monkeypatch, tmp_path)
+        src = tmp_path / "song.mp3"
+        src.write_bytes(b"song")
+
+        job_bed = bgm_library.bed_for(src, tmp_path / "job")
+        bgm_library.prepare_track(src).bed.unlink()  # 다른 job의 put이 evict했다고 치고
+        assert job_bed.exists() and job_bed.read_bytes() == b"RIFF-bed"
+
+
+class TestBgmInput:
+    def test_bed_is_read_without_loop(self, tmp_path):
+        assert video._bgm_input_args(tmp_path / f"x{video.BGM_BED_SUFFIX}") == ["-i", str(tmp_path / f"x{video.BGM_BED_SUFFIX}")]
+        assert video._bgm_input_args(tmp_path / "song.mp3")[:2] == ["-stream_loop", "-1"]
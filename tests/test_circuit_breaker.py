@@ -0,0 +1,167 @@
+"""
+circuit_breaker.py 유닛 테스트
+
+테스트 대상:
+- closed -> (연속 실패 N번) open -> (cooldown) half_open 시험 호출 1개 -> 성공 closed / 실패 open
+- 열려 있으면 generate_copy / synthesize_voice_lines가 OpenAI를 부르지 않고 바로 fallback
+- 4xx(400/401/404)는 provider 장애가 아니라서 breaker에 실패로 안 남음, 429/5xx만 기록
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.core import circuit_breaker as cb
+from backend.app.services import llm, tts
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail(breaker):
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("timeout")
+
+
+class TestCircuitBreaker:
+    """상태 전이"""
+
+    def test_opens_after_threshold_and_recovers_through_half_open(self):
+        clock = _Clock()
+        b = cb.CircuitBreaker("t", failure_threshold=2, cooldown_sec=30, clock=clock)
+        _fail(b)
+        assert b.state == cb.CLOSED
+        _fail(b)
+        assert b.state == cb.OPEN and not b.available()
+        with pytest.raises(cb.CircuitOpenError):
+            with b.guard():
+                pytest.fail("열려 있으면 실행되면 안 됨")
+
+        clock.now = 31
+        assert b.state == cb.HALF_OPEN
+        assert b.allow() is True
+        assert b.allow() is False  # 시험 호출은 1개만
+        b.record_success()
+        assert b.state == cb.CLOSED and b.snapshot()["failures"] == 0
+
+    def test_failed_probe_reopens(self):
+        clock = _Clock()
+        b = cb.CircuitBreaker("t", failure_threshold=1, cooldown_sec=10, clock=clock)
+        _fail(b)
+        clock.now = 11
+        _fail(b)
+        assert b.state == cb.OPEN
+        assert b.snapshot()["retry_in_sec"] == 10.0
+
+    def test_success_resets_consecutive_failures(self):
+        b = cb.CircuitBreaker("t", failure_threshold=2, cooldown_sec=10)
+        _fail(b)
+        with b.guard():
+            pass
+        _fail(b)
+        assert b.state == cb.CLOSED
+
+
+@pytest.fixture
+def open_breakers(monkeypatch):
+    breakers = {}
+    for name in ("openai.chat", "openai.tts"):
+        b = cb.CircuitBreaker(name, failure_threshold=1, cooldown_sec=60)
+        b.record_failure()
+        breakers[name] = b
+    monkeypatch.setattr(cb, "_BREAKERS", breakers)
+    monkeypatch.setattr(llm.settings, "OPENAI_API_KEY", "sk-test")
+    return breakers
+
+
+class TestProvidersRespectBreaker:
+    """열린 breaker -> 외부 호출 없이 fallback"""
+
+    def test_generate_copy_falls_back_without_calling_openai(self, open_breakers, monkeypatch):
+        monkeypatch.setattr(llm.settings, "LLM_CACHE_TTL_SEC", 0)
+        monkeypatch.setattr(llm.openai_client, "get_client", lambda: pytest.fail("OpenAI 호출됨"))
+        out = llm.generate_copy("떡볶이", None, "감성", n_lines=6)
+        assert len(out.caption_lines) == 6
+
+    def test_voice_lines_skip_openai(self, open_breakers, monkeypatch, tmp_path):
+        monkeypatch.setattr(tts.settings, "TTS_CACHE_ENABLED", False)
+        monkeypatch.setattr(tts.settings, "NARRATION_STORE_ENABLED", False)
+        monkeypatch.setattr(tts.platform, "system", lambda: "Linux")
+        monkeypatch.setattr(tts, "_openai_tts", lambda *a: pytest.fail("OpenAI 호출됨"))
+        monkeypatch.setattr(tts, "_gtts_synthesize", lambda text, out: out.write_bytes(b"\xff" * 2000) and out)
+        monkeypatch.setattr(tts, "assemble_narration", lambda raws, out_dir, **kw: (out_dir / "voice.wav", raws))
+        monkeypatch.setattr(tts.media_info, "duration_sec", lambda p: 1.0)
+
+        _voice, timings = tts.synthesize_voice_lines(["a", "b"], tmp_path)
+        assert len(timings) == 2
+
+    def test_snapshot_lists_known_providers(self, open_breakers):
+        snap = cb.snapshot(["openai.chat", "openai.tts", "gtts"])
+        assert snap["openai.chat"]["state"] == cb.OPEN
+        assert snap["gtts"]["state"] == cb.CLOSED
+
+
+class _Resp:
+    def __init__(self, status):
+        self.status_code = status
+        self.text = "err"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _Client:
+    def __init__(self, status):
+        self.status = status
+
+    def post(self, endpoint, payload):
+        return _Resp(self.status)
+
+
+@pytest.fixture
+def fresh_breakers(monkeypatch):
+    breakers = {name: cb.CircuitBreaker(name, failure_threshold=1, cooldown_sec=60)
+                for name in ("openai.chat", "openai.tts")}
+    monkeypatch.setattr(cb, "_BREAKERS", breakers)
+    monkeypatch.setattr(llm.settings, "OPENAI_API_KEY", "sk-test")
+    return breakers
+
+
+class TestClientErrorsDoNotTrip:
+    """요청/설정 문제(4xx)는 breaker를 열지 않음"""
+
+    @pytest.mark.parametrize("status", [400, 401, 404])
+    def test_4xx_keeps_breakers_closed(self, fresh_breakers, monkeypatch, tmp_path, status):
+        monkeypatch.setattr(llm.openai_client, "get_client", lambda: _Client(status))
+
+        with pytest.raises(Exception):
+            llm._llm_copy("떡볶이", None, "감성", 6, None, None, None, None)
+        with pytest.raises(RuntimeError):
+            tts._openai_tts("지금이 타이밍", tmp_path / "a.mp3")
+
+        assert fresh_breakers["openai.chat"].state == cb.CLOSED
+        assert fresh_breakers["openai.tts"].state == cb.CLOSED
+
+    @pytest.mark.parametrize("status", [429, 503])
+    def test_429_and_5xx_open_breakers(self, fresh_breakers, monkeypatch, tmp_path, status):
+        monkeypatch.setattr(llm.openai_client, "get_client", lambda: _Client(status))
+
+        with pytest.raises(Exception):
+            llm._llm_copy("떡볶이", None, "감성", 6, None, None, None, None)
+        with pytest.raises(RuntimeError):
+            tts._openai_tts("지금이 타이밍", tmp_path / "a.mp3")
+
+        assert fresh_breakers["openai.chat"].state == cb.OPEN
+        assert fresh_breakers["openai.tts"].state == cb.OPEN
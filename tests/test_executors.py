@@ -0,0 +1,51 @@
+"""
+core/executors.py 유닛 테스트
+
+테스트 대상:
+- run_in: 블로킹 함수를 풀에서 실행 (이벤트 루프는 계속 돎), contextvars 전달
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.core import executors, progress
+
+
+class TestRunIn:
+    """풀 실행 테스트"""
+
+    def test_event_loop_keeps_running_during_blocking_call(self):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            t = asyncio.create_task(ticker())
+            await executors.run_in("media", time.sleep, 0.3)
+            t.cancel()
+            return ticks
+
+        assert asyncio.run(main()) >= 5
+
+    def test_context_is_copied_into_worker(self):
+        async def main():
+            progress.bind("job-exec")
+            return await executors.run_in("io", progress.current_job)
+
+        assert asyncio.run(main()) == "job-exec"
+
+    def test_unknown_pool_raises(self):
+        import pytest
+
+        with pytest.raises(ValueError):
+            executors.get_pool("gpu")
@@ -0,0 +1,75 @@
+"""
+hls.py 유닛 테스트
+
+테스트 대상:
+- _ladder: 원본보다 큰 rung은 건너뜀
+- package_hls: FFmpeg 1회로 rung별 인코딩 + master playlist (x264 옵션은 인코딩 프로필, GOP는 fps 기준)
+"""
+
+import sys
+from pathlib import Path
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import hls
+
+
+class TestLadder:
+    """화질 사다리 선택 테스트"""
+
+    def test_skips_rungs_above_source(self):
+        assert [r["short"] for r in hls._ladder(1080, 1920)] == [1080, 720, 480]
+        assert [r["short"] for r in hls._ladder(720, 1280)] == [720, 480]
+
+    def test_tiny_source_keeps_one_rung(self):
+        ladder = hls._ladder(360, 640)
+        assert len(ladder) == 1 and ladder[0]["short"] == 360
+
+
+class TestPackageHls:
+    """HLS 패키징 커맨드 구성 테스트"""
+
+    def test_single_invocation_with_var_stream_map(self, monkeypatch, tmp_path):
+        calls = []
+        monkeypatch.setattr(hls, "_run", lambda cmd: calls.append(cmd))
+
+        master = hls.package_hls(tmp_path / "final.mp4", tmp_path / "hls", (1080, 1920), has_audio=True)
+
+        assert len(calls) == 1
+        cmd = calls[0]
+        assert master == tmp_path / "hls" / "master.m3u8"
+        assert cmd[cmd.index("-var_stream_map") + 1] == "v:0,a:0 v:1,a:1 v:2,a:2"
+        assert cmd[cmd.index("-hls_segment_type") + 1] == "fmp4"
+        fc = cmd[cmd.index("-filter_complex") + 1]
+        assert "split=3" in fc and "scale=480:-2" in fc
+        assert cmd[cmd.index("-keyint_min") + 1] == cmd[cmd.index("-g") + 1]
+
+    def test_encoder_args_follow_profile_and_fps(self, monkeypatch, tmp_path):
+        """x264 옵션은 인코딩 프로필에서, GOP는 HLS_SEGMENT_SEC x fps"""
+        calls = []
+        monkeypatch.setattr(hls, "_run", lambda cmd: calls.append(cmd))
+        monkeypatch.setattr(hls.settings, "HLS_SEGMENT_SEC", 2)
+        monkeypatch.setattr(hls.settings, "ENCODE_PROFILES", {
+            "film": {"preset": "slow", "tune": "film", "crf": 20, "maxrate": "6M", "threads": 0},
+        })
+
+        hls.package_hls(tmp_path / "final.mp4", tmp_path / "hls", (1080, 1920), profile="film", fps=24)
+
+        cmd = calls[0]
+        assert cmd[cmd.index("-preset") + 1] == "slow"
+        assert cmd[cmd.index("-tune") + 1] == "film"
+        assert "stillimage" not in cmd
+        assert "-crf" not in cmd and "-maxrate" not in cmd  # 비트레이트는 rung별 -b:v:k / -maxrate:v:k
+        assert cmd[cmd.index("-g") + 1] == "48"
+
+    def test_no_audio_maps_video_only(self, monkeypatch, tmp_path):
+        calls = []
+        monkeypatch.setattr(hls, "_run", lambda cmd: calls.append(cmd))
+
+        hls.package_hls(tmp_path / "final.mp4", tmp_path / "hls", (1920, 1080), has_audio=False)
+
+        cmd = calls[0]
+        assert "0:a:0" not in cmd and "-c:a" not in cmd
+        assert "scale=-2:720" in cmd[cmd.index("-filter_complex") + 1]
@@ -0,0 +1,85 @@
+"""
+job_queue.py 유닛 테스트
+
+테스트 대상:
+- enqueue: 업로드를 inputs/에 저장하고 queued 상태로 바로 반환 -> 워커가 generate_video 실행 -> done + result
+  (저장해 둔 업로드를 그대로 써서 이미지가 두 번 저장되지 않음)
+- 대기열이 가득 차면 429, 처리 중인 job_id로 다시 제출하면 409
+- 서버 재시작 등으로 큐가 모르는 queued job은 error로 보임
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import job_queue
+from backend.app.services import video_generator as vg
+from backend.app.services.storage import open_job_dir, save_job_status
+
+
+def _images():
+    return [UploadFile(file=io.BytesIO(b"img"), filename="a.jpg")]
+
+
+@pytest.fixture
+def patched(monkeypatch, tmp_path):
+    calls = {"render": 0}
+
+    def fake_render(image_paths, lines, timings, voice_path, bgm_path, artifacts_dir, targets, opts):
+        calls["render"] += 1
+        assert all(p.read_bytes() == b"img" for p in image_paths)
+        return [out for _r, out in targets]
+
+    monkeypatch.setattr(vg.settings, "OUTPUT_DIR", str(tmp_path / "outputs"))
+    monkeypatch.setattr(vg, "generate_copy", lambda **kw: SimpleNamespace(caption_lines=["한 줄"], promo_text="", hashtags=[]))
+    monkeypatch.setattr(vg, "_render_final", fake_render)
+    monkeypatch.setattr(vg, "normalize_images", lambda *a, **kw: None)
+    monkeypatch.setattr(job_queue, "_QUEUE", job_queue.JobQueue(workers=1, max_size=1))
+    return calls
+
+
+class TestJobQueue:
+    """비동기 제출 -> 백그라운드 처리 -> 상태 조회"""
+
+    def test_submit_returns_queued_then_worker_finishes(self, patched):
+        async def scenario():
+            status = await job_queue.enqueue(images=_images(), menu_name="떡볶이", use_tts=False, use_bgm=False)
+            assert status["status"] == "queued" and status["position"] == 1
+            await job_queue.get_queue().join()
+            return job_queue.job_status(open_job_dir(status["job_id"]))
+
+        final = asyncio.run(scenario())
+        assert final["status"] == "done"
+        assert final["result"]["video_url"] == f"/outputs/{final['job_id']}/artifacts/final.mp4"
+        assert patched["render"] == 1
+        # 업로드는 inputs/에 1번만 저장 (generate_video가 img_N으로 다시 쓰지 않음)
+        inputs = sorted(p.name for p in (open_job_dir(final["job_id"]) / "inputs").iterdir())
+        assert inputs == [job_queue.REQUEST_FILE, "upload_1.jpg"]
+
+    def test_full_queue_is_rejected_with_429(self, patched, monkeypatch):
+        monkeypatch.setattr(job_queue, "_QUEUE", job_queue.JobQueue(workers=0, max_size=1))
+
+        async def scenario():
+            first = await job_queue.enqueue(images=_images(), menu_name="떡볶이")
+            with pytest.raises(HTTPException) as busy:
+                await job_queue.enqueue(images=_images(), menu_name="김밥")
+            with pytest.raises(HTTPException) as dup:
+                job_queue.get_queue().max_size = 5
+                await job_queue.enqueue(images=_images(), menu_name="떡볶이", job_id=first["job_id"])
+            return busy.value.status_code, dup.value.status_code
+
+        assert asyncio.run(scenario()) == (429, 409)
+
+    def test_orphaned_queued_job_reports_error(self, patched, tmp_path):
+        job_dir = vg.make_job_dir()
+        save_job_status(job_dir, {"job_id": job_dir.name, "status": "queued"})
+        assert job_queue.job_status(job_dir)["status"] == "error"
@@ -0,0 +1,85 @@
+"""
+llm.py 유닛 테스트 (카피 캐시)
+
+테스트 대상:
+- 같은 입력(공백/대소문자 차이 포함)은 TTL 동안 OpenAI 호출 없이 재사용, fresh=True면 새로 호출
+- 같은 입력이 동시에 들어오면 호출 1번을 같이 기다림
+- 실패(fallback)는 캐시하지 않음
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import llm
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    def fake_llm_copy(menu_name, *rest):
+        calls.append(menu_name)
+        time.sleep(0.05)
+        return llm.LLMOutput([f"{menu_name} {len(calls)}"] * 6, "promo", ["#a", "#b", "#c"])
+
+    monkeypatch.setattr(llm.settings, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm.settings, "LLM_CACHE_TTL_SEC", 60)
+    monkeypatch.setattr(llm, "_llm_copy", fake_llm_copy)
+    monkeypatch.setattr(llm, "_COPY_CACHE", llm.OrderedDict())
+    monkeypatch.setattr(llm, "_COPY_INFLIGHT", {})
+    return calls
+
+
+class TestCopyCache:
+    """TTL 캐시 + 동시 요청 합치기"""
+
+    def test_same_input_reuses_until_fresh(self, upstream):
+        first = llm.generate_copy("떡볶이", "분식집", "힙", price="4,500원")
+        first.caption_lines.append("호출한 쪽에서 수정")
+        again = llm.generate_copy(" 떡볶이 ", "분식집", "힙", price="4,500원")
+        assert upstream == ["떡볶이"]
+        assert len(again.caption_lines) == 6
+
+        fresh = llm.generate_copy("떡볶이", "분식집", "힙", price="4,500원", fresh=True)
+        assert len(upstream) == 2 and fresh.caption_lines[0] == "떡볶이 2"
+        assert llm.generate_copy("떡볶이", "분식집", "힙", price="4,500원").caption_lines[0] == "떡볶이 2"
+
+    def test_expired_or_different_input_calls_again(self, upstream, monkeypatch):
+        llm.generate_copy("김밥", None, "감성")
+        llm.generate_copy("김밥", None, "고급")
+        assert len(upstream) == 2
+        monkeypatch.setattr(llm.time, "time", lambda: 10 ** 10)
+        llm.generate_copy("김밥", None, "감성")
+        assert len(upstream) == 3
+
+    def test_concurrent_identical_requests_share_one_call(self, upstream):
+        start = threading.Barrier(5)
+
+        def call(_):
+            start.wait()
+            return llm.generate_copy("라멘", "가게", "감성").caption_lines[0]
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(call, range(5)))
+        assert upstream == ["라멘"]
+        assert set(results) == {"라멘 1"}
+
+    def test_failures_fall_back_and_are_not_cached(self, upstream, monkeypatch):
+        def broken(*a):
+            upstream.append("x")
+            raise RuntimeError("503")
+
+        monkeypatch.setattr(llm, "_llm_copy", broken)
+        out = llm.generate_copy("우동", None, "감성", n_lines=6)
+        assert len(out.caption_lines) == 6
+        llm.generate_copy("우동", None, "감성", n_lines=6)
+        assert upstream == ["x", "x"]
@@ -0,0 +1,86 @@
+"""
+media_info.py 유닛 테스트
+
+테스트 대상:
+- WAV: RIFF 헤더로 길이 계산 (FFmpeg 파이프 출력처럼 data 크기를 모르는 경우 포함)
+- MP3: Xing/Info 프레임 수 / 프레임 헤더 합산 (ID3v2 태그 건너뜀)
+- 같은 파일은 memo, 모르는 형식은 ffprobe fallback
+"""
+
+import struct
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import media_info
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, stereo, 패딩 없음 -> 프레임 417바이트, 1152샘플
+_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+_FRAME = _HEADER + bytes(417 - 4)
+
+
+def _mp3(tmp_path, name, body: bytes) -> Path:
+    p = tmp_path / name
+    p.write_bytes(body)
+    return p
+
+
+@pytest.fixture(autouse=True)
+def no_ffprobe(monkeypatch):
+    calls = []
+
+    def fake_probe(path):
+        calls.append(path)
+        return 9.0
+
+    monkeypatch.setattr(media_info, "_probe_duration_sec", fake_probe)
+    media_info._MEMO.clear()
+    return calls
+
+
+class TestWav:
+    def test_pcm_wav(self, tmp_path, no_ffprobe):
+        p = tmp_path / "a.wav"
+        with wave.open(str(p), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(24000)
+            w.writeframes(bytes(2 * 36000))
+        assert media_info.duration_sec(p) == pytest.approx(1.5)
+        assert no_ffprobe == []
+
+    def test_unknown_data_size_uses_file_end(self, tmp_path):
+        p = tmp_path / "pipe.wav"
+        fmt = struct.pack("<HHIIHH", 1, 1, 8000, 16000, 2, 16)
+        body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", 0xFFFFFFFF) + bytes(8000)
+        p.write_bytes(b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + body)
+        assert media_info.duration_sec(p) == pytest.approx(0.5)
+
+
+class TestMp3:
+    def test_frame_walk_skips_id3(self, tmp_path, no_ffprobe):
+        id3 = b"ID3" + bytes([4, 0, 0, 0, 0, 0, 20]) + bytes(20)
+        p = _mp3(tmp_path, "a.mp3", id3 + _FRAME * 100 + b"TAG" + bytes(125))
+        assert media_info.duration_sec(p) == pytest.approx(100 * 1152 / 44100)
+        assert no_ffprobe == []
+
+    def test_info_header_frame_count(self, tmp_path):
+        info = bytearray(_FRAME)
+        info[36:48] = b"Info" + struct.pack(">II", 1, 250)
+        p = _mp3(tmp_path, "cbr.mp3", bytes(info) + _FRAME * 3)
+        assert media_info.duration_sec(p) == pytest.approx(250 * 1152 / 44100)
+
+
+class TestFallbackAndMemo:
+    def test_unknown_format_uses_ffprobe_once(self, tmp_path, no_ffprobe):
+        p = tmp_path / "a.m4a"
+        p.write_bytes(b"\x00\x00\x00\x20ftypM4A " + bytes(64))
+        assert media_info.duration_sec(p) == 9.0
+        assert media_info.duration_sec(p) == 9.0
+        assert len(no_ffprobe) == 1
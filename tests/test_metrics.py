@@ -0,0 +1,40 @@
+"""
+metrics.py 유닛 테스트
+
+테스트 대상:
+- observe: count/sum/min/max/avg
+- buckets를 넘긴 이름만 히스토그램 (누적 버킷 개수 + p50/p95/p99)
+"""
+
+import sys
+from pathlib import Path
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.metrics import Metrics
+
+
+class TestObserve:
+    """지연시간 요약 + 히스토그램"""
+
+    def test_plain_observe_has_no_histogram(self):
+        m = Metrics()
+        m.observe("jobs.run_sec", 2.0)
+        m.observe("jobs.run_sec", 4.0)
+        t = m.snapshot()["timings"]["jobs.run_sec"]
+        assert t == {"count": 2, "sum": 6.0, "min": 2.0, "max": 4.0, "avg": 3.0}
+
+    def test_buckets_give_tail_percentiles(self):
+        m = Metrics()
+        for _ in range(90):
+            m.observe("openai.chat.completions.latency_sec", 0.3, buckets=(0.5, 1.0, 5.0))
+        for _ in range(8):
+            m.observe("openai.chat.completions.latency_sec", 3.0, buckets=(0.5, 1.0, 5.0))
+        for _ in range(2):
+            m.observe("openai.chat.completions.latency_sec", 30.0, buckets=(0.5, 1.0, 5.0))
+
+        t = m.snapshot()["timings"]["openai.chat.completions.latency_sec"]
+        assert t["buckets"] == {"le_0.5": 90, "le_1": 90, "le_5": 98, "le_inf": 100}
+        assert (t["p50"], t["p95"], t["p99"]) == (0.5, 5.0, 30.0)
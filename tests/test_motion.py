@@ -0,0 +1,98 @@
+"""
+motion.py 유닛 테스트
+
+테스트 대상:
+- get_motion_engine: 설정값으로 엔진 선택 (이상한 값이면 zoompan)
+- CropScaleEngine: t 기반 scale(eval=frame) + crop 식
+- KenBurnsEngine: 프레임 크기/개수, 크기가 이미 맞는 still도 색보정, stderr가 많아도 멈추지 않고 진행 이벤트 전송
+"""
+
+import sys
+import textwrap
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.ingest import _color_grade
+from backend.app.services import motion
+from backend.app.services.motion import (
+    KenBurnsEngine,
+    _effect_zoompan,
+    get_motion_engine,
+)
+
+
+class TestGetMotionEngine:
+    """엔진 선택 테스트"""
+
+    def test_known_engines(self):
+        assert get_motion_engine("zoompan").name == "zoompan"
+        assert get_motion_engine("CropScale").name == "cropscale"
+        assert get_motion_engine("kenburns").filter_based is False
+
+    def test_unknown_falls_back_to_zoompan(self):
+        assert get_motion_engine("nope").name == "zoompan"
+
+
+class TestMotionFilters:
+    """필터 문자열 테스트"""
+
+    def test_zoompan_matches_presets(self):
+        f = get_motion_engine("zoompan").motion_filter(1, 1.8, 1080, 1920, 30)
+        assert f.startswith(_effect_zoompan(1))
+        assert ":d=54:s=1080x1920:fps=30" in f
+
+    def test_cropscale_uses_time_expressions(self):
+        engine = get_motion_engine("cropscale")
+        f = engine.motion_filter(0, 1.8, 1080, 1920, 30)
+        assert "eval=frame" in f and "*t," in f
+        assert "crop=1080:1920" in f
+        assert "-framerate" in engine.input_args(1.8, 30)
+
+
+class TestKenBurnsFrames:
+    """NumPy 프레임 생성 테스트"""
+
+    def test_frame_count_and_shape(self):
+        src = np.zeros((64, 36, 3), dtype=np.uint8)
+        frames = list(KenBurnsEngine()._frames(src, 0, 5, 36, 64))
+        assert len(frames) == 5
+        assert all(f.shape == (64, 36, 3) for f in frames)
+
+    def test_load_grades_exact_size_still(self, tmp_path):
+        """VIDEO_SIZE와 크기가 같아도 정규화 안 된 still이면 색보정 (graded면 그대로)"""
+        src = np.random.default_rng(0).integers(40, 200, (64, 36, 3), dtype=np.uint8)
+        img = tmp_path / "a.png"
+        cv2.imwrite(str(img), src)
+
+        loaded = KenBurnsEngine()._load(img, 36, 64)
+        assert np.array_equal(loaded, _color_grade(src))
+        assert np.array_equal(KenBurnsEngine()._load(img, 36, 64, graded=True), src)
+
+    def test_render_clip_drains_stderr_and_reports_progress(self, monkeypatch, tmp_path):
+        """FFmpeg가 stdin을 읽기 전에 stderr를 파이프 버퍼보다 많이 써도 교착 없이 끝남"""
+        fake = tmp_path / "ffmpeg"
+        fake.write_text(textwrap.dedent(f"""\
+            #!{sys.executable}
+            import sys
+            sys.stderr.write("x" * 1_000_000)
+            sys.stderr.flush()
+            sys.stdin.buffer.read()
+        """))
+        fake.chmod(0o755)
+        monkeypatch.setattr(motion, "FFMPEG_BIN", str(fake))
+        monkeypatch.setattr(motion, "_PROGRESS_INTERVAL_SEC", 0.0)
+        events = []
+        monkeypatch.setattr(motion.progress, "report", lambda **kw: events.append(kw))
+
+        img = tmp_path / "a.png"
+        cv2.imwrite(str(img), np.zeros((64, 36, 3), dtype=np.uint8))
+        KenBurnsEngine().render_clip(img, 0, 0.2, 36, 64, 30, tmp_path / "out.mp4", [], graded=True)
+
+        assert [e["frame"] for e in events] == [1, 2, 3, 4, 5, 6]
+        assert events[-1]["out_time_sec"] == 0.2
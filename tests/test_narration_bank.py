@@ -0,0 +1,96 @@
+"""
+narration_bank.py 유닛 테스트
+
+테스트 대상:
+- bank_phrases: 폴백 카피의 고정 문장(훅/뱅크/필러)과 이모지 변형, 메뉴 이름 줄은 없음
+- precompute: 문장 묶음을 FFmpeg 1회로 후처리해 저장, 두 번째 실행은 전부 건너뜀
+- 키 없는 폴백 job: 뱅크 문장만이면 합성 호출 없이 저장소 WAV로만 나레이션 조립
+"""
+
+import re
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import llm, tts
+from backend.app.services import narration_bank as nb
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(48000)
+        w.writeframes(b"\x00\x00" * int(48000 * seconds))
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    cmds = []
+    synthesized = []
+
+    def fake_run(cmd):
+        cmds.append(cmd)
+        for arg in cmd:
+            if re.search(r"(line_\d+|voice)\.wav$", arg):
+                _write_wav(Path(arg), 0.5)
+
+    def fake_gtts(text, out_mp3):
+        synthesized.append(text)
+        out_mp3.write_bytes(b"\xff" * 2000)
+        return out_mp3
+
+    monkeypatch.setattr(tts, "_run", fake_run)
+    monkeypatch.setattr(tts, "_gtts_synthesize", fake_gtts)
+    monkeypatch.setattr(tts.settings, "OPENAI_API_KEY", "")
+    monkeypatch.setattr(tts.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(tts.settings, "TTS_CACHE_ENABLED", False)
+    monkeypatch.setattr(nb.settings, "NARRATION_STORE_DIR", str(tmp_path / "narration"))
+    monkeypatch.setattr(nb, "_STORE", None)
+    return {"cmds": cmds, "synthesized": synthesized}
+
+
+class TestBankPhrases:
+    """폴백 카피가 쓰는 고정 문장"""
+
+    def test_covers_bank_and_fillers(self):
+        phrases = nb.bank_phrases()
+        assert "저장하고 가요" in phrases and "지금이 타이밍" in phrases
+        assert all(f in phrases for f in llm._FILLERS)
+        assert "✨ 저장하고 가요" in phrases  # 감성 톤 이모지 변형
+        assert len(phrases) == len(set(phrases))
+        assert len(nb.bank_phrases(with_emoji=False)) < len(phrases)
+
+
+class TestPrecompute:
+    """저장소 채우기 + 요청 때 사용"""
+
+    def test_precompute_is_idempotent_and_batched(self, env, monkeypatch):
+        monkeypatch.setattr(nb, "_CHUNK", 2)
+        phrases = ["저장하고 가요", "지금이 타이밍", "한입에 끝"]
+        first = nb.precompute(speeds=[1.1], phrases=phrases)
+        assert first == {"phrases": 3, "stored": 3, "skipped": 0, "failed": 0}
+        assert len(env["cmds"]) == 2  # 2개 + 1개 묶음
+
+        second = nb.precompute(speeds=[1.1], phrases=phrases)
+        assert second["stored"] == 0 and second["skipped"] == 3
+        assert len(nb.get_store()) == 3
+
+    def test_keyless_job_uses_only_precomputed_clips(self, env, tmp_path):
+        phrases = ["지금 딱 생각나는 맛", "저장하고 가요"]
+        nb.precompute(speeds=[1.1], phrases=phrases)
+        env["synthesized"].clear()
+        env["cmds"].clear()
+
+        _voice, timings = tts.synthesize_voice_lines(phrases, tmp_path / "job", speed_up=1.1)
+
+        assert env["synthesized"] == []
+        graph = env["cmds"][0][env["cmds"][0].index("-filter_complex") + 1]
+        assert "atempo" not in graph
+        assert [round(e - s, 2) for s, e in timings] == [0.5, 0.5]
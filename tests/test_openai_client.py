@@ -0,0 +1,196 @@
+"""
+openai_client.py 유닛 테스트 (로컬 stub 서버)
+
+테스트 대상:
+- 429(Retry-After) / 503 뒤에 성공하면 재시도해서 성공 응답을 돌려줌
+- 재시도를 다 쓰면 마지막 응답 그대로 (상태 확인은 호출한 쪽)
+- 400 같은 요청 오류는 재시도하지 않음
+- keep-alive: 같은 연결(클라이언트 포트)로 여러 요청
+- 지연시간: openai.<endpoint>.latency_sec 히스토그램 (버킷 + p95)
+- RateLimiter: RPM/TPM bucket 안에서만 통과, 대기열은 우선순위(INTERACTIVE > BATCH) 순
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import openai_client
+
+
+class _Stub:
+    """응답 시나리오(상태 코드 목록)를 순서대로 돌려주는 OpenAI 흉내 서버"""
+
+    def __init__(self):
+        self.script = []
+        self.seen = []  # (path, client port, Authorization)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                stub.seen.append((self.path, self.client_address[1], self.headers.get("Authorization")))
+                status, headers = stub.script.pop(0) if stub.script else (200, {})
+                body = json.dumps({"ok": status == 200}).encode()
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    s = _Stub()
+    monkeypatch.setattr(openai_client.settings, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(openai_client.settings, "OPENAI_BACKOFF_BASE_SEC", 0.01)
+    monkeypatch.setattr(openai_client.settings, "OPENAI_BACKOFF_MAX_SEC", 0.05)
+    yield s
+    s.server.shutdown()
+    s.server.server_close()
+
+
+def _client(stub, retries=3):
+    return openai_client.OpenAIClient(stub.url, pool_size=2, max_retries=retries)
+
+
+class TestOpenAIClient:
+    """재시도/백오프/keep-alive"""
+
+    def test_retries_transient_errors_then_succeeds(self, stub):
+        stub.script = [(429, {"Retry-After": "0"}), (503, {}), (200, {})]
+        r = _client(stub).post("chat/completions", {"model": "x"})
+        assert r.status_code == 200 and r.json() == {"ok": True}
+        assert [p for p, _port, _auth in stub.seen] == ["/v1/chat/completions"] * 3
+        assert stub.seen[0][2] == "Bearer sk-test"
+
+    def test_gives_up_after_max_retries(self, stub):
+        stub.script = [(503, {})] * 5
+        r = _client(stub, retries=2).post("audio/speech", {"input": "x"})
+        assert r.status_code == 503
+        assert len(stub.seen) == 3
+
+    def test_client_errors_are_not_retried(self, stub):
+        stub.script = [(400, {})]
+        assert _client(stub).post("chat/completions", {}).status_code == 400
+        assert len(stub.seen) == 1
+
+    def test_connection_is_reused(self, stub):
+        client = _client(stub)
+        for _ in range(3):
+            client.post("chat/completions", {})
+        assert len({port for _p, port, _a in stub.seen}) == 1
+
+    def test_latency_histogram_per_endpoint(self, stub, monkeypatch):
+        monkeypatch.setattr(openai_client, "metrics", openai_client.metrics.__class__())
+        client = _client(stub)
+        for _ in range(3):
+            client.post("audio/speech", {"input": "x"})
+
+        t = openai_client.metrics.snapshot()["timings"]["openai.audio.speech.latency_sec"]
+        assert t["count"] == 3
+        assert t["buckets"]["le_inf"] == 3
+        assert t["p95"] in openai_client.LATENCY_BUCKETS
+
+
+class TestBackoff:
+    """대기 시간 계산"""
+
+    def test_retry_after_is_honored_up_to_cap(self, monkeypatch):
+        monkeypatch.setattr(openai_client.settings, "OPENAI_BACKOFF_MAX_SEC", 8.0)
+        assert openai_client.backoff_sec(0, retry_after=2.0) == 2.0
+        assert openai_client.backoff_sec(0, retry_after=60.0) == 8.0
+
+    def test_jittered_exponential(self, monkeypatch):
+        monkeypatch.setattr(openai_client.settings, "OPENAI_BACKOFF_BASE_SEC", 0.5)
+        monkeypatch.setattr(openai_client.settings, "OPENAI_BACKOFF_MAX_SEC", 3.0)
+        assert all(0 <= openai_client.backoff_sec(1) <= 1.0 for _ in range(50))
+        assert all(0 <= openai_client.backoff_sec(10) <= 3.0 for _ in range(50))
+
+
+class TestRateLimiter:
+    """token bucket + 우선순위 대기열"""
+
+    def test_disabled_limiter_never_waits(self):
+        limiter = openai_client.RateLimiter("t", rpm=0, tpm=0)
+        assert not limiter.enabled and limiter.acquire(10 ** 6) == 0.0
+
+    def test_rpm_paces_requests_after_burst(self):
+        limiter = openai_client.RateLimiter("t", rpm=600, tpm=0)  # 초당 10개, 처음 600개는 바로
+        for _ in range(600):
+            limiter.acquire(1)
+        t0 = time.monotonic()
+        limiter.acquire(1)
+        limiter.acquire(1)
+        assert 0.15 <= time.monotonic() - t0 < 1.0
+
+    def test_tpm_counts_estimated_tokens(self):
+        limiter = openai_client.RateLimiter("t", rpm=0, tpm=6000)  # 초당 100토큰
+        assert limiter.acquire(6000) < 0.05
+        t0 = time.monotonic()
+        limiter.acquire(20)
+        assert time.monotonic() - t0 >= 0.15
+
+    def test_interactive_requests_jump_ahead_of_batch(self):
+        limiter = openai_client.RateLimiter("t", rpm=600, tpm=0)
+        for _ in range(600):
+            limiter.acquire(1)
+        order = []
+
+        def call(name, prio):
+            limiter.acquire(1, prio)
+            order.append(name)
+
+        threads = [threading.Thread(target=call, args=("batch1", openai_client.BATCH))]
+        threads[0].start()
+        time.sleep(0.02)
+        for name, prio in (("batch2", openai_client.BATCH), ("interactive", openai_client.INTERACTIVE)):
+            t = threading.Thread(target=call, args=(name, prio))
+            t.start()
+            threads.append(t)
+            time.sleep(0.01)
+        for t in threads:
+            t.join(timeout=5)
+        assert order == ["interactive", "batch1", "batch2"]
+
+    def test_token_estimate(self):
+        assert openai_client.estimate_tokens("abcd" * 10) == 11
+        assert openai_client.estimate_tokens("떡볶이") == 4
+        payload = {"messages": [{"role": "user", "content": "abcd"}], "max_tokens": 100}
+        assert openai_client.request_tokens("chat/completions", payload) == 2 + 4 + 100
+
+    def test_client_applies_priority_from_context(self, stub):
+        seen = []
+
+        class Recorder(openai_client.RateLimiter):
+            def acquire(self, tokens, priority=openai_client.INTERACTIVE):
+                seen.append(priority)
+                return 0.0
+
+        client = openai_client.OpenAIClient(
+            stub.url, pool_size=1, max_retries=0,
+            limiters={"chat/completions": Recorder("t", rpm=60, tpm=0)},
+        )
+        client.post("chat/completions", {"messages": []})
+        with openai_client.priority(openai_client.BATCH):
+            client.post("chat/completions", {"messages": []})
+        assert seen == [openai_client.INTERACTIVE, openai_client.BATCH]
@@ -0,0 +1,101 @@
+"""
+core/progress.py 유닛 테스트
+
+테스트 대상:
+- ProgressHub: 단계 가중치 기준 overall 누적 (뒤로 가지 않음), seq 이후 조회
+- parse_ffmpeg_progress: -progress 블록 파싱
+- tracked: 끝나면 done / 예외면 error 이벤트
+- video._run: job 진행 중이면 -progress pipe:1로 실행해서 진행 이벤트 전송
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.core import progress
+from backend.app.services import video
+
+
+class TestProgressHub:
+    """이벤트 보관/overall 계산 테스트"""
+
+    def test_overall_follows_stage_weights_and_never_goes_back(self):
+        hub = progress.ProgressHub()
+        hub.publish("j", {"type": "stage", "stage": "render"})
+        start = hub.events_since("j")[0][-1]["overall"]
+        assert start == pytest.approx(0.40)  # ingest+llm+tts
+
+        hub.publish("j", {"type": "progress", "stage": "render", "pct": 0.5})
+        hub.publish("j", {"type": "progress", "stage": "render", "pct": 0.1})
+        events, done = hub.events_since("j", seq=1)
+        assert [e["overall"] for e in events] == [pytest.approx(0.675)] * 2
+        assert not done
+
+        hub.publish("j", {"type": "done", "stage": "render"})
+        events, done = hub.events_since("j", seq=3)
+        assert done and events[0]["overall"] == 1.0
+
+    def test_parse_ffmpeg_progress_block(self):
+        block = {"out_time_us": "1500000", "fps": "87.5", "speed": "2.91x", "progress": "continue"}
+        assert progress.parse_ffmpeg_progress(block) == {"out_time_sec": 1.5, "fps": 87.5, "speed": 2.91}
+        assert progress.parse_ffmpeg_progress({"out_time_ms": "N/A", "fps": "0.00", "speed": "N/A"}) == {"fps": 0.0}
+
+
+class TestTracked:
+    """job 함수 데코레이터 테스트"""
+
+    def test_done_and_error_events(self):
+        @progress.tracked
+        async def ok_job():
+            progress.bind("job-ok")
+            progress.stage("llm")
+            return None
+
+        @progress.tracked
+        async def bad_job():
+            progress.bind("job-bad")
+            raise RuntimeError("boom")
+
+        asyncio.run(ok_job())
+        with pytest.raises(RuntimeError):
+            asyncio.run(bad_job())
+
+        assert progress.hub.events_since("job-ok")[0][-1]["type"] == "done"
+        err = progress.hub.events_since("job-bad")[0][-1]
+        assert err["type"] == "error" and err["error"] == "boom"
+        assert progress.current_job() is None
+
+
+class TestRunWithProgress:
+    """video._run의 -progress 파싱 테스트 (FFmpeg 대신 가짜 스크립트)"""
+
+    def test_reports_progress_events(self, monkeypatch, tmp_path):
+        fake = tmp_path / "ffmpeg"
+        fake.write_text(
+            "#!/bin/sh\n"
+            "printf 'fps=30.0\\nout_time_us=9000000\\nspeed=1.5x\\nprogress=continue\\n'\n"
+            "printf 'fps=60.0\\nout_time_us=18000000\\nspeed=3.0x\\nprogress=end\\n'\n"
+            "echo done >&2\n"
+        )
+        fake.chmod(0o755)
+        monkeypatch.setattr(video, "FFMPEG_BIN", str(fake))
+        monkeypatch.setattr(video.settings, "VIDEO_SECONDS", 18)
+
+        async def job():
+            progress.bind("job-run")
+            progress.stage("render")
+            return video._run([str(fake), "-y", "out.mp4"])
+
+        p = asyncio.run(progress.tracked(job)())
+
+        assert p.args[1:4] == ["-progress", "pipe:1", "-nostats"]
+        assert "done" in p.stderr
+        events = [e for e in progress.hub.events_since("job-run")[0] if e["type"] == "progress"]
+        assert [e["pct"] for e in events] == [0.5, 1.0]
+        assert events[-1]["fps"] == 60.0 and events[-1]["speed"] == 3.0
@@ -0,0 +1,189 @@
+"""
+tts.py 유닛 테스트
+
+테스트 대상:
+- assemble_narration: 줄 N개 -> FFmpeg 1회 (입력 N개, 줄 사이에만 apad, concat, 줄별 WAV 출력)
+- synthesize_voice_lines: 타이밍은 줄별 WAV 길이 + 줄 사이 pause
+- 줄 합성은 동시에, 결과는 줄 순서대로 / OpenAI가 한 번 실패하면 나머지 줄은 OpenAI를 안 부름
+- 줄 캐시: 같은 문구는 합성/후처리 없이 캐시된 WAV를 바로 이어붙임 (키는 실제로 만든 엔진 기준)
+"""
+
+import re
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import tts
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(48000)
+        w.writeframes(b"\x00\x00" * int(48000 * seconds))
+
+
+@pytest.fixture(autouse=True)
+def tts_cache(monkeypatch, tmp_path):
+    # 테스트마다 빈 캐시 (프로젝트의 cache/tts를 건드리지 않게)
+    monkeypatch.setattr(tts.settings, "TTS_CACHE_DIR", str(tmp_path / "tts_cache"))
+    monkeypatch.setattr(tts, "_CACHE", None)
+    monkeypatch.setattr(tts.settings, "NARRATION_STORE_ENABLED", False)
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """_run을 가로채서 명령을 기록하고, 출력 WAV를 줄 번호에 따라 길이를 다르게 만들어 줌"""
+    cmds = []
+
+    def fake_run(cmd):
+        cmds.append(cmd)
+        for arg in cmd:
+            m = re.search(r"line_(\d+)\.wav$", arg)
+            if m:
+                _write_wav(Path(arg), 0.5 + 0.25 * int(m.group(1)))
+            elif arg.endswith("voice.wav"):
+                _write_wav(Path(arg), 1.0)
+
+    monkeypatch.setattr(tts, "_run", fake_run)
+    return cmds
+
+
+class TestAssembleNarration:
+    """후처리 + 이어붙이기를 FFmpeg 1회로"""
+
+    def test_single_graph_with_pauses_between_lines(self, tmp_path, fake_ffmpeg):
+        raws = [tmp_path / f"line_{i:02d}_raw.mp3" for i in range(3)]
+        voice, lines = tts.assemble_narration(raws, tmp_path, speed=1.1, pause_sec=0.05)
+
+        assert len(fake_ffmpeg) == 1
+        cmd = fake_ffmpeg[0]
+        assert cmd.count("-i") == 3
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph.count("apad=pad_dur=0.05") == 2  # 마지막 줄 뒤에는 pause 없음
+        assert "[p0][p1][c2]concat=n=3:v=0:a=1[voice]" in graph
+        assert graph.count("atempo=1.1") == 3
+        assert voice == tmp_path / "voice.wav"
+        assert [str(p) for p in lines] == [a for a in cmd if a.endswith(".wav") and "line_" in a]
+
+
+class TestSynthesizeVoiceLines:
+    """타이밍 계산"""
+
+    def test_timings_follow_line_durations(self, tmp_path, monkeypatch, fake_ffmpeg):
+        monkeypatch.setattr(tts.settings, "OPENAI_API_KEY", "")
+        monkeypatch.setattr(tts.platform, "system", lambda: "Linux")
+
+        def fake_gtts(text, out_mp3):
+            out_mp3.write_bytes(b"\xff" * 2000)
+            return out_mp3
+
+        monkeypatch.setattr(tts, "_gtts_synthesize", fake_gtts)
+        voice, timings = tts.synthesize_voice_lines(["첫 줄", "둘째 줄"], tmp_path, tiny_pause_sec=0.1)
+
+        assert voice == tmp_path / "voice.wav"
+        assert len(fake_ffmpeg) == 1
+        assert timings == [(0.0, 0.5), (pytest.approx(0.6), pytest.approx(1.35))]
+
+    def test_lines_run_concurrently_and_keep_order(self, tmp_path, monkeypatch, fake_ffmpeg):
+        monkeypatch.setattr(tts.settings, "OPENAI_API_KEY", "")
+        monkeypatch.setattr(tts.settings, "TTS_CONCURRENCY", 4)
+        monkeypatch.setattr(tts.platform, "system", lambda: "Linux")
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def slow_gtts(text, out_mp3):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05 if text == "a" else 0.01)  # 첫 줄이 제일 늦게 끝남
+            out_mp3.write_bytes(b"\xff" * 2000)
+            with lock:
+                active["now"] -= 1
+            return out_mp3
+
+        monkeypatch.setattr(tts, "_gtts_synthesize", slow_gtts)
+        tts.synthesize_voice_lines(["a", "b", "", "c", "d"], tmp_path)
+
+        cmd = fake_ffmpeg[0]
+        inputs = [cmd[k + 1] for k, a in enumerate(cmd) if a == "-i"]
+        assert [Path(p).name for p in inputs] == [
+            "line_00_raw.mp3", "line_01_raw.mp3", "line_03_raw.mp3", "line_04_raw.mp3",
+        ]
+        assert active["max"] > 1
+
+    def test_openai_failure_disables_openai_for_remaining_lines(self, tmp_path, monkeypatch, fake_ffmpeg):
+        monkeypatch.setattr(tts.settings, "OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(tts.platform, "system", lambda: "Linux")
+        calls = {"openai": 0, "gtts": 0}
+
+        def broken_openai(text, out_mp3):
+            calls["openai"] += 1
+            raise RuntimeError("OpenAI TTS failed: 401")
+
+        def fake_gtts(text, out_mp3):
+            calls["gtts"] += 1
+            out_mp3.write_bytes(b"\xff" * 2000)
+            return out_mp3
+
+        monkeypatch.setattr(tts, "_openai_tts", broken_openai)
+        monkeypatch.setattr(tts, "_gtts_synthesize", fake_gtts)
+        _voice, timings = tts.synthesize_voice_lines(["a", "b", "c", "d"], tmp_path)
+
+        assert calls == {"openai": 1, "gtts": 4}
+        assert len(timings) == 4
+
+
+class TestLineCache:
+    """같은 문구 재사용"""
+
+    def test_repeated_lines_skip_synthesis_and_postprocess(self, tmp_path, monkeypatch, fake_ffmpeg):
+        monkeypatch.setattr(tts.settings, "OPENAI_API_KEY", "")
+        monkeypatch.setattr(tts.platform, "system", lambda: "Linux")
+        synthesized = []
+
+        def fake_gtts(text, out_mp3):
+            synthesized.append(text)
+            out_mp3.write_bytes(b"\xff" * 2000)
+            return out_mp3
+
+        monkeypatch.setattr(tts, "_gtts_synthesize", fake_gtts)
+        _v, first = tts.synthesize_voice_lines(["저장하고 가요", "지금이 타이밍"], tmp_path / "job1")
+        _v, second = tts.synthesize_voice_lines(["저장하고  가요", "새 문구"], tmp_path / "job2")
+
+        assert synthesized == ["저장하고 가요", "지금이 타이밍", "새 문구"]
+        graph = fake_ffmpeg[-1][fake_ffmpeg[-1].index("-filter_complex") + 1]
+        assert graph.count("atempo=") == 1  # 캐시 줄은 후처리 체인 없이 포맷만 맞춤
+        assert second[0] == first[0]
+
+    def test_say_failure_caches_gtts_audio_under_gtts_key(self, tmp_path, monkeypatch, fake_ffmpeg):
+        """macOS say가 실패해서 gTTS로 만든 줄은 say 키가 아니라 gTTS 키로 저장"""
+        monkeypatch.setattr(tts.settings, "OPENAI_API_KEY", "")
+        monkeypatch.setattr(tts.platform, "system", lambda: "Darwin")
+        monkeypatch.setattr(tts, "_macos_say", lambda text, out_mp3: None)
+
+        def fake_gtts(text, out_mp3):
+            out_mp3.write_bytes(b"\xff" * 2000)
+            return out_mp3
+
+        monkeypatch.setattr(tts, "_gtts_synthesize", fake_gtts)
+        tts.synthesize_voice_lines(["지금이 타이밍"], tmp_path)
+
+        speed = 1.10
+        assert tts._cached_line(tts._provider(False), "지금이 타이밍", speed) is None
+        assert tts._cached_line(tts.GTTS_PROVIDER, "지금이 타이밍", speed) is not None
+
+    def test_key_depends_on_provider_and_speed(self):
+        base = tts._line_key("gtts:ko", "지금이 타이밍", 1.1)
+        assert base == tts._line_key("gtts:ko", " 지금이   타이밍 ", 1.1)
+        assert base != tts._line_key("openai:shimmer", "지금이 타이밍", 1.1)
+        assert base != tts._line_key("gtts:ko", "지금이 타이밍", 1.2)
@@ -3,15 +3,27 @@ video.py 유닛 테스트
 
 테스트 대상:
 - _escape_drawtext: FFmpeg drawtext 필터용 특수문자 escape
+- render_single_pass: 슬라이드쇼/자막/오디오를 FFmpeg 1회로 묶는 커맨드 구성
+- build_slideshow_parallel: 컷별 병렬 렌더 + stream copy concat
+- _cut_filter: 정규화된 still이면 프레임 단위 scale/pad/eq 생략
+- render_cut_segments: 세그먼트 캐시 hit이면 컷 렌더 생략
+- rasterize_captions: 자막 줄을 PNG로 1번만 그리고 overlay로 합성
+- encode_args: 인코딩 프로필 -> libx264 옵션
+- parse_aspects / render_renditions: 여러 화면비를 그래프 1개에서 split으로 출력
+- RenderScheduler: 코어 예산 안에서 -threads/-filter_complex_threads 주입 + 예산 초과 시 대기 (HLS rung도 인코더로 셈)
 """
 
 import sys
 from pathlib import Path
 
+import cv2
+import numpy as np
+
 # backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+from backend.app.services import video
 from backend.app.services.video import _escape_drawtext
 
 
@@ -55,3 +67,350 @@ class TestEscapeDrawtext:
         """한글과 특수문자 혼합"""
         result = _escape_drawtext("가격: 9,900원")
         assert result == "가격\\: 9,900원"
+
+
+class TestRenderSinglePass:
+    """render_single_pass 커맨드 구성 테스트 (FFmpeg 실행 없이 _run을 가로채서 확인)"""
+
+    def _capture(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(video, "_run", lambda cmd: calls.append(cmd))
+        monkeypatch.setattr(video.settings, "CAPTION_RENDERER", "drawtext")
+        return calls
+
+    def test_single_ffmpeg_call_with_all_stages(self, monkeypatch, tmp_path):
+        """zoompan/drawtext/amix가 filter_complex 하나에 들어가고 FFmpeg는 1번만 실행"""
+        calls = self._capture(monkeypatch)
+        voice = tmp_path / "voice.mp3"
+        bgm = tmp_path / "bgm.mp3"
+        voice.write_bytes(b"x")
+        bgm.write_bytes(b"x")
+        images = [tmp_path / "a.jpg", tmp_path / "b.jpg"]
+
+        video.render_single_pass(images, ["첫 줄", "둘째 줄"], tmp_path / "final.mp4", voice, bgm)
+
+        assert len(calls) == 1
+        cmd = calls[0]
+        fc = cmd[cmd.index("-filter_complex") + 1]
+        assert "zoompan" in fc and "concat=n=2" in fc
+        assert fc.count("drawtext=") == 2
+        assert "amix=inputs=2" in fc
+        assert cmd.count("libx264") == 1
+        assert "[a_out]" in cmd
+
+    def test_no_audio_maps_video_only(self, monkeypatch, tmp_path):
+        """오디오 입력이 없으면 [a_out]을 매핑하지 않음"""
+        calls = self._capture(monkeypatch)
+        video.render_single_pass([tmp_path / "a.jpg"], ["한 줄"], tmp_path / "final.mp4")
+
+        cmd = calls[0]
+        assert "[a_out]" not in cmd
+        assert "[vout]" in cmd
+
+
+class TestBuildSlideshowParallel:
+    """컷별 병렬 렌더 커맨드 구성 테스트"""
+
+    def test_one_process_per_cut_then_stream_copy(self, monkeypatch, tmp_path):
+        """컷마다 closed-GOP 인코딩 1번, 마지막 concat은 -c copy"""
+        calls = []
+        monkeypatch.setattr(video, "_run", lambda cmd: calls.append(cmd))
+        monkeypatch.setattr(video.settings, "SEGMENT_CACHE_ENABLED", False)
+        images = [tmp_path / f"{i}.jpg" for i in range(3)]
+
+        video.build_slideshow_parallel(images, tmp_path / "silent.mp4")
+
+        cut_cmds = [c for c in calls if "+cgop" in c]
+        assert len(cut_cmds) == 3
+        assert all("-sc_threshold" in c for c in cut_cmds)
+
+        concat_cmd = calls[-1]
+        assert concat_cmd[concat_cmd.index("-f") + 1] == "concat"
+        assert concat_cmd[concat_cmd.index("-c") + 1] == "copy"
+
+        listing = (tmp_path / "segments" / "segments.txt").read_text(encoding="utf-8")
+        assert listing.count("file '") == 3
+
+
+class TestCutFilter:
+    """_cut_filter 테스트"""
+
+    def test_raw_input_keeps_static_filters(self):
+        """원본 이미지는 scale/pad/eq를 그대로 거침"""
+        f = video._cut_filter(0, "0:v", 1.8, 1080, 1920, 30)
+        assert "scale=1080:1920" in f and "pad=" in f and "eq=" in f
+        assert "zoompan" in f
+
+    def test_normalized_input_only_zoompan(self):
+        """정규화된 still은 zoompan만 프레임 단위로 실행"""
+        f = video._cut_filter(0, "0:v", 1.8, 1080, 1920, 30, normalized=True)
+        assert "scale=" not in f and "pad=" not in f and "eq=" not in f
+        assert "zoompan" in f and f.endswith("[v0]")
+
+
+class TestSegmentCache:
+    """컷 클립 캐시 재사용 테스트"""
+
+    def test_second_render_reuses_cached_cuts(self, monkeypatch, tmp_path):
+        """같은 이미지/프리셋/크기/fps면 두 번째 렌더는 FFmpeg 호출 없이 캐시 사용"""
+        calls = []
+
+        def fake_run(cmd):
+            calls.append(cmd)
+            Path(cmd[-1]).write_bytes(b"clip:" + " ".join(cmd).encode())
+
+        monkeypatch.setattr(video, "_run", fake_run)
+        monkeypatch.setattr(video.settings, "SEGMENT_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(video, "_SEGMENT_CACHE", None)
+
+        img = tmp_path / "menu.jpg"
+        img.write_bytes(b"same photo")
+        images = [img, img, img]
+
+        video.render_cut_segments(images, tmp_path / "job1")
+        first = len(calls)
+        assert first == 3  # 프리셋 0/1/2 -> 서로 다른 키
+
+        video.render_cut_segments(images, tmp_path / "job2")
+        assert len(calls) == first
+        assert all((tmp_path / "job2" / f"cut_{i:02d}.mp4").exists() for i in range(3))
+        assert video._segment_cache().stats()["hits"] >= 3
+
+    def test_miss_after_hit_at_same_path_keeps_cache_intact(self, monkeypatch, tmp_path):
+        """같은 job 경로에서 hit(하드링크) 뒤에 miss로 다시 렌더해도 캐시된 클립은 그대로"""
+        def fake_run(cmd):
+            Path(cmd[-1]).write_bytes(b"clip:" + Path(cmd[cmd.index("-i") + 1]).read_bytes())
+
+        monkeypatch.setattr(video, "_run", fake_run)
+        monkeypatch.setattr(video.settings, "SEGMENT_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(video, "_SEGMENT_CACHE", None)
+
+        old, new = tmp_path / "old.jpg", tmp_path / "new.jpg"
+        old.write_bytes(b"old photo")
+        new.write_bytes(b"new photo")
+
+        video.render_cut_segments([old], tmp_path / "warm")
+        video.render_cut_segments([old], tmp_path / "job")   # hit -> job/cut_00.mp4는 캐시와 같은 inode
+        video.render_cut_segments([new], tmp_path / "job")   # 같은 경로에 miss 렌더
+
+        assert (tmp_path / "job" / "cut_00.mp4").read_bytes() == b"clip:new photo"
+        video.render_cut_segments([old], tmp_path / "job2")
+        assert (tmp_path / "job2" / "cut_00.mp4").read_bytes() == b"clip:old photo"
+
+
+class TestRasterCaptions:
+    """자막 래스터화 + overlay 합성 테스트"""
+
+    def _fake_run(self, calls):
+        def run(cmd):
+            calls.append(cmd)
+            if "lavfi" not in cmd:
+                return
+            # drawtext 대신: 배경(검은/흰) 위에 box(검정 0.35) + 그림자(검정 0.7) + 글자(흰색)를 합성한 PNG
+            for k, arg in enumerate(cmd):
+                if arg == "-update":
+                    out = cmd[k + 2]
+                    bg = 0.0 if out.endswith("_black.png") else 255.0
+                    img = np.full((40, 30, 3), bg, dtype=np.float32)
+                    img[11:21, 5:25] = img[11:21, 5:25] * 0.65
+                    img[15:17, 9:13] = img[15:17, 9:13] * 0.3
+                    img[13:15, 7:11] = 255.0
+                    cv2.imwrite(out, np.rint(img).astype(np.uint8))
+        return run
+
+    def test_single_pass_overlays_pngs_instead_of_drawtext(self, monkeypatch, tmp_path):
+        """래스터 모드면 최종 그래프에 drawtext 없이 overlay만, 좌표는 알파 영역 기준"""
+        calls = []
+        monkeypatch.setattr(video, "_run", self._fake_run(calls))
+        monkeypatch.setattr(video.settings, "CAPTION_RENDERER", "raster")
+        monkeypatch.setattr(video.settings, "CAPTION_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(video, "_CAPTION_CACHE", None)
+        monkeypatch.setattr(video, "_video_dims", lambda: (30, 40))
+
+        video.render_single_pass([tmp_path / "a.jpg"] * 2, ["첫 줄", "둘째 줄"], tmp_path / "final.mp4")
+
+        raster_cmd, final_cmd = calls
+        assert raster_cmd.count("-update") == 4  # 줄마다 검은/흰 배경 2장
+        fc = final_cmd[final_cmd.index("-filter_complex") + 1]
+        assert "drawtext" not in fc
+        assert fc.count("overlay=x=4:y=10:enable=") == 2
+        assert sum(1 for a in final_cmd if a.endswith(".png")) == 2
+
+    def test_cached_lines_skip_rasterization(self, monkeypatch, tmp_path):
+        """같은 문구/스타일/크기면 두 번째는 FFmpeg 래스터 호출 없음"""
+        calls = []
+        monkeypatch.setattr(video, "_run", self._fake_run(calls))
+        monkeypatch.setattr(video.settings, "CAPTION_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(video, "_CAPTION_CACHE", None)
+        specs = [video.CaptionSpec("저장하고 가요", "h*0.12", 0.0, 1.5)]
+
+        first = video.rasterize_captions(specs, tmp_path / "job1", 30, 40)
+        second = video.rasterize_captions(specs, tmp_path / "job2", 30, 40)
+
+        assert len(calls) == 1
+        assert (first[0].x, first[0].y) == (second[0].x, second[0].y)
+        assert second[0].path.exists()
+
+    def test_new_text_at_same_path_keeps_cached_png(self, monkeypatch, tmp_path):
+        """같은 job에서 hit(하드링크) 뒤에 문구를 바꿔 다시 그려도 캐시된 PNG는 그대로"""
+        monkeypatch.setattr(video, "_run", self._fake_run([]))
+        monkeypatch.setattr(video.settings, "CAPTION_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(video, "_CAPTION_CACHE", None)
+        old = [video.CaptionSpec("저장하고 가요", "h*0.12", 0.0, 1.5)]
+
+        video.rasterize_captions(old, tmp_path / "warm", 30, 40)
+        (cached,) = video.rasterize_captions(old, tmp_path / "job", 30, 40)  # hit -> 캐시와 같은 inode
+        before = cv2.imread(str(cached.path), cv2.IMREAD_UNCHANGED).copy()
+
+        # 다른 문구 -> miss, 같은 caption_00.png 경로에 더 큰 PNG
+        def bigger(cmd):
+            for k, arg in enumerate(cmd):
+                if arg == "-update":
+                    bg = 0 if cmd[k + 2].endswith("_black.png") else 255
+                    img = np.full((40, 30, 3), bg, dtype=np.uint8)
+                    img[2:38, 2:28] = 128
+                    cv2.imwrite(cmd[k + 2], img)
+
+        monkeypatch.setattr(video, "_run", bigger)
+        video.rasterize_captions([video.CaptionSpec("새 문구", "h*0.12", 0.0, 1.5)], tmp_path / "job", 30, 40)
+
+        (again,) = video.rasterize_captions(old, tmp_path / "job2", 30, 40)
+        assert np.array_equal(cv2.imread(str(again.path), cv2.IMREAD_UNCHANGED), before)
+
+    def test_matte_keeps_box_and_shadow_alpha(self, monkeypatch, tmp_path):
+        """투명 캔버스처럼 알파가 제곱되지 않고 CAPTION_BOX_ALPHA / 그림자 0.7 그대로"""
+        monkeypatch.setattr(video, "_run", self._fake_run([]))
+        monkeypatch.setattr(video.settings, "CAPTION_CACHE_ENABLED", False)
+        specs = [video.CaptionSpec("저장하고 가요", "h*0.12", 0.0, 1.5)]
+
+        (cap,) = video.rasterize_captions(specs, tmp_path, 30, 40)
+        png = cv2.imread(str(cap.path), cv2.IMREAD_UNCHANGED)
+        alpha = png[..., 3] / 255.0
+        # 잘린 PNG 좌표 = 캔버스 좌표 - (x, y)
+        box = alpha[19 - cap.y, 22 - cap.x]
+        shadow = alpha[16 - cap.y, 12 - cap.x]
+        text = png[13 - cap.y, 8 - cap.x]
+
+        assert abs(box - 0.35) < 0.01
+        assert abs(shadow - (1 - 0.65 * 0.3)) < 0.01  # box 위에 그림자 (0.35 + 0.7 합성)
+        assert text[3] == 255 and text[:3].min() == 255
+
+
+class TestEncodeArgs:
+    """인코딩 프로필 테스트"""
+
+    def test_profiles_set_preset_crf_tune(self):
+        for name, prof in video.settings.ENCODE_PROFILES.items():
+            args = video.encode_args(name)
+            assert args[args.index("-preset") + 1] == prof["preset"]
+            assert args[args.index("-crf") + 1] == str(prof["crf"])
+            assert args[args.index("-tune") + 1] == "stillimage"
+            assert "-threads" in args
+
+    def test_gop_and_threads_override(self):
+        args = video.encode_args("draft", gop=54, threads=2)
+        assert args[args.index("-g") + 1] == "54"
+        assert args[args.index("-threads") + 1] == "2"
+
+    def test_unknown_profile_raises(self):
+        import pytest
+
+        with pytest.raises(ValueError):
+            video.encode_args("nope")
+
+
+class TestRenditions:
+    """여러 화면비 출력 테스트"""
+
+    def test_parse_aspects_keeps_short_side(self):
+        """짧은 변은 VIDEO_SIZE(1080x1920) 기준 1080으로 맞춤"""
+        rs = video.parse_aspects("9:16, 1:1,16:9,2:2")
+        assert [(r.aspect, r.w, r.h) for r in rs] == [
+            ("9:16", 1080, 1920), ("1:1", 1080, 1080), ("16:9", 1920, 1080),
+        ]
+        assert rs[1].tag == "1x1"
+
+    def test_parse_aspects_rejects_garbage(self):
+        import pytest
+
+        with pytest.raises(ValueError):
+            video.parse_aspects("wide")
+
+    def test_one_graph_split_per_input_and_shared_audio(self, monkeypatch, tmp_path):
+        """입력은 1번만 넣고 split/asplit으로 렌디션마다 출력 (FFmpeg 1회)"""
+        calls = []
+        monkeypatch.setattr(video, "_run", lambda cmd: calls.append(cmd))
+        monkeypatch.setattr(video.settings, "CAPTION_RENDERER", "drawtext")
+        voice = tmp_path / "voice.mp3"
+        voice.write_bytes(b"x")
+        images = [tmp_path / "a.jpg", tmp_path / "b.jpg"]
+        rs = video.parse_aspects("9:16,1:1,16:9")
+        targets = [(r, video.rendition_path(tmp_path / "final.mp4", r, i == 0)) for i, r in enumerate(rs)]
+
+        outs = video.render_renditions(images, ["첫 줄", "둘째 줄"], targets, voice_path=voice)
+
+        assert len(calls) == 1
+        cmd = calls[0]
+        assert cmd.count("-i") == 3  # 이미지 2 + voice 1
+        fc = cmd[cmd.index("-filter_complex") + 1]
+        assert fc.count(":v]split=3") == 2 and "[a_out]asplit=3" in fc
+        assert "scale=1080:1080" in fc and "scale=1920:1080" in fc
+        assert cmd.count("libx264") == 3
+        assert [p.name for p in outs] == ["final.mp4", "final_1x1.mp4", "final_16x9.mp4"]
+        assert all(str(p) in cmd for p in outs)
+
+
+
+class TestRenderScheduler:
+    """FFmpeg 코어 예산 스케줄러 테스트"""
+
+    def test_injects_threads_per_encoder(self):
+        s = video.RenderScheduler(budget=8, per_job=4)
+        cmd = ["ffmpeg", "-y", "-i", "a.jpg", "-filter_complex", "[0:v]null[v]",
+               "-c:v", "libx264", "-threads", "0", "o1.mp4", "-c:v", "libx264", "-threads", "0", "o2.mp4"]
+        n = s.cores_for(cmd)
+        assert n == 8  # 인코더 2개 x 4
+
+        with s.slot(cmd) as out:
+            assert out[out.index("-filter_complex_threads") + 1] == "8"
+            assert [out[k + 1] for k, a in enumerate(out) if a == "-threads"] == ["4", "4"]
+
+    def test_adds_threads_when_missing_and_copy_takes_one_core(self):
+        s = video.RenderScheduler(budget=4, per_job=2)
+        with s.slot(["ffmpeg", "-i", "in.mp4", "-c:v", "libx264", "out.mp4"]) as out:
+            assert out[out.index("libx264") + 1:out.index("libx264") + 3] == ["-threads", "2"]
+        assert s.cores_for(["ffmpeg", "-f", "concat", "-i", "l.txt", "-c", "copy", "o.mp4"]) == 1
+
+    def test_hls_rungs_count_as_separate_encoders(self):
+        """-c:v libx264 1개 + var_stream_map rung 3개 -> 인코더 3개로 예산 계산, rung마다 나눈 -threads"""
+        s = video.RenderScheduler(budget=12, per_job=2)
+        cmd = ["ffmpeg", "-i", "final.mp4", "-filter_complex", "[0:v]split=3[s0][s1][s2]",
+               "-map", "[v0]", "-map", "0:a:0", "-map", "[v1]", "-map", "0:a:0", "-map", "[v2]", "-map", "0:a:0",
+               "-c:v", "libx264", "-threads", "0", "-f", "hls",
+               "-var_stream_map", "v:0,a:0 v:1,a:1 v:2,a:2", "stream_%v.m3u8"]
+        assert s.encoders(cmd) == 3
+        assert s.cores_for(cmd) == 6
+
+        with s.slot(cmd) as out:
+            assert out[out.index("-threads") + 1] == "2"
+            assert out[out.index("-filter_complex_threads") + 1] == "6"
+
+    def test_waits_when_budget_is_used_up(self):
+        import threading
+        import time
+
+        s = video.RenderScheduler(budget=2, per_job=2)
+        enc = ["ffmpeg", "-i", "a", "-c:v", "libx264", "o.mp4"]
+        order = []
+
+        def second():
+            with s.slot(enc):
+                order.append("second")
+
+        with s.slot(enc):
+            t = threading.Thread(target=second)
+            t.start()
+            time.sleep(0.1)
+            order.append("first-done")  # 예산(2) 다 쓰는 중이라 second는 아직 대기
+        t.join(timeout=2)
+        assert order == ["first-done", "second"]
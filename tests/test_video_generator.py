@@ -0,0 +1,85 @@
+"""
+video_generator.py 유닛 테스트
+
+테스트 대상:
+- generate_video(preview=True): 저해상도/낮은 fps/draft 프로필로 artifacts/preview/에 렌더
+- 같은 job_id로 본 렌더하면 LLM 카피/TTS를 다시 만들지 않고 job.json에서 재사용
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi import UploadFile
+
+# backend 모듈 import를 위해 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import video_generator as vg
+
+
+class TestPreviewReuse:
+    """미리보기 -> 본 렌더 재사용 테스트 (LLM/TTS/렌더는 가로채서 호출만 기록)"""
+
+    def _patch(self, monkeypatch, tmp_path):
+        calls = {"copy": 0, "tts": 0, "render": []}
+
+        def fake_copy(**kw):
+            calls["copy"] += 1
+            return SimpleNamespace(caption_lines=["첫 줄", "둘째 줄"], promo_text="", hashtags=["#맛집"])
+
+        def fake_tts(lines, out_dir):
+            calls["tts"] += 1
+            out_dir.mkdir(parents=True, exist_ok=True)
+            voice = out_dir / "voice.mp3"
+            voice.write_bytes(b"x")
+            return voice, [(0.0, 1.0), (1.1, 2.0)]
+
+        def fake_render(image_paths, lines, timings, voice_path, bgm_path, artifacts_dir, targets, opts):
+            calls["render"].append((artifacts_dir, targets, opts, timings))
+            return [out for _r, out in targets]
+
+        monkeypatch.setattr(vg.settings, "OUTPUT_DIR", str(tmp_path / "outputs"))
+        monkeypatch.setattr(vg, "generate_copy", fake_copy)
+        monkeypatch.setattr(vg, "synthesize_voice_lines", fake_tts)
+        monkeypatch.setattr(vg, "_render_final", fake_render)
+        monkeypatch.setattr(vg, "normalize_images", lambda *a, **kw: None)
+        return calls
+
+    def _run(self, **kw):
+        images = [UploadFile(file=io.BytesIO(b"img"), filename="a.jpg")]
+        return asyncio.run(vg.generate_video(images=images, menu_name="떡볶이", use_bgm=False, **kw))
+
+    def test_full_render_reuses_preview_copy_and_voice(self, monkeypatch, tmp_path):
+        calls = self._patch(monkeypatch, tmp_path)
+
+        pre = self._run(preview=True)
+        assert pre.video_url == f"/outputs/{pre.job_id}/artifacts/preview/preview.mp4"
+        _dir, _targets, opts, _t = calls["render"][0]
+        assert opts.size == (360, 640) and opts.fps == 15 and opts.profile == "draft"
+
+        full = self._run(job_id=pre.job_id)
+        assert full.job_id == pre.job_id
+        assert full.video_url.endswith("/artifacts/final.mp4")
+        assert calls["copy"] == 1 and calls["tts"] == 1
+        assert calls["render"][1][3] == [(0.0, 1.0), (1.1, 2.0)]
+        assert full.caption_text == pre.caption_text and full.hashtags == ["#맛집"]
+
+    def test_changed_tone_regenerates_copy(self, monkeypatch, tmp_path):
+        calls = self._patch(monkeypatch, tmp_path)
+
+        pre = self._run(preview=True)
+        self._run(preview=True, job_id=pre.job_id, tone="힙")
+        assert calls["copy"] == 2 and calls["tts"] == 2
+
+    def test_unknown_job_id_is_404(self, monkeypatch, tmp_path):
+        import pytest
+        from fastapi import HTTPException
+
+        self._patch(monkeypatch, tmp_path)
+        with pytest.raises(HTTPException) as e:
+            self._run(job_id="0123456789ab")
+        assert e.value.status_code == 404